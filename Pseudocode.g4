@@ -69,35 +69,16 @@ expression
     : logicalOrExpression
     ;
 
-logicalOrExpression
-    : left=logicalAndExpression (OR right=logicalAndExpression)+ # OrExpr
-    | logicalAndExpression                                        # OrPass
-    ;
-
-logicalAndExpression
-    : left=comparisonExpression (AND right=comparisonExpression)+ # AndExpr
-    | comparisonExpression                                         # AndPass
-    ;
-
-comparisonExpression
-    : left=additiveExpression op=(EQEQ | LOW_THAN | GREATER_THAN | LESS_EQ | GREATER_EQ) right=additiveExpression # CompareExpr
-    | additiveExpression                                                                                             # ComparisonPass
-    ;
-
-additiveExpression
-    : left=multiplicativeExpression (op=(PLUS | MINUS) right=multiplicativeExpression)+ # AddExpr
-    | multiplicativeExpression                                                            # AdditivePass
-    ;
-
-multiplicativeExpression
-    : left=powerExpression (op=(STAR | SLASH) right=powerExpression)+ # MulExpr
-    | powerExpression                                                   # MultiplicativePass
-    ;
-
-powerExpression
-    : left=unaryExpression (POW right=unaryExpression)+ # PowExpr
-    | unaryExpression                                    # PowerPass
-    ;
+// Precedence levels are left-factored: each level parses its first operand
+// once and then loops over its operators, so prediction needs one token of
+// lookahead instead of scanning a whole operand to pick "operator follows"
+// over "pass-through" at every level.
+logicalOrExpression      : logicalAndExpression (OR logicalAndExpression)*;
+logicalAndExpression     : comparisonExpression (AND comparisonExpression)*;
+comparisonExpression     : additiveExpression (op=(EQEQ | LOW_THAN | GREATER_THAN | LESS_EQ | GREATER_EQ) additiveExpression)?;
+additiveExpression       : multiplicativeExpression (op=(PLUS | MINUS) multiplicativeExpression)*;
+multiplicativeExpression : powerExpression (op=(STAR | SLASH) powerExpression)*;
+powerExpression          : unaryExpression (POW unaryExpression)*;
 
 unaryExpression
     : MINUS unaryExpression # UnaryMinusExpr
@@ -233,111 +233,57 @@ class PseudocodeListener(ParseTreeListener):
         pass
 
 
-    # Enter a parse tree produced by PseudocodeParser#OrExpr.
-    def enterOrExpr(self, ctx:PseudocodeParser.OrExprContext):
+    # Enter a parse tree produced by PseudocodeParser#logicalOrExpression.
+    def enterLogicalOrExpression(self, ctx:PseudocodeParser.LogicalOrExpressionContext):
         pass
 
-    # Exit a parse tree produced by PseudocodeParser#OrExpr.
-    def exitOrExpr(self, ctx:PseudocodeParser.OrExprContext):
+    # Exit a parse tree produced by PseudocodeParser#logicalOrExpression.
+    def exitLogicalOrExpression(self, ctx:PseudocodeParser.LogicalOrExpressionContext):
         pass
 
 
-    # Enter a parse tree produced by PseudocodeParser#OrPass.
-    def enterOrPass(self, ctx:PseudocodeParser.OrPassContext):
+    # Enter a parse tree produced by PseudocodeParser#logicalAndExpression.
+    def enterLogicalAndExpression(self, ctx:PseudocodeParser.LogicalAndExpressionContext):
         pass
 
-    # Exit a parse tree produced by PseudocodeParser#OrPass.
-    def exitOrPass(self, ctx:PseudocodeParser.OrPassContext):
+    # Exit a parse tree produced by PseudocodeParser#logicalAndExpression.
+    def exitLogicalAndExpression(self, ctx:PseudocodeParser.LogicalAndExpressionContext):
         pass
 
 
-    # Enter a parse tree produced by PseudocodeParser#AndExpr.
-    def enterAndExpr(self, ctx:PseudocodeParser.AndExprContext):
+    # Enter a parse tree produced by PseudocodeParser#comparisonExpression.
+    def enterComparisonExpression(self, ctx:PseudocodeParser.ComparisonExpressionContext):
         pass
 
-    # Exit a parse tree produced by PseudocodeParser#AndExpr.
-    def exitAndExpr(self, ctx:PseudocodeParser.AndExprContext):
+    # Exit a parse tree produced by PseudocodeParser#comparisonExpression.
+    def exitComparisonExpression(self, ctx:PseudocodeParser.ComparisonExpressionContext):
         pass
 
 
-    # Enter a parse tree produced by PseudocodeParser#AndPass.
-    def enterAndPass(self, ctx:PseudocodeParser.AndPassContext):
+    # Enter a parse tree produced by PseudocodeParser#additiveExpression.
+    def enterAdditiveExpression(self, ctx:PseudocodeParser.AdditiveExpressionContext):
         pass
 
-    # Exit a parse tree produced by PseudocodeParser#AndPass.
-    def exitAndPass(self, ctx:PseudocodeParser.AndPassContext):
+    # Exit a parse tree produced by PseudocodeParser#additiveExpression.
+    def exitAdditiveExpression(self, ctx:PseudocodeParser.AdditiveExpressionContext):
         pass
 
 
-    # Enter a parse tree produced by PseudocodeParser#CompareExpr.
-    def enterCompareExpr(self, ctx:PseudocodeParser.CompareExprContext):
+    # Enter a parse tree produced by PseudocodeParser#multiplicativeExpression.
+    def enterMultiplicativeExpression(self, ctx:PseudocodeParser.MultiplicativeExpressionContext):
         pass
 
-    # Exit a parse tree produced by PseudocodeParser#CompareExpr.
-    def exitCompareExpr(self, ctx:PseudocodeParser.CompareExprContext):
+    # Exit a parse tree produced by PseudocodeParser#multiplicativeExpression.
+    def exitMultiplicativeExpression(self, ctx:PseudocodeParser.MultiplicativeExpressionContext):
         pass
 
 
-    # Enter a parse tree produced by PseudocodeParser#ComparisonPass.
-    def enterComparisonPass(self, ctx:PseudocodeParser.ComparisonPassContext):
+    # Enter a parse tree produced by PseudocodeParser#powerExpression.
+    def enterPowerExpression(self, ctx:PseudocodeParser.PowerExpressionContext):
         pass
 
-    # Exit a parse tree produced by PseudocodeParser#ComparisonPass.
-    def exitComparisonPass(self, ctx:PseudocodeParser.ComparisonPassContext):
-        pass
-
-
-    # Enter a parse tree produced by PseudocodeParser#AddExpr.
-    def enterAddExpr(self, ctx:PseudocodeParser.AddExprContext):
-        pass
-
-    # Exit a parse tree produced by PseudocodeParser#AddExpr.
-    def exitAddExpr(self, ctx:PseudocodeParser.AddExprContext):
-        pass
-
-
-    # Enter a parse tree produced by PseudocodeParser#AdditivePass.
-    def enterAdditivePass(self, ctx:PseudocodeParser.AdditivePassContext):
-        pass
-
-    # Exit a parse tree produced by PseudocodeParser#AdditivePass.
-    def exitAdditivePass(self, ctx:PseudocodeParser.AdditivePassContext):
-        pass
-
-
-    # Enter a parse tree produced by PseudocodeParser#MulExpr.
-    def enterMulExpr(self, ctx:PseudocodeParser.MulExprContext):
-        pass
-
-    # Exit a parse tree produced by PseudocodeParser#MulExpr.
-    def exitMulExpr(self, ctx:PseudocodeParser.MulExprContext):
-        pass
-
-
-    # Enter a parse tree produced by PseudocodeParser#MultiplicativePass.
-    def enterMultiplicativePass(self, ctx:PseudocodeParser.MultiplicativePassContext):
-        pass
-
-    # Exit a parse tree produced by PseudocodeParser#MultiplicativePass.
-    def exitMultiplicativePass(self, ctx:PseudocodeParser.MultiplicativePassContext):
-        pass
-
-
-    # Enter a parse tree produced by PseudocodeParser#PowExpr.
-    def enterPowExpr(self, ctx:PseudocodeParser.PowExprContext):
-        pass
-
-    # Exit a parse tree produced by PseudocodeParser#PowExpr.
-    def exitPowExpr(self, ctx:PseudocodeParser.PowExprContext):
-        pass
-
-
-    # Enter a parse tree produced by PseudocodeParser#PowerPass.
-    def enterPowerPass(self, ctx:PseudocodeParser.PowerPassContext):
-        pass
-
-    # Exit a parse tree produced by PseudocodeParser#PowerPass.
-    def exitPowerPass(self, ctx:PseudocodeParser.PowerPassContext):
+    # Exit a parse tree produced by PseudocodeParser#powerExpression.
+    def exitPowerExpression(self, ctx:PseudocodeParser.PowerExpressionContext):
         pass
 
 
@@ -10,7 +10,7 @@ else:
 
 def serializedATN():
     return [
-        4,1,46,514,2,0,7,0,2,1,7,1,2,2,7,2,2,3,7,3,2,4,7,4,2,5,7,5,2,6,7,
+        4,1,46,502,2,0,7,0,2,1,7,1,2,2,7,2,2,3,7,3,2,4,7,4,2,5,7,5,2,6,7,
         6,2,7,7,7,2,8,7,8,2,9,7,9,2,10,7,10,2,11,7,11,2,12,7,12,2,13,7,13,
         2,14,7,14,2,15,7,15,2,16,7,16,2,17,7,17,2,18,7,18,2,19,7,19,2,20,
         7,20,2,21,7,21,2,22,7,22,2,23,7,23,2,24,7,24,2,25,7,25,2,26,7,26,
@@ -45,114 +45,113 @@ def serializedATN():
         8,17,1,17,5,17,389,8,17,10,17,12,17,392,9,17,1,17,1,17,1,17,1,18,
         1,18,1,18,1,19,1,19,1,20,1,20,4,20,404,8,20,11,20,12,20,405,1,20,
         5,20,409,8,20,10,20,12,20,412,9,20,3,20,414,8,20,1,20,5,20,417,8,
-        20,10,20,12,20,420,9,20,1,21,1,21,1,22,1,22,1,22,4,22,427,8,22,11,
-        22,12,22,428,1,22,3,22,432,8,22,1,23,1,23,1,23,4,23,437,8,23,11,
-        23,12,23,438,1,23,3,23,442,8,23,1,24,1,24,1,24,1,24,1,24,3,24,449,
-        8,24,1,25,1,25,1,25,4,25,454,8,25,11,25,12,25,455,1,25,3,25,459,
-        8,25,1,26,1,26,1,26,4,26,464,8,26,11,26,12,26,465,1,26,3,26,469,
-        8,26,1,27,1,27,1,27,4,27,474,8,27,11,27,12,27,475,1,27,3,27,479,
-        8,27,1,28,1,28,1,28,3,28,484,8,28,1,29,1,29,1,29,1,29,1,29,1,29,
-        1,29,3,29,493,8,29,1,29,1,29,1,29,1,29,1,29,1,29,1,29,3,29,502,8,
-        29,1,30,1,30,1,30,5,30,507,8,30,10,30,12,30,510,9,30,1,31,1,31,1,
-        31,0,0,32,0,2,4,6,8,10,12,14,16,18,20,22,24,26,28,30,32,34,36,38,
-        40,42,44,46,48,50,52,54,56,58,60,62,0,7,4,0,29,29,31,31,33,33,35,
-        35,2,0,17,17,19,20,1,0,42,43,2,0,22,22,24,27,2,0,32,32,34,34,2,0,
-        30,30,36,36,2,0,12,13,16,20,561,0,67,1,0,0,0,2,136,1,0,0,0,4,144,
-        1,0,0,0,6,146,1,0,0,0,8,180,1,0,0,0,10,182,1,0,0,0,12,186,1,0,0,
-        0,14,222,1,0,0,0,16,229,1,0,0,0,18,238,1,0,0,0,20,242,1,0,0,0,22,
-        248,1,0,0,0,24,256,1,0,0,0,26,258,1,0,0,0,28,294,1,0,0,0,30,317,
-        1,0,0,0,32,321,1,0,0,0,34,363,1,0,0,0,36,396,1,0,0,0,38,399,1,0,
-        0,0,40,413,1,0,0,0,42,421,1,0,0,0,44,431,1,0,0,0,46,441,1,0,0,0,
-        48,448,1,0,0,0,50,458,1,0,0,0,52,468,1,0,0,0,54,478,1,0,0,0,56,483,
-        1,0,0,0,58,501,1,0,0,0,60,503,1,0,0,0,62,511,1,0,0,0,64,66,5,45,
-        0,0,65,64,1,0,0,0,66,69,1,0,0,0,67,65,1,0,0,0,67,68,1,0,0,0,68,70,
-        1,0,0,0,69,67,1,0,0,0,70,79,3,2,1,0,71,73,5,45,0,0,72,71,1,0,0,0,
-        73,74,1,0,0,0,74,72,1,0,0,0,74,75,1,0,0,0,75,76,1,0,0,0,76,78,3,
-        2,1,0,77,72,1,0,0,0,78,81,1,0,0,0,79,77,1,0,0,0,79,80,1,0,0,0,80,
-        85,1,0,0,0,81,79,1,0,0,0,82,84,5,45,0,0,83,82,1,0,0,0,84,87,1,0,
-        0,0,85,83,1,0,0,0,85,86,1,0,0,0,86,88,1,0,0,0,87,85,1,0,0,0,88,89,
-        5,0,0,1,89,1,1,0,0,0,90,92,3,20,10,0,91,90,1,0,0,0,91,92,1,0,0,0,
-        92,93,1,0,0,0,93,95,3,6,3,0,94,96,5,43,0,0,95,94,1,0,0,0,95,96,1,
-        0,0,0,96,137,1,0,0,0,97,137,3,12,6,0,98,100,3,20,10,0,99,98,1,0,
-        0,0,99,100,1,0,0,0,100,101,1,0,0,0,101,103,3,14,7,0,102,104,5,43,
-        0,0,103,102,1,0,0,0,103,104,1,0,0,0,104,137,1,0,0,0,105,137,3,26,
-        13,0,106,137,3,28,14,0,107,109,3,20,10,0,108,107,1,0,0,0,108,109,
-        1,0,0,0,109,110,1,0,0,0,110,137,3,32,16,0,111,113,3,20,10,0,112,
-        111,1,0,0,0,112,113,1,0,0,0,113,114,1,0,0,0,114,137,3,34,17,0,115,
-        117,3,20,10,0,116,115,1,0,0,0,116,117,1,0,0,0,117,118,1,0,0,0,118,
-        120,3,36,18,0,119,121,5,43,0,0,120,119,1,0,0,0,120,121,1,0,0,0,121,
-        137,1,0,0,0,122,124,3,20,10,0,123,122,1,0,0,0,123,124,1,0,0,0,124,
-        125,1,0,0,0,125,127,3,38,19,0,126,128,5,43,0,0,127,126,1,0,0,0,127,
-        128,1,0,0,0,128,137,1,0,0,0,129,131,3,20,10,0,130,129,1,0,0,0,130,
-        131,1,0,0,0,131,132,1,0,0,0,132,134,3,10,5,0,133,135,5,43,0,0,134,
-        133,1,0,0,0,134,135,1,0,0,0,135,137,1,0,0,0,136,91,1,0,0,0,136,97,
-        1,0,0,0,136,99,1,0,0,0,136,105,1,0,0,0,136,106,1,0,0,0,136,108,1,
-        0,0,0,136,112,1,0,0,0,136,116,1,0,0,0,136,123,1,0,0,0,136,130,1,
-        0,0,0,137,3,1,0,0,0,138,139,5,17,0,0,139,140,5,37,0,0,140,141,3,
-        42,21,0,141,142,5,38,0,0,142,145,1,0,0,0,143,145,5,17,0,0,144,138,
-        1,0,0,0,144,143,1,0,0,0,145,5,1,0,0,0,146,147,3,4,2,0,147,150,5,
-        23,0,0,148,151,3,42,21,0,149,151,3,8,4,0,150,148,1,0,0,0,150,149,
-        1,0,0,0,151,7,1,0,0,0,152,153,5,1,0,0,153,154,5,37,0,0,154,155,3,
-        42,21,0,155,156,5,2,0,0,156,157,3,42,21,0,157,158,5,38,0,0,158,181,
-        1,0,0,0,159,160,5,1,0,0,160,161,5,39,0,0,161,164,3,42,21,0,162,163,
-        5,42,0,0,163,165,3,42,21,0,164,162,1,0,0,0,164,165,1,0,0,0,165,166,
-        1,0,0,0,166,167,5,40,0,0,167,181,1,0,0,0,168,169,5,1,0,0,169,170,
-        5,37,0,0,170,175,3,42,21,0,171,172,5,42,0,0,172,174,3,42,21,0,173,
-        171,1,0,0,0,174,177,1,0,0,0,175,173,1,0,0,0,175,176,1,0,0,0,176,
-        178,1,0,0,0,177,175,1,0,0,0,178,179,5,38,0,0,179,181,1,0,0,0,180,
-        152,1,0,0,0,180,159,1,0,0,0,180,168,1,0,0,0,181,9,1,0,0,0,182,183,
-        3,4,2,0,183,184,7,0,0,0,184,185,3,42,21,0,185,11,1,0,0,0,186,187,
-        5,3,0,0,187,188,5,17,0,0,188,190,5,39,0,0,189,191,3,16,8,0,190,189,
-        1,0,0,0,190,191,1,0,0,0,191,192,1,0,0,0,192,193,5,40,0,0,193,195,
-        5,41,0,0,194,196,5,45,0,0,195,194,1,0,0,0,196,197,1,0,0,0,197,195,
-        1,0,0,0,197,198,1,0,0,0,198,211,1,0,0,0,199,208,3,2,1,0,200,202,
-        5,45,0,0,201,200,1,0,0,0,202,203,1,0,0,0,203,201,1,0,0,0,203,204,
-        1,0,0,0,204,205,1,0,0,0,205,207,3,2,1,0,206,201,1,0,0,0,207,210,
-        1,0,0,0,208,206,1,0,0,0,208,209,1,0,0,0,209,212,1,0,0,0,210,208,
-        1,0,0,0,211,199,1,0,0,0,211,212,1,0,0,0,212,216,1,0,0,0,213,215,
-        5,45,0,0,214,213,1,0,0,0,215,218,1,0,0,0,216,214,1,0,0,0,216,217,
-        1,0,0,0,217,219,1,0,0,0,218,216,1,0,0,0,219,220,5,9,0,0,220,221,
-        5,3,0,0,221,13,1,0,0,0,222,223,5,17,0,0,223,225,5,39,0,0,224,226,
-        3,60,30,0,225,224,1,0,0,0,225,226,1,0,0,0,226,227,1,0,0,0,227,228,
-        5,40,0,0,228,15,1,0,0,0,229,234,3,18,9,0,230,231,5,42,0,0,231,233,
-        3,18,9,0,232,230,1,0,0,0,233,236,1,0,0,0,234,232,1,0,0,0,234,235,
-        1,0,0,0,235,17,1,0,0,0,236,234,1,0,0,0,237,239,3,20,10,0,238,237,
-        1,0,0,0,238,239,1,0,0,0,239,240,1,0,0,0,240,241,5,17,0,0,241,19,
-        1,0,0,0,242,243,5,44,0,0,243,244,5,17,0,0,244,245,5,25,0,0,245,246,
-        3,22,11,0,246,247,5,27,0,0,247,21,1,0,0,0,248,253,3,24,12,0,249,
-        250,5,42,0,0,250,252,3,24,12,0,251,249,1,0,0,0,252,255,1,0,0,0,253,
-        251,1,0,0,0,253,254,1,0,0,0,254,23,1,0,0,0,255,253,1,0,0,0,256,257,
-        7,1,0,0,257,25,1,0,0,0,258,260,5,4,0,0,259,261,3,20,10,0,260,259,
-        1,0,0,0,260,261,1,0,0,0,261,262,1,0,0,0,262,263,5,17,0,0,263,264,
-        5,5,0,0,264,265,5,17,0,0,265,267,5,41,0,0,266,268,5,45,0,0,267,266,
-        1,0,0,0,268,269,1,0,0,0,269,267,1,0,0,0,269,270,1,0,0,0,270,283,
-        1,0,0,0,271,280,3,2,1,0,272,274,5,45,0,0,273,272,1,0,0,0,274,275,
-        1,0,0,0,275,273,1,0,0,0,275,276,1,0,0,0,276,277,1,0,0,0,277,279,
-        3,2,1,0,278,273,1,0,0,0,279,282,1,0,0,0,280,278,1,0,0,0,280,281,
-        1,0,0,0,281,284,1,0,0,0,282,280,1,0,0,0,283,271,1,0,0,0,283,284,
-        1,0,0,0,284,288,1,0,0,0,285,287,5,45,0,0,286,285,1,0,0,0,287,290,
-        1,0,0,0,288,286,1,0,0,0,288,289,1,0,0,0,289,291,1,0,0,0,290,288,
-        1,0,0,0,291,292,5,9,0,0,292,293,5,4,0,0,293,27,1,0,0,0,294,296,5,
-        4,0,0,295,297,3,20,10,0,296,295,1,0,0,0,296,297,1,0,0,0,297,298,
-        1,0,0,0,298,299,5,39,0,0,299,300,5,17,0,0,300,301,5,23,0,0,301,302,
-        3,42,21,0,302,303,7,2,0,0,303,304,3,42,21,0,304,305,7,2,0,0,305,
-        306,3,30,15,0,306,307,5,40,0,0,307,309,5,41,0,0,308,310,5,45,0,0,
-        309,308,1,0,0,0,310,311,1,0,0,0,311,309,1,0,0,0,311,312,1,0,0,0,
-        312,313,1,0,0,0,313,314,3,40,20,0,314,315,5,9,0,0,315,316,5,4,0,
-        0,316,29,1,0,0,0,317,318,5,17,0,0,318,319,7,0,0,0,319,320,3,42,21,
-        0,320,31,1,0,0,0,321,322,5,6,0,0,322,323,5,39,0,0,323,324,3,42,21,
-        0,324,325,5,40,0,0,325,327,5,41,0,0,326,328,5,45,0,0,327,326,1,0,
-        0,0,328,329,1,0,0,0,329,327,1,0,0,0,329,330,1,0,0,0,330,331,1,0,
-        0,0,331,347,3,40,20,0,332,333,5,7,0,0,333,334,5,6,0,0,334,335,5,
-        39,0,0,335,336,3,42,21,0,336,337,5,40,0,0,337,339,5,41,0,0,338,340,
-        5,45,0,0,339,338,1,0,0,0,340,341,1,0,0,0,341,339,1,0,0,0,341,342,
-        1,0,0,0,342,343,1,0,0,0,343,344,3,40,20,0,344,346,1,0,0,0,345,332,
-        1,0,0,0,346,349,1,0,0,0,347,345,1,0,0,0,347,348,1,0,0,0,348,358,
-        1,0,0,0,349,347,1,0,0,0,350,351,5,7,0,0,351,353,5,41,0,0,352,354,
-        5,45,0,0,353,352,1,0,0,0,354,355,1,0,0,0,355,353,1,0,0,0,355,356,
-        1,0,0,0,356,357,1,0,0,0,357,359,3,40,20,0,358,350,1,0,0,0,358,359,
-        1,0,0,0,359,360,1,0,0,0,360,361,5,9,0,0,361,362,5,6,0,0,362,33,1,
-        0,0,0,363,364,5,10,0,0,364,365,5,39,0,0,365,366,3,42,21,0,366,367,
+        20,10,20,12,20,420,9,20,1,21,1,21,1,22,1,22,1,22,5,22,427,8,22,10,
+        22,12,22,430,9,22,1,23,1,23,1,23,5,23,435,8,23,10,23,12,23,438,9,
+        23,1,24,1,24,1,24,3,24,443,8,24,1,25,1,25,1,25,5,25,448,8,25,10,
+        25,12,25,451,9,25,1,26,1,26,1,26,5,26,456,8,26,10,26,12,26,459,9,
+        26,1,27,1,27,1,27,5,27,464,8,27,10,27,12,27,467,9,27,1,28,1,28,1,
+        28,3,28,472,8,28,1,29,1,29,1,29,1,29,1,29,1,29,1,29,3,29,481,8,29,
+        1,29,1,29,1,29,1,29,1,29,1,29,1,29,3,29,490,8,29,1,30,1,30,1,30,
+        5,30,495,8,30,10,30,12,30,498,9,30,1,31,1,31,1,31,0,0,32,0,2,4,6,
+        8,10,12,14,16,18,20,22,24,26,28,30,32,34,36,38,40,42,44,46,48,50,
+        52,54,56,58,60,62,0,7,4,0,29,29,31,31,33,33,35,35,2,0,17,17,19,20,
+        1,0,42,43,2,0,22,22,24,27,2,0,32,32,34,34,2,0,30,30,36,36,2,0,12,
+        13,16,20,544,0,67,1,0,0,0,2,136,1,0,0,0,4,144,1,0,0,0,6,146,1,0,
+        0,0,8,180,1,0,0,0,10,182,1,0,0,0,12,186,1,0,0,0,14,222,1,0,0,0,16,
+        229,1,0,0,0,18,238,1,0,0,0,20,242,1,0,0,0,22,248,1,0,0,0,24,256,
+        1,0,0,0,26,258,1,0,0,0,28,294,1,0,0,0,30,317,1,0,0,0,32,321,1,0,
+        0,0,34,363,1,0,0,0,36,396,1,0,0,0,38,399,1,0,0,0,40,413,1,0,0,0,
+        42,421,1,0,0,0,44,423,1,0,0,0,46,431,1,0,0,0,48,439,1,0,0,0,50,444,
+        1,0,0,0,52,452,1,0,0,0,54,460,1,0,0,0,56,471,1,0,0,0,58,489,1,0,
+        0,0,60,491,1,0,0,0,62,499,1,0,0,0,64,66,5,45,0,0,65,64,1,0,0,0,66,
+        69,1,0,0,0,67,65,1,0,0,0,67,68,1,0,0,0,68,70,1,0,0,0,69,67,1,0,0,
+        0,70,79,3,2,1,0,71,73,5,45,0,0,72,71,1,0,0,0,73,74,1,0,0,0,74,72,
+        1,0,0,0,74,75,1,0,0,0,75,76,1,0,0,0,76,78,3,2,1,0,77,72,1,0,0,0,
+        78,81,1,0,0,0,79,77,1,0,0,0,79,80,1,0,0,0,80,85,1,0,0,0,81,79,1,
+        0,0,0,82,84,5,45,0,0,83,82,1,0,0,0,84,87,1,0,0,0,85,83,1,0,0,0,85,
+        86,1,0,0,0,86,88,1,0,0,0,87,85,1,0,0,0,88,89,5,0,0,1,89,1,1,0,0,
+        0,90,92,3,20,10,0,91,90,1,0,0,0,91,92,1,0,0,0,92,93,1,0,0,0,93,95,
+        3,6,3,0,94,96,5,43,0,0,95,94,1,0,0,0,95,96,1,0,0,0,96,137,1,0,0,
+        0,97,137,3,12,6,0,98,100,3,20,10,0,99,98,1,0,0,0,99,100,1,0,0,0,
+        100,101,1,0,0,0,101,103,3,14,7,0,102,104,5,43,0,0,103,102,1,0,0,
+        0,103,104,1,0,0,0,104,137,1,0,0,0,105,137,3,26,13,0,106,137,3,28,
+        14,0,107,109,3,20,10,0,108,107,1,0,0,0,108,109,1,0,0,0,109,110,1,
+        0,0,0,110,137,3,32,16,0,111,113,3,20,10,0,112,111,1,0,0,0,112,113,
+        1,0,0,0,113,114,1,0,0,0,114,137,3,34,17,0,115,117,3,20,10,0,116,
+        115,1,0,0,0,116,117,1,0,0,0,117,118,1,0,0,0,118,120,3,36,18,0,119,
+        121,5,43,0,0,120,119,1,0,0,0,120,121,1,0,0,0,121,137,1,0,0,0,122,
+        124,3,20,10,0,123,122,1,0,0,0,123,124,1,0,0,0,124,125,1,0,0,0,125,
+        127,3,38,19,0,126,128,5,43,0,0,127,126,1,0,0,0,127,128,1,0,0,0,128,
+        137,1,0,0,0,129,131,3,20,10,0,130,129,1,0,0,0,130,131,1,0,0,0,131,
+        132,1,0,0,0,132,134,3,10,5,0,133,135,5,43,0,0,134,133,1,0,0,0,134,
+        135,1,0,0,0,135,137,1,0,0,0,136,91,1,0,0,0,136,97,1,0,0,0,136,99,
+        1,0,0,0,136,105,1,0,0,0,136,106,1,0,0,0,136,108,1,0,0,0,136,112,
+        1,0,0,0,136,116,1,0,0,0,136,123,1,0,0,0,136,130,1,0,0,0,137,3,1,
+        0,0,0,138,139,5,17,0,0,139,140,5,37,0,0,140,141,3,42,21,0,141,142,
+        5,38,0,0,142,145,1,0,0,0,143,145,5,17,0,0,144,138,1,0,0,0,144,143,
+        1,0,0,0,145,5,1,0,0,0,146,147,3,4,2,0,147,150,5,23,0,0,148,151,3,
+        42,21,0,149,151,3,8,4,0,150,148,1,0,0,0,150,149,1,0,0,0,151,7,1,
+        0,0,0,152,153,5,1,0,0,153,154,5,37,0,0,154,155,3,42,21,0,155,156,
+        5,2,0,0,156,157,3,42,21,0,157,158,5,38,0,0,158,181,1,0,0,0,159,160,
+        5,1,0,0,160,161,5,39,0,0,161,164,3,42,21,0,162,163,5,42,0,0,163,
+        165,3,42,21,0,164,162,1,0,0,0,164,165,1,0,0,0,165,166,1,0,0,0,166,
+        167,5,40,0,0,167,181,1,0,0,0,168,169,5,1,0,0,169,170,5,37,0,0,170,
+        175,3,42,21,0,171,172,5,42,0,0,172,174,3,42,21,0,173,171,1,0,0,0,
+        174,177,1,0,0,0,175,173,1,0,0,0,175,176,1,0,0,0,176,178,1,0,0,0,
+        177,175,1,0,0,0,178,179,5,38,0,0,179,181,1,0,0,0,180,152,1,0,0,0,
+        180,159,1,0,0,0,180,168,1,0,0,0,181,9,1,0,0,0,182,183,3,4,2,0,183,
+        184,7,0,0,0,184,185,3,42,21,0,185,11,1,0,0,0,186,187,5,3,0,0,187,
+        188,5,17,0,0,188,190,5,39,0,0,189,191,3,16,8,0,190,189,1,0,0,0,190,
+        191,1,0,0,0,191,192,1,0,0,0,192,193,5,40,0,0,193,195,5,41,0,0,194,
+        196,5,45,0,0,195,194,1,0,0,0,196,197,1,0,0,0,197,195,1,0,0,0,197,
+        198,1,0,0,0,198,211,1,0,0,0,199,208,3,2,1,0,200,202,5,45,0,0,201,
+        200,1,0,0,0,202,203,1,0,0,0,203,201,1,0,0,0,203,204,1,0,0,0,204,
+        205,1,0,0,0,205,207,3,2,1,0,206,201,1,0,0,0,207,210,1,0,0,0,208,
+        206,1,0,0,0,208,209,1,0,0,0,209,212,1,0,0,0,210,208,1,0,0,0,211,
+        199,1,0,0,0,211,212,1,0,0,0,212,216,1,0,0,0,213,215,5,45,0,0,214,
+        213,1,0,0,0,215,218,1,0,0,0,216,214,1,0,0,0,216,217,1,0,0,0,217,
+        219,1,0,0,0,218,216,1,0,0,0,219,220,5,9,0,0,220,221,5,3,0,0,221,
+        13,1,0,0,0,222,223,5,17,0,0,223,225,5,39,0,0,224,226,3,60,30,0,225,
+        224,1,0,0,0,225,226,1,0,0,0,226,227,1,0,0,0,227,228,5,40,0,0,228,
+        15,1,0,0,0,229,234,3,18,9,0,230,231,5,42,0,0,231,233,3,18,9,0,232,
+        230,1,0,0,0,233,236,1,0,0,0,234,232,1,0,0,0,234,235,1,0,0,0,235,
+        17,1,0,0,0,236,234,1,0,0,0,237,239,3,20,10,0,238,237,1,0,0,0,238,
+        239,1,0,0,0,239,240,1,0,0,0,240,241,5,17,0,0,241,19,1,0,0,0,242,
+        243,5,44,0,0,243,244,5,17,0,0,244,245,5,25,0,0,245,246,3,22,11,0,
+        246,247,5,27,0,0,247,21,1,0,0,0,248,253,3,24,12,0,249,250,5,42,0,
+        0,250,252,3,24,12,0,251,249,1,0,0,0,252,255,1,0,0,0,253,251,1,0,
+        0,0,253,254,1,0,0,0,254,23,1,0,0,0,255,253,1,0,0,0,256,257,7,1,0,
+        0,257,25,1,0,0,0,258,260,5,4,0,0,259,261,3,20,10,0,260,259,1,0,0,
+        0,260,261,1,0,0,0,261,262,1,0,0,0,262,263,5,17,0,0,263,264,5,5,0,
+        0,264,265,5,17,0,0,265,267,5,41,0,0,266,268,5,45,0,0,267,266,1,0,
+        0,0,268,269,1,0,0,0,269,267,1,0,0,0,269,270,1,0,0,0,270,283,1,0,
+        0,0,271,280,3,2,1,0,272,274,5,45,0,0,273,272,1,0,0,0,274,275,1,0,
+        0,0,275,273,1,0,0,0,275,276,1,0,0,0,276,277,1,0,0,0,277,279,3,2,
+        1,0,278,273,1,0,0,0,279,282,1,0,0,0,280,278,1,0,0,0,280,281,1,0,
+        0,0,281,284,1,0,0,0,282,280,1,0,0,0,283,271,1,0,0,0,283,284,1,0,
+        0,0,284,288,1,0,0,0,285,287,5,45,0,0,286,285,1,0,0,0,287,290,1,0,
+        0,0,288,286,1,0,0,0,288,289,1,0,0,0,289,291,1,0,0,0,290,288,1,0,
+        0,0,291,292,5,9,0,0,292,293,5,4,0,0,293,27,1,0,0,0,294,296,5,4,0,
+        0,295,297,3,20,10,0,296,295,1,0,0,0,296,297,1,0,0,0,297,298,1,0,
+        0,0,298,299,5,39,0,0,299,300,5,17,0,0,300,301,5,23,0,0,301,302,3,
+        42,21,0,302,303,7,2,0,0,303,304,3,42,21,0,304,305,7,2,0,0,305,306,
+        3,30,15,0,306,307,5,40,0,0,307,309,5,41,0,0,308,310,5,45,0,0,309,
+        308,1,0,0,0,310,311,1,0,0,0,311,309,1,0,0,0,311,312,1,0,0,0,312,
+        313,1,0,0,0,313,314,3,40,20,0,314,315,5,9,0,0,315,316,5,4,0,0,316,
+        29,1,0,0,0,317,318,5,17,0,0,318,319,7,0,0,0,319,320,3,42,21,0,320,
+        31,1,0,0,0,321,322,5,6,0,0,322,323,5,39,0,0,323,324,3,42,21,0,324,
+        325,5,40,0,0,325,327,5,41,0,0,326,328,5,45,0,0,327,326,1,0,0,0,328,
+        329,1,0,0,0,329,327,1,0,0,0,329,330,1,0,0,0,330,331,1,0,0,0,331,
+        347,3,40,20,0,332,333,5,7,0,0,333,334,5,6,0,0,334,335,5,39,0,0,335,
+        336,3,42,21,0,336,337,5,40,0,0,337,339,5,41,0,0,338,340,5,45,0,0,
+        339,338,1,0,0,0,340,341,1,0,0,0,341,339,1,0,0,0,341,342,1,0,0,0,
+        342,343,1,0,0,0,343,344,3,40,20,0,344,346,1,0,0,0,345,332,1,0,0,
+        0,346,349,1,0,0,0,347,345,1,0,0,0,347,348,1,0,0,0,348,358,1,0,0,
+        0,349,347,1,0,0,0,350,351,5,7,0,0,351,353,5,41,0,0,352,354,5,45,
+        0,0,353,352,1,0,0,0,354,355,1,0,0,0,355,353,1,0,0,0,355,356,1,0,
+        0,0,356,357,1,0,0,0,357,359,3,40,20,0,358,350,1,0,0,0,358,359,1,
+        0,0,0,359,360,1,0,0,0,360,361,5,9,0,0,361,362,5,6,0,0,362,33,1,0,
+        0,0,363,364,5,10,0,0,364,365,5,39,0,0,365,366,3,42,21,0,366,367,
         5,40,0,0,367,369,5,41,0,0,368,370,5,45,0,0,369,368,1,0,0,0,370,371,
         1,0,0,0,371,369,1,0,0,0,371,372,1,0,0,0,372,385,1,0,0,0,373,382,
         3,2,1,0,374,376,5,45,0,0,375,374,1,0,0,0,376,377,1,0,0,0,377,375,
@@ -169,38 +168,33 @@ def serializedATN():
         1,0,0,0,412,410,1,0,0,0,413,401,1,0,0,0,413,414,1,0,0,0,414,418,
         1,0,0,0,415,417,5,45,0,0,416,415,1,0,0,0,417,420,1,0,0,0,418,416,
         1,0,0,0,418,419,1,0,0,0,419,41,1,0,0,0,420,418,1,0,0,0,421,422,3,
-        44,22,0,422,43,1,0,0,0,423,426,3,46,23,0,424,425,5,15,0,0,425,427,
-        3,46,23,0,426,424,1,0,0,0,427,428,1,0,0,0,428,426,1,0,0,0,428,429,
-        1,0,0,0,429,432,1,0,0,0,430,432,3,46,23,0,431,423,1,0,0,0,431,430,
-        1,0,0,0,432,45,1,0,0,0,433,436,3,48,24,0,434,435,5,14,0,0,435,437,
-        3,48,24,0,436,434,1,0,0,0,437,438,1,0,0,0,438,436,1,0,0,0,438,439,
-        1,0,0,0,439,442,1,0,0,0,440,442,3,48,24,0,441,433,1,0,0,0,441,440,
-        1,0,0,0,442,47,1,0,0,0,443,444,3,50,25,0,444,445,7,3,0,0,445,446,
-        3,50,25,0,446,449,1,0,0,0,447,449,3,50,25,0,448,443,1,0,0,0,448,
-        447,1,0,0,0,449,49,1,0,0,0,450,453,3,52,26,0,451,452,7,4,0,0,452,
-        454,3,52,26,0,453,451,1,0,0,0,454,455,1,0,0,0,455,453,1,0,0,0,455,
-        456,1,0,0,0,456,459,1,0,0,0,457,459,3,52,26,0,458,450,1,0,0,0,458,
-        457,1,0,0,0,459,51,1,0,0,0,460,463,3,54,27,0,461,462,7,5,0,0,462,
-        464,3,54,27,0,463,461,1,0,0,0,464,465,1,0,0,0,465,463,1,0,0,0,465,
-        466,1,0,0,0,466,469,1,0,0,0,467,469,3,54,27,0,468,460,1,0,0,0,468,
-        467,1,0,0,0,469,53,1,0,0,0,470,473,3,56,28,0,471,472,5,28,0,0,472,
-        474,3,56,28,0,473,471,1,0,0,0,474,475,1,0,0,0,475,473,1,0,0,0,475,
-        476,1,0,0,0,476,479,1,0,0,0,477,479,3,56,28,0,478,470,1,0,0,0,478,
-        477,1,0,0,0,479,55,1,0,0,0,480,481,5,34,0,0,481,484,3,56,28,0,482,
-        484,3,58,29,0,483,480,1,0,0,0,483,482,1,0,0,0,484,57,1,0,0,0,485,
-        486,5,39,0,0,486,487,3,42,21,0,487,488,5,40,0,0,488,502,1,0,0,0,
-        489,490,5,17,0,0,490,492,5,39,0,0,491,493,3,60,30,0,492,491,1,0,
-        0,0,492,493,1,0,0,0,493,494,1,0,0,0,494,502,5,40,0,0,495,496,5,17,
-        0,0,496,497,5,37,0,0,497,498,3,42,21,0,498,499,5,38,0,0,499,502,
-        1,0,0,0,500,502,3,62,31,0,501,485,1,0,0,0,501,489,1,0,0,0,501,495,
-        1,0,0,0,501,500,1,0,0,0,502,59,1,0,0,0,503,508,3,42,21,0,504,505,
-        5,42,0,0,505,507,3,42,21,0,506,504,1,0,0,0,507,510,1,0,0,0,508,506,
-        1,0,0,0,508,509,1,0,0,0,509,61,1,0,0,0,510,508,1,0,0,0,511,512,7,
-        6,0,0,512,63,1,0,0,0,69,67,74,79,85,91,95,99,103,108,112,116,120,
-        123,127,130,134,136,144,150,164,175,180,190,197,203,208,211,216,
-        225,234,238,253,260,269,275,280,283,288,296,311,329,341,347,355,
-        358,371,377,382,385,390,405,410,413,418,428,431,438,441,448,455,
-        458,465,468,475,478,483,492,501,508
+        44,22,0,422,43,1,0,0,0,423,428,3,46,23,0,424,425,5,15,0,0,425,427,
+        3,46,23,0,426,424,1,0,0,0,427,430,1,0,0,0,428,426,1,0,0,0,428,429,
+        1,0,0,0,429,45,1,0,0,0,430,428,1,0,0,0,431,436,3,48,24,0,432,433,
+        5,14,0,0,433,435,3,48,24,0,434,432,1,0,0,0,435,438,1,0,0,0,436,434,
+        1,0,0,0,436,437,1,0,0,0,437,47,1,0,0,0,438,436,1,0,0,0,439,442,3,
+        50,25,0,440,441,7,3,0,0,441,443,3,50,25,0,442,440,1,0,0,0,442,443,
+        1,0,0,0,443,49,1,0,0,0,444,449,3,52,26,0,445,446,7,4,0,0,446,448,
+        3,52,26,0,447,445,1,0,0,0,448,451,1,0,0,0,449,447,1,0,0,0,449,450,
+        1,0,0,0,450,51,1,0,0,0,451,449,1,0,0,0,452,457,3,54,27,0,453,454,
+        7,5,0,0,454,456,3,54,27,0,455,453,1,0,0,0,456,459,1,0,0,0,457,455,
+        1,0,0,0,457,458,1,0,0,0,458,53,1,0,0,0,459,457,1,0,0,0,460,465,3,
+        56,28,0,461,462,5,28,0,0,462,464,3,56,28,0,463,461,1,0,0,0,464,467,
+        1,0,0,0,465,463,1,0,0,0,465,466,1,0,0,0,466,55,1,0,0,0,467,465,1,
+        0,0,0,468,469,5,34,0,0,469,472,3,56,28,0,470,472,3,58,29,0,471,468,
+        1,0,0,0,471,470,1,0,0,0,472,57,1,0,0,0,473,474,5,39,0,0,474,475,
+        3,42,21,0,475,476,5,40,0,0,476,490,1,0,0,0,477,478,5,17,0,0,478,
+        480,5,39,0,0,479,481,3,60,30,0,480,479,1,0,0,0,480,481,1,0,0,0,481,
+        482,1,0,0,0,482,490,5,40,0,0,483,484,5,17,0,0,484,485,5,37,0,0,485,
+        486,3,42,21,0,486,487,5,38,0,0,487,490,1,0,0,0,488,490,3,62,31,0,
+        489,473,1,0,0,0,489,477,1,0,0,0,489,483,1,0,0,0,489,488,1,0,0,0,
+        490,59,1,0,0,0,491,496,3,42,21,0,492,493,5,42,0,0,493,495,3,42,21,
+        0,494,492,1,0,0,0,495,498,1,0,0,0,496,494,1,0,0,0,496,497,1,0,0,
+        0,497,61,1,0,0,0,498,496,1,0,0,0,499,500,7,6,0,0,500,63,1,0,0,0,
+        64,67,74,79,85,91,95,99,103,108,112,116,120,123,127,130,134,136,
+        144,150,164,175,180,190,197,203,208,211,216,225,234,238,253,260,
+        269,275,280,283,288,296,311,329,341,347,355,358,371,377,382,385,
+        390,405,410,413,418,428,436,442,449,457,465,471,480,489,496
     ]
 
 class PseudocodeParser ( Parser ):
@@ -2701,114 +2695,59 @@ class PseudocodeParser ( Parser ):
             super().__init__(parent, invokingState)
             self.parser = parser
 
-
-        def getRuleIndex(self):
-            return PseudocodeParser.RULE_logicalOrExpression
-
-     
-        def copyFrom(self, ctx:ParserRuleContext):
-            super().copyFrom(ctx)
-
-
-
-    class OrExprContext(LogicalOrExpressionContext):
-
-        def __init__(self, parser, ctx:ParserRuleContext): # actually a PseudocodeParser.LogicalOrExpressionContext
-            super().__init__(parser)
-            self.left = None # LogicalAndExpressionContext
-            self.right = None # LogicalAndExpressionContext
-            self.copyFrom(ctx)
-
         def logicalAndExpression(self, i:int=None):
             if i is None:
                 return self.getTypedRuleContexts(PseudocodeParser.LogicalAndExpressionContext)
             else:
                 return self.getTypedRuleContext(PseudocodeParser.LogicalAndExpressionContext,i)
 
+
         def OR(self, i:int=None):
             if i is None:
                 return self.getTokens(PseudocodeParser.OR)
             else:
                 return self.getToken(PseudocodeParser.OR, i)
 
-        def enterRule(self, listener:ParseTreeListener):
-            if hasattr( listener, "enterOrExpr" ):
-                listener.enterOrExpr(self)
-
-        def exitRule(self, listener:ParseTreeListener):
-            if hasattr( listener, "exitOrExpr" ):
-                listener.exitOrExpr(self)
-
-        def accept(self, visitor:ParseTreeVisitor):
-            if hasattr( visitor, "visitOrExpr" ):
-                return visitor.visitOrExpr(self)
-            else:
-                return visitor.visitChildren(self)
-
-
-    class OrPassContext(LogicalOrExpressionContext):
-
-        def __init__(self, parser, ctx:ParserRuleContext): # actually a PseudocodeParser.LogicalOrExpressionContext
-            super().__init__(parser)
-            self.copyFrom(ctx)
-
-        def logicalAndExpression(self):
-            return self.getTypedRuleContext(PseudocodeParser.LogicalAndExpressionContext,0)
-
+        def getRuleIndex(self):
+            return PseudocodeParser.RULE_logicalOrExpression
 
         def enterRule(self, listener:ParseTreeListener):
-            if hasattr( listener, "enterOrPass" ):
-                listener.enterOrPass(self)
+            if hasattr( listener, "enterLogicalOrExpression" ):
+                listener.enterLogicalOrExpression(self)
 
         def exitRule(self, listener:ParseTreeListener):
-            if hasattr( listener, "exitOrPass" ):
-                listener.exitOrPass(self)
+            if hasattr( listener, "exitLogicalOrExpression" ):
+                listener.exitLogicalOrExpression(self)
 
         def accept(self, visitor:ParseTreeVisitor):
-            if hasattr( visitor, "visitOrPass" ):
-                return visitor.visitOrPass(self)
+            if hasattr( visitor, "visitLogicalOrExpression" ):
+                return visitor.visitLogicalOrExpression(self)
             else:
                 return visitor.visitChildren(self)
 
 
 
+
     def logicalOrExpression(self):
 
         localctx = PseudocodeParser.LogicalOrExpressionContext(self, self._ctx, self.state)
         self.enterRule(localctx, 44, self.RULE_logicalOrExpression)
         self._la = 0 # Token type
         try:
-            self.state = 431
+            self.enterOuterAlt(localctx, 1)
+            self.state = 423
+            self.logicalAndExpression()
+            self.state = 428
             self._errHandler.sync(self)
-            la_ = self._interp.adaptivePredict(self._input,55,self._ctx)
-            if la_ == 1:
-                localctx = PseudocodeParser.OrExprContext(self, localctx)
-                self.enterOuterAlt(localctx, 1)
-                self.state = 423
-                localctx.left = self.logicalAndExpression()
-                self.state = 426 
+            _la = self._input.LA(1)
+            while _la==15:
+                self.state = 424
+                self.match(PseudocodeParser.OR)
+                self.state = 425
+                self.logicalAndExpression()
+                self.state = 430
                 self._errHandler.sync(self)
                 _la = self._input.LA(1)
-                while True:
-                    self.state = 424
-                    self.match(PseudocodeParser.OR)
-                    self.state = 425
-                    localctx.right = self.logicalAndExpression()
-                    self.state = 428 
-                    self._errHandler.sync(self)
-                    _la = self._input.LA(1)
-                    if not (_la==15):
-                        break
-
-                pass
-
-            elif la_ == 2:
-                localctx = PseudocodeParser.OrPassContext(self, localctx)
-                self.enterOuterAlt(localctx, 2)
-                self.state = 430
-                self.logicalAndExpression()
-                pass
-
 
         except RecognitionException as re:
             localctx.exception = re
@@ -2826,114 +2765,59 @@ class PseudocodeParser ( Parser ):
             super().__init__(parent, invokingState)
             self.parser = parser
 
-
-        def getRuleIndex(self):
-            return PseudocodeParser.RULE_logicalAndExpression
-
-     
-        def copyFrom(self, ctx:ParserRuleContext):
-            super().copyFrom(ctx)
-
-
-
-    class AndExprContext(LogicalAndExpressionContext):
-
-        def __init__(self, parser, ctx:ParserRuleContext): # actually a PseudocodeParser.LogicalAndExpressionContext
-            super().__init__(parser)
-            self.left = None # ComparisonExpressionContext
-            self.right = None # ComparisonExpressionContext
-            self.copyFrom(ctx)
-
         def comparisonExpression(self, i:int=None):
             if i is None:
                 return self.getTypedRuleContexts(PseudocodeParser.ComparisonExpressionContext)
             else:
                 return self.getTypedRuleContext(PseudocodeParser.ComparisonExpressionContext,i)
 
+
         def AND(self, i:int=None):
             if i is None:
                 return self.getTokens(PseudocodeParser.AND)
             else:
                 return self.getToken(PseudocodeParser.AND, i)
 
-        def enterRule(self, listener:ParseTreeListener):
-            if hasattr( listener, "enterAndExpr" ):
-                listener.enterAndExpr(self)
-
-        def exitRule(self, listener:ParseTreeListener):
-            if hasattr( listener, "exitAndExpr" ):
-                listener.exitAndExpr(self)
-
-        def accept(self, visitor:ParseTreeVisitor):
-            if hasattr( visitor, "visitAndExpr" ):
-                return visitor.visitAndExpr(self)
-            else:
-                return visitor.visitChildren(self)
-
-
-    class AndPassContext(LogicalAndExpressionContext):
-
-        def __init__(self, parser, ctx:ParserRuleContext): # actually a PseudocodeParser.LogicalAndExpressionContext
-            super().__init__(parser)
-            self.copyFrom(ctx)
-
-        def comparisonExpression(self):
-            return self.getTypedRuleContext(PseudocodeParser.ComparisonExpressionContext,0)
-
+        def getRuleIndex(self):
+            return PseudocodeParser.RULE_logicalAndExpression
 
         def enterRule(self, listener:ParseTreeListener):
-            if hasattr( listener, "enterAndPass" ):
-                listener.enterAndPass(self)
+            if hasattr( listener, "enterLogicalAndExpression" ):
+                listener.enterLogicalAndExpression(self)
 
         def exitRule(self, listener:ParseTreeListener):
-            if hasattr( listener, "exitAndPass" ):
-                listener.exitAndPass(self)
+            if hasattr( listener, "exitLogicalAndExpression" ):
+                listener.exitLogicalAndExpression(self)
 
         def accept(self, visitor:ParseTreeVisitor):
-            if hasattr( visitor, "visitAndPass" ):
-                return visitor.visitAndPass(self)
+            if hasattr( visitor, "visitLogicalAndExpression" ):
+                return visitor.visitLogicalAndExpression(self)
             else:
                 return visitor.visitChildren(self)
 
 
 
+
     def logicalAndExpression(self):
 
         localctx = PseudocodeParser.LogicalAndExpressionContext(self, self._ctx, self.state)
         self.enterRule(localctx, 46, self.RULE_logicalAndExpression)
         self._la = 0 # Token type
         try:
-            self.state = 441
+            self.enterOuterAlt(localctx, 1)
+            self.state = 431
+            self.comparisonExpression()
+            self.state = 436
             self._errHandler.sync(self)
-            la_ = self._interp.adaptivePredict(self._input,57,self._ctx)
-            if la_ == 1:
-                localctx = PseudocodeParser.AndExprContext(self, localctx)
-                self.enterOuterAlt(localctx, 1)
+            _la = self._input.LA(1)
+            while _la==14:
+                self.state = 432
+                self.match(PseudocodeParser.AND)
                 self.state = 433
-                localctx.left = self.comparisonExpression()
-                self.state = 436 
+                self.comparisonExpression()
+                self.state = 438
                 self._errHandler.sync(self)
                 _la = self._input.LA(1)
-                while True:
-                    self.state = 434
-                    self.match(PseudocodeParser.AND)
-                    self.state = 435
-                    localctx.right = self.comparisonExpression()
-                    self.state = 438 
-                    self._errHandler.sync(self)
-                    _la = self._input.LA(1)
-                    if not (_la==14):
-                        break
-
-                pass
-
-            elif la_ == 2:
-                localctx = PseudocodeParser.AndPassContext(self, localctx)
-                self.enterOuterAlt(localctx, 2)
-                self.state = 440
-                self.comparisonExpression()
-                pass
-
 
         except RecognitionException as re:
             localctx.exception = re
@@ -2950,25 +2834,7 @@ class PseudocodeParser ( Parser ):
         def __init__(self, parser, parent:ParserRuleContext=None, invokingState:int=-1):
             super().__init__(parent, invokingState)
             self.parser = parser
-
-
-        def getRuleIndex(self):
-            return PseudocodeParser.RULE_comparisonExpression
-
-     
-        def copyFrom(self, ctx:ParserRuleContext):
-            super().copyFrom(ctx)
-
-
-
-    class CompareExprContext(ComparisonExpressionContext):
-
-        def __init__(self, parser, ctx:ParserRuleContext): # actually a PseudocodeParser.ComparisonExpressionContext
-            super().__init__(parser)
-            self.left = None # AdditiveExpressionContext
             self.op = None # Token
-            self.right = None # AdditiveExpressionContext
-            self.copyFrom(ctx)
 
         def additiveExpression(self, i:int=None):
             if i is None:
@@ -2976,73 +2842,56 @@ class PseudocodeParser ( Parser ):
             else:
                 return self.getTypedRuleContext(PseudocodeParser.AdditiveExpressionContext,i)
 
+
         def EQEQ(self):
             return self.getToken(PseudocodeParser.EQEQ, 0)
+
         def LOW_THAN(self):
             return self.getToken(PseudocodeParser.LOW_THAN, 0)
+
         def GREATER_THAN(self):
             return self.getToken(PseudocodeParser.GREATER_THAN, 0)
+
         def LESS_EQ(self):
             return self.getToken(PseudocodeParser.LESS_EQ, 0)
+
         def GREATER_EQ(self):
             return self.getToken(PseudocodeParser.GREATER_EQ, 0)
 
-        def enterRule(self, listener:ParseTreeListener):
-            if hasattr( listener, "enterCompareExpr" ):
-                listener.enterCompareExpr(self)
-
-        def exitRule(self, listener:ParseTreeListener):
-            if hasattr( listener, "exitCompareExpr" ):
-                listener.exitCompareExpr(self)
-
-        def accept(self, visitor:ParseTreeVisitor):
-            if hasattr( visitor, "visitCompareExpr" ):
-                return visitor.visitCompareExpr(self)
-            else:
-                return visitor.visitChildren(self)
-
-
-    class ComparisonPassContext(ComparisonExpressionContext):
-
-        def __init__(self, parser, ctx:ParserRuleContext): # actually a PseudocodeParser.ComparisonExpressionContext
-            super().__init__(parser)
-            self.copyFrom(ctx)
-
-        def additiveExpression(self):
-            return self.getTypedRuleContext(PseudocodeParser.AdditiveExpressionContext,0)
-
+        def getRuleIndex(self):
+            return PseudocodeParser.RULE_comparisonExpression
 
         def enterRule(self, listener:ParseTreeListener):
-            if hasattr( listener, "enterComparisonPass" ):
-                listener.enterComparisonPass(self)
+            if hasattr( listener, "enterComparisonExpression" ):
+                listener.enterComparisonExpression(self)
 
         def exitRule(self, listener:ParseTreeListener):
-            if hasattr( listener, "exitComparisonPass" ):
-                listener.exitComparisonPass(self)
+            if hasattr( listener, "exitComparisonExpression" ):
+                listener.exitComparisonExpression(self)
 
         def accept(self, visitor:ParseTreeVisitor):
-            if hasattr( visitor, "visitComparisonPass" ):
-                return visitor.visitComparisonPass(self)
+            if hasattr( visitor, "visitComparisonExpression" ):
+                return visitor.visitComparisonExpression(self)
             else:
                 return visitor.visitChildren(self)
 
 
 
+
     def comparisonExpression(self):
 
         localctx = PseudocodeParser.ComparisonExpressionContext(self, self._ctx, self.state)
         self.enterRule(localctx, 48, self.RULE_comparisonExpression)
         self._la = 0 # Token type
         try:
-            self.state = 448
+            self.enterOuterAlt(localctx, 1)
+            self.state = 439
+            self.additiveExpression()
+            self.state = 442
             self._errHandler.sync(self)
-            la_ = self._interp.adaptivePredict(self._input,58,self._ctx)
-            if la_ == 1:
-                localctx = PseudocodeParser.CompareExprContext(self, localctx)
-                self.enterOuterAlt(localctx, 1)
-                self.state = 443
-                localctx.left = self.additiveExpression()
-                self.state = 444
+            _la = self._input.LA(1)
+            if (((_la) & ~0x3f) == 0 and ((1 << _la) & 255852544) != 0):
+                self.state = 440
                 localctx.op = self._input.LT(1)
                 _la = self._input.LA(1)
                 if not((((_la) & ~0x3f) == 0 and ((1 << _la) & 255852544) != 0)):
@@ -3050,16 +2899,8 @@ class PseudocodeParser ( Parser ):
                 else:
                     self._errHandler.reportMatch(self)
                     self.consume()
-                self.state = 445
-                localctx.right = self.additiveExpression()
-                pass
-
-            elif la_ == 2:
-                localctx = PseudocodeParser.ComparisonPassContext(self, localctx)
-                self.enterOuterAlt(localctx, 2)
-                self.state = 447
+                self.state = 441
                 self.additiveExpression()
-                pass
 
 
         except RecognitionException as re:
@@ -3077,50 +2918,7 @@ class PseudocodeParser ( Parser ):
         def __init__(self, parser, parent:ParserRuleContext=None, invokingState:int=-1):
             super().__init__(parent, invokingState)
             self.parser = parser
-
-
-        def getRuleIndex(self):
-            return PseudocodeParser.RULE_additiveExpression
-
-     
-        def copyFrom(self, ctx:ParserRuleContext):
-            super().copyFrom(ctx)
-
-
-
-    class AdditivePassContext(AdditiveExpressionContext):
-
-        def __init__(self, parser, ctx:ParserRuleContext): # actually a PseudocodeParser.AdditiveExpressionContext
-            super().__init__(parser)
-            self.copyFrom(ctx)
-
-        def multiplicativeExpression(self):
-            return self.getTypedRuleContext(PseudocodeParser.MultiplicativeExpressionContext,0)
-
-
-        def enterRule(self, listener:ParseTreeListener):
-            if hasattr( listener, "enterAdditivePass" ):
-                listener.enterAdditivePass(self)
-
-        def exitRule(self, listener:ParseTreeListener):
-            if hasattr( listener, "exitAdditivePass" ):
-                listener.exitAdditivePass(self)
-
-        def accept(self, visitor:ParseTreeVisitor):
-            if hasattr( visitor, "visitAdditivePass" ):
-                return visitor.visitAdditivePass(self)
-            else:
-                return visitor.visitChildren(self)
-
-
-    class AddExprContext(AdditiveExpressionContext):
-
-        def __init__(self, parser, ctx:ParserRuleContext): # actually a PseudocodeParser.AdditiveExpressionContext
-            super().__init__(parser)
-            self.left = None # MultiplicativeExpressionContext
             self.op = None # Token
-            self.right = None # MultiplicativeExpressionContext
-            self.copyFrom(ctx)
 
         def multiplicativeExpression(self, i:int=None):
             if i is None:
@@ -3128,76 +2926,65 @@ class PseudocodeParser ( Parser ):
             else:
                 return self.getTypedRuleContext(PseudocodeParser.MultiplicativeExpressionContext,i)
 
+
         def PLUS(self, i:int=None):
             if i is None:
                 return self.getTokens(PseudocodeParser.PLUS)
             else:
                 return self.getToken(PseudocodeParser.PLUS, i)
+
         def MINUS(self, i:int=None):
             if i is None:
                 return self.getTokens(PseudocodeParser.MINUS)
             else:
                 return self.getToken(PseudocodeParser.MINUS, i)
 
+        def getRuleIndex(self):
+            return PseudocodeParser.RULE_additiveExpression
+
         def enterRule(self, listener:ParseTreeListener):
-            if hasattr( listener, "enterAddExpr" ):
-                listener.enterAddExpr(self)
+            if hasattr( listener, "enterAdditiveExpression" ):
+                listener.enterAdditiveExpression(self)
 
         def exitRule(self, listener:ParseTreeListener):
-            if hasattr( listener, "exitAddExpr" ):
-                listener.exitAddExpr(self)
+            if hasattr( listener, "exitAdditiveExpression" ):
+                listener.exitAdditiveExpression(self)
 
         def accept(self, visitor:ParseTreeVisitor):
-            if hasattr( visitor, "visitAddExpr" ):
-                return visitor.visitAddExpr(self)
+            if hasattr( visitor, "visitAdditiveExpression" ):
+                return visitor.visitAdditiveExpression(self)
             else:
                 return visitor.visitChildren(self)
 
 
 
+
     def additiveExpression(self):
 
         localctx = PseudocodeParser.AdditiveExpressionContext(self, self._ctx, self.state)
         self.enterRule(localctx, 50, self.RULE_additiveExpression)
         self._la = 0 # Token type
         try:
-            self.state = 458
+            self.enterOuterAlt(localctx, 1)
+            self.state = 444
+            self.multiplicativeExpression()
+            self.state = 449
             self._errHandler.sync(self)
-            la_ = self._interp.adaptivePredict(self._input,60,self._ctx)
-            if la_ == 1:
-                localctx = PseudocodeParser.AddExprContext(self, localctx)
-                self.enterOuterAlt(localctx, 1)
-                self.state = 450
-                localctx.left = self.multiplicativeExpression()
-                self.state = 453 
-                self._errHandler.sync(self)
+            _la = self._input.LA(1)
+            while _la==32 or _la==34:
+                self.state = 445
+                localctx.op = self._input.LT(1)
                 _la = self._input.LA(1)
-                while True:
-                    self.state = 451
-                    localctx.op = self._input.LT(1)
-                    _la = self._input.LA(1)
-                    if not(_la==32 or _la==34):
-                        localctx.op = self._errHandler.recoverInline(self)
-                    else:
-                        self._errHandler.reportMatch(self)
-                        self.consume()
-                    self.state = 452
-                    localctx.right = self.multiplicativeExpression()
-                    self.state = 455 
-                    self._errHandler.sync(self)
-                    _la = self._input.LA(1)
-                    if not (_la==32 or _la==34):
-                        break
-
-                pass
-
-            elif la_ == 2:
-                localctx = PseudocodeParser.AdditivePassContext(self, localctx)
-                self.enterOuterAlt(localctx, 2)
-                self.state = 457
+                if not(_la==32 or _la==34):
+                    localctx.op = self._errHandler.recoverInline(self)
+                else:
+                    self._errHandler.reportMatch(self)
+                    self.consume()
+                self.state = 446
                 self.multiplicativeExpression()
-                pass
-
+                self.state = 451
+                self._errHandler.sync(self)
+                _la = self._input.LA(1)
 
         except RecognitionException as re:
             localctx.exception = re
@@ -3214,25 +3001,7 @@ class PseudocodeParser ( Parser ):
         def __init__(self, parser, parent:ParserRuleContext=None, invokingState:int=-1):
             super().__init__(parent, invokingState)
             self.parser = parser
-
-
-        def getRuleIndex(self):
-            return PseudocodeParser.RULE_multiplicativeExpression
-
-     
-        def copyFrom(self, ctx:ParserRuleContext):
-            super().copyFrom(ctx)
-
-
-
-    class MulExprContext(MultiplicativeExpressionContext):
-
-        def __init__(self, parser, ctx:ParserRuleContext): # actually a PseudocodeParser.MultiplicativeExpressionContext
-            super().__init__(parser)
-            self.left = None # PowerExpressionContext
             self.op = None # Token
-            self.right = None # PowerExpressionContext
-            self.copyFrom(ctx)
 
         def powerExpression(self, i:int=None):
             if i is None:
@@ -3240,101 +3009,65 @@ class PseudocodeParser ( Parser ):
             else:
                 return self.getTypedRuleContext(PseudocodeParser.PowerExpressionContext,i)
 
+
         def STAR(self, i:int=None):
             if i is None:
                 return self.getTokens(PseudocodeParser.STAR)
             else:
                 return self.getToken(PseudocodeParser.STAR, i)
+
         def SLASH(self, i:int=None):
             if i is None:
                 return self.getTokens(PseudocodeParser.SLASH)
             else:
                 return self.getToken(PseudocodeParser.SLASH, i)
 
-        def enterRule(self, listener:ParseTreeListener):
-            if hasattr( listener, "enterMulExpr" ):
-                listener.enterMulExpr(self)
-
-        def exitRule(self, listener:ParseTreeListener):
-            if hasattr( listener, "exitMulExpr" ):
-                listener.exitMulExpr(self)
-
-        def accept(self, visitor:ParseTreeVisitor):
-            if hasattr( visitor, "visitMulExpr" ):
-                return visitor.visitMulExpr(self)
-            else:
-                return visitor.visitChildren(self)
-
-
-    class MultiplicativePassContext(MultiplicativeExpressionContext):
-
-        def __init__(self, parser, ctx:ParserRuleContext): # actually a PseudocodeParser.MultiplicativeExpressionContext
-            super().__init__(parser)
-            self.copyFrom(ctx)
-
-        def powerExpression(self):
-            return self.getTypedRuleContext(PseudocodeParser.PowerExpressionContext,0)
-
+        def getRuleIndex(self):
+            return PseudocodeParser.RULE_multiplicativeExpression
 
         def enterRule(self, listener:ParseTreeListener):
-            if hasattr( listener, "enterMultiplicativePass" ):
-                listener.enterMultiplicativePass(self)
+            if hasattr( listener, "enterMultiplicativeExpression" ):
+                listener.enterMultiplicativeExpression(self)
 
         def exitRule(self, listener:ParseTreeListener):
-            if hasattr( listener, "exitMultiplicativePass" ):
-                listener.exitMultiplicativePass(self)
+            if hasattr( listener, "exitMultiplicativeExpression" ):
+                listener.exitMultiplicativeExpression(self)
 
         def accept(self, visitor:ParseTreeVisitor):
-            if hasattr( visitor, "visitMultiplicativePass" ):
-                return visitor.visitMultiplicativePass(self)
+            if hasattr( visitor, "visitMultiplicativeExpression" ):
+                return visitor.visitMultiplicativeExpression(self)
             else:
                 return visitor.visitChildren(self)
 
 
 
+
     def multiplicativeExpression(self):
 
         localctx = PseudocodeParser.MultiplicativeExpressionContext(self, self._ctx, self.state)
         self.enterRule(localctx, 52, self.RULE_multiplicativeExpression)
         self._la = 0 # Token type
         try:
-            self.state = 468
+            self.enterOuterAlt(localctx, 1)
+            self.state = 452
+            self.powerExpression()
+            self.state = 457
             self._errHandler.sync(self)
-            la_ = self._interp.adaptivePredict(self._input,62,self._ctx)
-            if la_ == 1:
-                localctx = PseudocodeParser.MulExprContext(self, localctx)
-                self.enterOuterAlt(localctx, 1)
-                self.state = 460
-                localctx.left = self.powerExpression()
-                self.state = 463 
-                self._errHandler.sync(self)
+            _la = self._input.LA(1)
+            while _la==30 or _la==36:
+                self.state = 453
+                localctx.op = self._input.LT(1)
                 _la = self._input.LA(1)
-                while True:
-                    self.state = 461
-                    localctx.op = self._input.LT(1)
-                    _la = self._input.LA(1)
-                    if not(_la==30 or _la==36):
-                        localctx.op = self._errHandler.recoverInline(self)
-                    else:
-                        self._errHandler.reportMatch(self)
-                        self.consume()
-                    self.state = 462
-                    localctx.right = self.powerExpression()
-                    self.state = 465 
-                    self._errHandler.sync(self)
-                    _la = self._input.LA(1)
-                    if not (_la==30 or _la==36):
-                        break
-
-                pass
-
-            elif la_ == 2:
-                localctx = PseudocodeParser.MultiplicativePassContext(self, localctx)
-                self.enterOuterAlt(localctx, 2)
-                self.state = 467
+                if not(_la==30 or _la==36):
+                    localctx.op = self._errHandler.recoverInline(self)
+                else:
+                    self._errHandler.reportMatch(self)
+                    self.consume()
+                self.state = 454
                 self.powerExpression()
-                pass
-
+                self.state = 459
+                self._errHandler.sync(self)
+                _la = self._input.LA(1)
 
         except RecognitionException as re:
             localctx.exception = re
@@ -3352,114 +3085,59 @@ class PseudocodeParser ( Parser ):
             super().__init__(parent, invokingState)
             self.parser = parser
 
-
-        def getRuleIndex(self):
-            return PseudocodeParser.RULE_powerExpression
-
-     
-        def copyFrom(self, ctx:ParserRuleContext):
-            super().copyFrom(ctx)
-
-
-
-    class PowerPassContext(PowerExpressionContext):
-
-        def __init__(self, parser, ctx:ParserRuleContext): # actually a PseudocodeParser.PowerExpressionContext
-            super().__init__(parser)
-            self.copyFrom(ctx)
-
-        def unaryExpression(self):
-            return self.getTypedRuleContext(PseudocodeParser.UnaryExpressionContext,0)
-
-
-        def enterRule(self, listener:ParseTreeListener):
-            if hasattr( listener, "enterPowerPass" ):
-                listener.enterPowerPass(self)
-
-        def exitRule(self, listener:ParseTreeListener):
-            if hasattr( listener, "exitPowerPass" ):
-                listener.exitPowerPass(self)
-
-        def accept(self, visitor:ParseTreeVisitor):
-            if hasattr( visitor, "visitPowerPass" ):
-                return visitor.visitPowerPass(self)
-            else:
-                return visitor.visitChildren(self)
-
-
-    class PowExprContext(PowerExpressionContext):
-
-        def __init__(self, parser, ctx:ParserRuleContext): # actually a PseudocodeParser.PowerExpressionContext
-            super().__init__(parser)
-            self.left = None # UnaryExpressionContext
-            self.right = None # UnaryExpressionContext
-            self.copyFrom(ctx)
-
         def unaryExpression(self, i:int=None):
             if i is None:
                 return self.getTypedRuleContexts(PseudocodeParser.UnaryExpressionContext)
             else:
                 return self.getTypedRuleContext(PseudocodeParser.UnaryExpressionContext,i)
 
+
         def POW(self, i:int=None):
             if i is None:
                 return self.getTokens(PseudocodeParser.POW)
             else:
                 return self.getToken(PseudocodeParser.POW, i)
 
+        def getRuleIndex(self):
+            return PseudocodeParser.RULE_powerExpression
+
         def enterRule(self, listener:ParseTreeListener):
-            if hasattr( listener, "enterPowExpr" ):
-                listener.enterPowExpr(self)
+            if hasattr( listener, "enterPowerExpression" ):
+                listener.enterPowerExpression(self)
 
         def exitRule(self, listener:ParseTreeListener):
-            if hasattr( listener, "exitPowExpr" ):
-                listener.exitPowExpr(self)
+            if hasattr( listener, "exitPowerExpression" ):
+                listener.exitPowerExpression(self)
 
         def accept(self, visitor:ParseTreeVisitor):
-            if hasattr( visitor, "visitPowExpr" ):
-                return visitor.visitPowExpr(self)
+            if hasattr( visitor, "visitPowerExpression" ):
+                return visitor.visitPowerExpression(self)
             else:
                 return visitor.visitChildren(self)
 
 
 
+
     def powerExpression(self):
 
         localctx = PseudocodeParser.PowerExpressionContext(self, self._ctx, self.state)
         self.enterRule(localctx, 54, self.RULE_powerExpression)
         self._la = 0 # Token type
         try:
-            self.state = 478
+            self.enterOuterAlt(localctx, 1)
+            self.state = 460
+            self.unaryExpression()
+            self.state = 465
             self._errHandler.sync(self)
-            la_ = self._interp.adaptivePredict(self._input,64,self._ctx)
-            if la_ == 1:
-                localctx = PseudocodeParser.PowExprContext(self, localctx)
-                self.enterOuterAlt(localctx, 1)
-                self.state = 470
-                localctx.left = self.unaryExpression()
-                self.state = 473 
+            _la = self._input.LA(1)
+            while _la==28:
+                self.state = 461
+                self.match(PseudocodeParser.POW)
+                self.state = 462
+                self.unaryExpression()
+                self.state = 467
                 self._errHandler.sync(self)
                 _la = self._input.LA(1)
-                while True:
-                    self.state = 471
-                    self.match(PseudocodeParser.POW)
-                    self.state = 472
-                    localctx.right = self.unaryExpression()
-                    self.state = 475 
-                    self._errHandler.sync(self)
-                    _la = self._input.LA(1)
-                    if not (_la==28):
-                        break
-
-                pass
-
-            elif la_ == 2:
-                localctx = PseudocodeParser.PowerPassContext(self, localctx)
-                self.enterOuterAlt(localctx, 2)
-                self.state = 477
-                self.unaryExpression()
-                pass
-
 
         except RecognitionException as re:
             localctx.exception = re
@@ -3545,21 +3223,21 @@ class PseudocodeParser ( Parser ):
         localctx = PseudocodeParser.UnaryExpressionContext(self, self._ctx, self.state)
         self.enterRule(localctx, 56, self.RULE_unaryExpression)
         try:
-            self.state = 483
+            self.state = 471
             self._errHandler.sync(self)
             token = self._input.LA(1)
             if token in [34]:
                 localctx = PseudocodeParser.UnaryMinusExprContext(self, localctx)
                 self.enterOuterAlt(localctx, 1)
-                self.state = 480
+                self.state = 468
                 self.match(PseudocodeParser.MINUS)
-                self.state = 481
+                self.state = 469
                 self.unaryExpression()
                 pass
             elif token in [12, 13, 16, 17, 18, 19, 20, 39]:
                 localctx = PseudocodeParser.UnaryPassContext(self, localctx)
                 self.enterOuterAlt(localctx, 2)
-                self.state = 482
+                self.state = 470
                 self.primaryExpression()
                 pass
             else:
@@ -3714,56 +3392,56 @@ class PseudocodeParser ( Parser ):
         self.enterRule(localctx, 58, self.RULE_primaryExpression)
         self._la = 0 # Token type
         try:
-            self.state = 501
+            self.state = 489
             self._errHandler.sync(self)
-            la_ = self._interp.adaptivePredict(self._input,67,self._ctx)
+            la_ = self._interp.adaptivePredict(self._input,62,self._ctx)
             if la_ == 1:
                 localctx = PseudocodeParser.ParenExpressionContext(self, localctx)
                 self.enterOuterAlt(localctx, 1)
-                self.state = 485
+                self.state = 473
                 self.match(PseudocodeParser.LPAREN)
-                self.state = 486
+                self.state = 474
                 self.expression()
-                self.state = 487
+                self.state = 475
                 self.match(PseudocodeParser.RPAREN)
                 pass
 
             elif la_ == 2:
                 localctx = PseudocodeParser.FunctionCallExpressionContext(self, localctx)
                 self.enterOuterAlt(localctx, 2)
-                self.state = 489
+                self.state = 477
                 self.match(PseudocodeParser.ID)
-                self.state = 490
+                self.state = 478
                 self.match(PseudocodeParser.LPAREN)
-                self.state = 492
+                self.state = 480
                 self._errHandler.sync(self)
                 _la = self._input.LA(1)
                 if (((_la) & ~0x3f) == 0 and ((1 << _la) & 566937726976) != 0):
-                    self.state = 491
+                    self.state = 479
                     self.expressionList()
 
 
-                self.state = 494
+                self.state = 482
                 self.match(PseudocodeParser.RPAREN)
                 pass
 
             elif la_ == 3:
                 localctx = PseudocodeParser.ArrayAccessExpressionContext(self, localctx)
                 self.enterOuterAlt(localctx, 3)
-                self.state = 495
+                self.state = 483
                 self.match(PseudocodeParser.ID)
-                self.state = 496
+                self.state = 484
                 self.match(PseudocodeParser.LBRACK)
-                self.state = 497
+                self.state = 485
                 self.expression()
-                self.state = 498
+                self.state = 486
                 self.match(PseudocodeParser.RBRACK)
                 pass
 
             elif la_ == 4:
                 localctx = PseudocodeParser.AtomExpressionContext(self, localctx)
                 self.enterOuterAlt(localctx, 4)
-                self.state = 500
+                self.state = 488
                 self.atom()
                 pass
 
@@ -3824,17 +3502,17 @@ class PseudocodeParser ( Parser ):
         self._la = 0 # Token type
         try:
             self.enterOuterAlt(localctx, 1)
-            self.state = 503
+            self.state = 491
             self.expression()
-            self.state = 508
+            self.state = 496
             self._errHandler.sync(self)
             _la = self._input.LA(1)
             while _la==42:
-                self.state = 504
+                self.state = 492
                 self.match(PseudocodeParser.COMMA)
-                self.state = 505
+                self.state = 493
                 self.expression()
-                self.state = 510
+                self.state = 498
                 self._errHandler.sync(self)
                 _la = self._input.LA(1)
 
@@ -3902,7 +3580,7 @@ class PseudocodeParser ( Parser ):
         self._la = 0 # Token type
         try:
             self.enterOuterAlt(localctx, 1)
-            self.state = 511
+            self.state = 499
             _la = self._input.LA(1)
             if not((((_la) & ~0x3f) == 0 and ((1 << _la) & 2043904) != 0)):
                 self._errHandler.recoverInline(self)
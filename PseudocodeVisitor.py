@@ -134,63 +134,33 @@ class PseudocodeVisitor(ParseTreeVisitor):
         return self.visitChildren(ctx)
 
 
-    # Visit a parse tree produced by PseudocodeParser#OrExpr.
-    def visitOrExpr(self, ctx:PseudocodeParser.OrExprContext):
+    # Visit a parse tree produced by PseudocodeParser#logicalOrExpression.
+    def visitLogicalOrExpression(self, ctx:PseudocodeParser.LogicalOrExpressionContext):
         return self.visitChildren(ctx)
 
 
-    # Visit a parse tree produced by PseudocodeParser#OrPass.
-    def visitOrPass(self, ctx:PseudocodeParser.OrPassContext):
+    # Visit a parse tree produced by PseudocodeParser#logicalAndExpression.
+    def visitLogicalAndExpression(self, ctx:PseudocodeParser.LogicalAndExpressionContext):
         return self.visitChildren(ctx)
 
 
-    # Visit a parse tree produced by PseudocodeParser#AndExpr.
-    def visitAndExpr(self, ctx:PseudocodeParser.AndExprContext):
+    # Visit a parse tree produced by PseudocodeParser#comparisonExpression.
+    def visitComparisonExpression(self, ctx:PseudocodeParser.ComparisonExpressionContext):
         return self.visitChildren(ctx)
 
 
-    # Visit a parse tree produced by PseudocodeParser#AndPass.
-    def visitAndPass(self, ctx:PseudocodeParser.AndPassContext):
+    # Visit a parse tree produced by PseudocodeParser#additiveExpression.
+    def visitAdditiveExpression(self, ctx:PseudocodeParser.AdditiveExpressionContext):
         return self.visitChildren(ctx)
 
 
-    # Visit a parse tree produced by PseudocodeParser#CompareExpr.
-    def visitCompareExpr(self, ctx:PseudocodeParser.CompareExprContext):
+    # Visit a parse tree produced by PseudocodeParser#multiplicativeExpression.
+    def visitMultiplicativeExpression(self, ctx:PseudocodeParser.MultiplicativeExpressionContext):
         return self.visitChildren(ctx)
 
 
-    # Visit a parse tree produced by PseudocodeParser#ComparisonPass.
-    def visitComparisonPass(self, ctx:PseudocodeParser.ComparisonPassContext):
-        return self.visitChildren(ctx)
-
-
-    # Visit a parse tree produced by PseudocodeParser#AddExpr.
-    def visitAddExpr(self, ctx:PseudocodeParser.AddExprContext):
-        return self.visitChildren(ctx)
-
-
-    # Visit a parse tree produced by PseudocodeParser#AdditivePass.
-    def visitAdditivePass(self, ctx:PseudocodeParser.AdditivePassContext):
-        return self.visitChildren(ctx)
-
-
-    # Visit a parse tree produced by PseudocodeParser#MulExpr.
-    def visitMulExpr(self, ctx:PseudocodeParser.MulExprContext):
-        return self.visitChildren(ctx)
-
-
-    # Visit a parse tree produced by PseudocodeParser#MultiplicativePass.
-    def visitMultiplicativePass(self, ctx:PseudocodeParser.MultiplicativePassContext):
-        return self.visitChildren(ctx)
-
-
-    # Visit a parse tree produced by PseudocodeParser#PowExpr.
-    def visitPowExpr(self, ctx:PseudocodeParser.PowExprContext):
-        return self.visitChildren(ctx)
-
-
-    # Visit a parse tree produced by PseudocodeParser#PowerPass.
-    def visitPowerPass(self, ctx:PseudocodeParser.PowerPassContext):
+    # Visit a parse tree produced by PseudocodeParser#powerExpression.
+    def visitPowerExpression(self, ctx:PseudocodeParser.PowerExpressionContext):
         return self.visitChildren(ctx)
 
 
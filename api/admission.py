@@ -0,0 +1,107 @@
+import asyncio
+import math
+import os
+import time
+from contextlib import asynccontextmanager
+
+
+class QueueFull(Exception):
+    """The wait queue is at capacity; the request should be rejected right away."""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"generation queue is full (retry after {retry_after}s)")
+        self.retry_after = retry_after
+
+
+class QueueTimeout(Exception):
+    """The request waited longer than the queue deadline without getting a slot."""
+
+
+class AdmissionController:
+    """Bounded concurrency with a bounded FIFO wait queue.
+
+    At most ``max_concurrent`` requests hold a slot; up to ``max_queue`` more
+    wait for one, each for at most ``queue_timeout_s``. Anything beyond that is
+    rejected immediately, so overload shows up as fast 503s instead of every
+    request timing out. Created in the app lifespan because the semaphore is
+    bound to the running event loop.
+    """
+
+    def __init__(
+        self, max_concurrent: int, max_queue: int, queue_timeout_s: float, ewma_alpha: float = 0.2
+    ):
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout_s = queue_timeout_s
+        self._sem = asyncio.Semaphore(max_concurrent)
+        self._alpha = ewma_alpha
+        self.active = 0
+        self.queued = 0
+        self.admitted_total = 0
+        self.rejected_total = 0
+        self.timed_out_total = 0
+        self.service_time_s = 0.0  # EWMA of how long an admitted request holds its slot
+
+    @classmethod
+    def from_env(cls, prefix: str = "GENERATION") -> "AdmissionController":
+        return cls(
+            max_concurrent=int(os.environ.get(f"{prefix}_MAX_IN_FLIGHT", "8")),
+            max_queue=int(os.environ.get(f"{prefix}_MAX_QUEUE", "16")),
+            queue_timeout_s=float(os.environ.get(f"{prefix}_QUEUE_TIMEOUT_S", "10")),
+        )
+
+    def retry_after(self) -> int:
+        """Seconds until the current queue has likely drained (at least 1)."""
+        slots = max(self.max_concurrent, 1)
+        return max(1, math.ceil(self.service_time_s * (self.queued + 1) / slots))
+
+    @asynccontextmanager
+    async def slot(self, timeout_s: float | None = None):
+        """Hold a slot for the duration of the block.
+
+        Raises QueueFull when the queue is at capacity and QueueTimeout when no
+        slot frees up within queue_timeout_s (or ``timeout_s``, if shorter, e.g.
+        what is left of the request deadline).
+        """
+        if timeout_s is None or timeout_s > self.queue_timeout_s:
+            timeout_s = self.queue_timeout_s
+        if self._sem.locked() and self.queued >= self.max_queue:
+            self.rejected_total += 1
+            raise QueueFull(self.retry_after())
+
+        self.queued += 1
+        try:
+            if self._sem.locked():
+                await asyncio.wait_for(self._sem.acquire(), timeout=timeout_s)
+            else:
+                await self._sem.acquire()  # free slot, no queueing
+        except asyncio.TimeoutError:
+            self.timed_out_total += 1
+            raise QueueTimeout(f"no generation slot within {timeout_s:g}s") from None
+        finally:
+            self.queued -= 1
+
+        self.active += 1
+        self.admitted_total += 1
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            elapsed = time.monotonic() - started
+            if self.service_time_s == 0.0:
+                self.service_time_s = elapsed
+            else:
+                self.service_time_s += self._alpha * (elapsed - self.service_time_s)
+            self.active -= 1
+            self._sem.release()
+
+    def snapshot(self) -> dict:
+        return {
+            "active": self.active,
+            "queued": self.queued,
+            "max_concurrent": self.max_concurrent,
+            "max_queue": self.max_queue,
+            "admitted_total": self.admitted_total,
+            "rejected_total": self.rejected_total,
+            "queue_timeouts_total": self.timed_out_total,
+        }
@@ -0,0 +1,83 @@
+import asyncio
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class StageExecutor:
+    """A dedicated thread pool for one pipeline stage, with queue-depth counters.
+
+    Retrieval (embedding + reranking) is CPU-bound torch work and LLM calls are
+    seconds-long network waits; giving each its own pool keeps slow LLM calls
+    from occupying the threads retrieval needs.
+    """
+
+    def __init__(self, name: str, max_workers: int):
+        self.name = name
+        self.max_workers = max_workers
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"avp-{name}")
+        self._lock = threading.Lock()
+        self.queued = 0
+        self.running = 0
+        self.completed_total = 0
+
+    def _call(self, fn, args):
+        with self._lock:
+            self.queued -= 1
+            self.running += 1
+        try:
+            return fn(*args)
+        finally:
+            with self._lock:
+                self.running -= 1
+                self.completed_total += 1
+
+    async def run(self, fn, *args):
+        """Run ``fn(*args)`` on this pool and await the result."""
+        with self._lock:
+            self.queued += 1
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._pool, self._call, fn, args)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "queued": self.queued,
+                "running": self.running,
+                "completed_total": self.completed_total,
+            }
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+def configure_torch_threads(retrieval_workers: int) -> int:
+    """Split the CPU cores between retrieval workers via torch's intra-op threads.
+
+    TORCH_NUM_THREADS overrides the default of cores // retrieval_workers, so
+    concurrent embed/rerank calls don't oversubscribe the CPU.
+    """
+    default = max(1, (os.cpu_count() or 1) // max(retrieval_workers, 1))
+    threads = int(os.environ.get("TORCH_NUM_THREADS", str(default)))
+    try:
+        import torch
+    except ImportError:
+        return threads
+    torch.set_num_threads(threads)
+    return threads
+
+
+def create_executors() -> dict[str, StageExecutor]:
+    """Build the per-stage pools from RETRIEVAL_WORKERS and GENERATION_WORKERS."""
+    retrieval_workers = int(os.environ.get("RETRIEVAL_WORKERS", "2"))
+    # Enough I/O threads for every admitted generation plus the job workers.
+    default_generation = int(os.environ.get("GENERATION_MAX_IN_FLIGHT", "8")) + int(
+        os.environ.get("JOBS_WORKERS", "4")
+    )
+    generation_workers = int(os.environ.get("GENERATION_WORKERS", str(default_generation)))
+    configure_torch_threads(retrieval_workers)
+    return {
+        "retrieval": StageExecutor("retrieval", retrieval_workers),
+        "generation": StageExecutor("generation", generation_workers),
+    }
@@ -0,0 +1,132 @@
+import asyncio
+import os
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Optional
+
+
+class JobQueueFull(Exception):
+    """Too many jobs are waiting; the client should retry later."""
+
+
+@dataclass
+class Job:
+    id: str
+    query: str
+    status: str = "queued"  # queued | running | done | failed
+    result: Any = None
+    error: Optional[str] = None
+    created_at: float = field(default_factory=time.time)
+    finished_at: Optional[float] = None
+    done: asyncio.Event = field(default_factory=asyncio.Event, repr=False)
+
+    def finish(self, result: Any = None, error: Optional[str] = None) -> None:
+        self.result = result
+        self.error = error
+        self.status = "failed" if error is not None else "done"
+        self.finished_at = time.time()
+        self.done.set()
+
+
+class JobStore:
+    """In-process job store drained by a fixed number of worker tasks.
+
+    Generations run in the background so a client can submit one, disconnect,
+    and poll for the result later (nginx cuts requests after 60 s). The wait
+    queue is bounded, and finished jobs are kept for ``ttl_s`` seconds.
+    Created in the app lifespan because the queue is bound to the running loop.
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[str], Awaitable[Any]],
+        workers: int = 4,
+        max_queue: int = 64,
+        ttl_s: float = 3600,
+    ):
+        self._handler = handler
+        self.workers = workers
+        self.ttl_s = ttl_s
+        self._queue: asyncio.Queue[Job] = asyncio.Queue(maxsize=max_queue)
+        self._jobs: dict[str, Job] = {}
+        self._tasks: list[asyncio.Task] = []
+
+    @classmethod
+    def from_env(cls, handler: Callable[[str], Awaitable[Any]]) -> "JobStore":
+        return cls(
+            handler,
+            workers=int(os.environ.get("JOBS_WORKERS", "4")),
+            max_queue=int(os.environ.get("JOBS_MAX_QUEUE", "64")),
+            ttl_s=float(os.environ.get("JOBS_TTL_S", "3600")),
+        )
+
+    def start(self) -> None:
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def _evict_expired(self) -> None:
+        cutoff = time.time() - self.ttl_s
+        expired = [
+            job_id
+            for job_id, job in self._jobs.items()
+            if job.finished_at is not None and job.finished_at < cutoff
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    def submit(self, query: str) -> Job:
+        """Queue a job; raises JobQueueFull when the queue is at capacity."""
+        self._evict_expired()
+        job = Job(id=uuid.uuid4().hex, query=query)
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            raise JobQueueFull("job queue is full") from None
+        self._jobs[job.id] = job
+        return job
+
+    def add_finished(self, query: str, result: Any) -> Job:
+        """Record a job whose result is already known (e.g. a cache hit)."""
+        self._evict_expired()
+        job = Job(id=uuid.uuid4().hex, query=query)
+        job.finish(result)
+        self._jobs[job.id] = job
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+    async def wait(self, job: Job, timeout_s: float) -> None:
+        """Wait up to timeout_s for the job to finish (returns either way)."""
+        if timeout_s <= 0 or job.done.is_set():
+            return
+        try:
+            await asyncio.wait_for(job.done.wait(), timeout=timeout_s)
+        except asyncio.TimeoutError:
+            pass
+
+    async def _worker(self) -> None:
+        while True:
+            job = await self._queue.get()
+            job.status = "running"
+            try:
+                job.finish(await self._handler(job.query))
+            except Exception as e:
+                job.finish(error=str(e))
+            finally:
+                self._queue.task_done()
+
+    def snapshot(self) -> dict:
+        statuses = [job.status for job in self._jobs.values()]
+        return {
+            "workers": self.workers,
+            "queued": self._queue.qsize(),
+            "running": statuses.count("running"),
+            "stored": len(statuses),
+        }
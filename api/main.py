@@ -18,17 +18,31 @@ os.chdir(PROJECT_ROOT)
 
 load_dotenv(PROJECT_ROOT / ".env")
 
+from .admission import AdmissionController
 from .dependencies import limiter
-from .routes import router
+from .executors import create_executors
+from .jobs import JobStore
+from .routes import router, run_generation_job
 
 
 @asynccontextmanager
 async def lifespan(_app: FastAPI):
+    # Per-stage thread pools: a small CPU pool for embedding/reranking and a
+    # larger I/O pool for LLM calls (also sets torch's intra-op thread count)
+    _app.state.executors = create_executors()
+
     # Eagerly initialize the retriever at startup
-    import asyncio
     from retrieve import get_retriever
-    await asyncio.to_thread(get_retriever)
+    await _app.state.executors["retrieval"].run(get_retriever)
+    # Bounded concurrency and wait queue for /api/generate (needs the running loop)
+    _app.state.generation_admission = AdmissionController.from_env("GENERATION")
+    # Background generations for POST /api/jobs
+    _app.state.jobs = JobStore.from_env(lambda query: run_generation_job(_app, query))
+    _app.state.jobs.start()
     yield
+    await _app.state.jobs.stop()
+    for executor in _app.state.executors.values():
+        executor.shutdown()
 
 
 app = FastAPI(title="AVP RAG API", lifespan=lifespan)
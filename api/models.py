@@ -14,16 +14,64 @@ class RetrievedFunction(BaseModel):
     code: str
 
 
+class PromptUsage(BaseModel):
+    # As reported by the provider that answered
+    prompt_tokens: int = 0
+    # Prefill tokens served from the provider's prefix/prompt cache
+    cached_prompt_tokens: int = 0
+    # As counted before sending, and how the reference block was packed
+    counted_prompt_tokens: int = 0
+    compaction_tokens_saved: int = 0
+    reference_tokens: int = 0
+    snippets_truncated: int = 0
+    snippets_dropped: int = 0
+    # Output-token limit derived from the reference functions (0: provider default)
+    max_output_tokens: int = 0
+
+
 class GenerateResponse(BaseModel):
     generated_code: str | None = None
     retrieved_functions: list[RetrievedFunction] = []
+    # "llm", or "knowledge_base" when the top retrieved function was returned as is
+    source: str = "llm"
+    # Whether generated_code parses as AVP, and how many repair requests it took
+    valid: bool | None = None
+    validation_errors: list[str] = []
+    repairs: int = 0
+    # Retrieval-only answer because the LLM is down or generation is saturated;
+    # retry_after (seconds) is also sent as the Retry-After header
+    degraded: bool = False
+    degraded_reason: str | None = None
+    retry_after: int | None = None
+    # The X-Deadline-Ms budget ran out: retrieved functions only, or stages cut
+    # short (e.g. "rerank_skipped", "max_tokens_shortened", "generation_skipped")
+    partial: bool = False
+    deadline_notes: list[str] = []
+    usage: PromptUsage | None = None
     cached: bool = False
 
 
+class EndpointHealth(BaseModel):
+    url: str
+    in_flight: int = 0
+    latency_s: float = 0.0
+    consecutive_failures: int = 0
+    ejected: bool = False
+
+
+class ProviderHealth(BaseModel):
+    state: str = "closed"
+    failure_rate: float = 0.0
+    window_calls: int = 0
+    retry_after_s: float = 0.0
+    endpoints: list[EndpointHealth] = []
+
+
 class HealthResponse(BaseModel):
     status: str = "ok"
     retriever_loaded: bool = False
     provider_configured: bool = False
+    providers: dict[str, ProviderHealth] = {}
 
 
 class RetrieveRequest(BaseModel):
@@ -34,3 +82,14 @@ class RetrieveRequest(BaseModel):
 class RetrieveResponse(BaseModel):
     results: list[RetrievedFunction] = []
     cached: bool = False
+    # Reranking was shrunk or skipped to meet the X-Deadline-Ms budget
+    partial: bool = False
+    deadline_notes: list[str] = []
+
+
+class JobResponse(BaseModel):
+    job_id: str
+    # queued | running | done | failed
+    status: str
+    result: GenerateResponse | None = None
+    error: str | None = None
@@ -1,15 +1,23 @@
-import asyncio
+import os
 
-from fastapi import APIRouter, HTTPException, Request
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from fastapi.responses import PlainTextResponse
 
-from providers import get_provider_name, is_provider_configured
+from deadline import HEADER as DEADLINE_HEADER
+from deadline import Deadline
+from providers import get_provider_name, is_provider_configured, provider_health
 
+from .admission import QueueFull, QueueTimeout
 from .cache import generation_cache, retrieval_cache
 from .dependencies import limiter
+from .jobs import JobQueueFull
 from .models import (
     GenerateRequest,
     GenerateResponse,
     HealthResponse,
+    JobResponse,
+    PromptUsage,
+    ProviderHealth,
     RetrievedFunction,
     RetrieveRequest,
     RetrieveResponse,
@@ -18,6 +26,16 @@ from .models import (
 router = APIRouter(prefix="/api")
 
 
+def _request_deadline(request: Request) -> Deadline | None:
+    try:
+        return Deadline.from_header(request.headers.get(DEADLINE_HEADER))
+    except ValueError:
+        raise HTTPException(
+            status_code=400,
+            detail=f"{DEADLINE_HEADER} must be a positive number of milliseconds",
+        )
+
+
 @router.get("/health", response_model=HealthResponse)
 async def health():
     from retrieve import _retriever
@@ -26,9 +44,29 @@ async def health():
         status="ok",
         retriever_loaded=_retriever is not None,
         provider_configured=is_provider_configured(),
+        providers={
+            name: ProviderHealth(**snapshot)
+            for name, snapshot in provider_health().items()
+        },
     )
 
 
+@router.get("/metrics", response_class=PlainTextResponse)
+async def metrics(request: Request):
+    """Prometheus text exposition of admission control and per-stage pool gauges."""
+    samples = {
+        f"avp_generation_{key}": value
+        for key, value in request.app.state.generation_admission.snapshot().items()
+    }
+    samples["avp_generation_queue_depth"] = samples.pop("avp_generation_queued")
+    for key, value in request.app.state.jobs.snapshot().items():
+        samples[f"avp_jobs_{key}"] = value
+    for pool, executor in request.app.state.executors.items():
+        for key, value in executor.snapshot().items():
+            samples[f'avp_executor_{key}{{pool="{pool}"}}'] = value
+    return "".join(f"{name} {value}\n" for name, value in samples.items())
+
+
 @router.post("/retrieve", response_model=RetrieveResponse)
 @limiter.limit("30/minute")
 async def retrieve(body: RetrieveRequest, request: Request):
@@ -39,15 +77,23 @@ async def retrieve(body: RetrieveRequest, request: Request):
 
     from retrieve import retrieve_code
 
-    raw = await asyncio.to_thread(retrieve_code, body.query, body.k)
+    deadline = _request_deadline(request)
+    raw = await request.app.state.executors["retrieval"].run(
+        retrieve_code, body.query, body.k, deadline
+    )
     results = [RetrievedFunction(**r) for r in raw]
+    if deadline is not None and deadline.notes:
+        # Reranking was cut short; don't serve this ranking to later requests.
+        return RetrieveResponse(
+            results=results, cached=False, partial=True, deadline_notes=deadline.notes
+        )
     retrieval_cache.set(cache_key, results)
     return RetrieveResponse(results=results, cached=False)
 
 
 @router.post("/generate", response_model=GenerateResponse)
 @limiter.limit("10/minute")
-async def generate(body: GenerateRequest, request: Request):
+async def generate(body: GenerateRequest, request: Request, response: Response):
     if not is_provider_configured():
         raise HTTPException(
             status_code=503, detail=f"{get_provider_name()} provider is not configured"
@@ -57,15 +103,134 @@ async def generate(body: GenerateRequest, request: Request):
     if cached is not None:
         return GenerateResponse(**cached, cached=True)
 
-    from generate import generate_code
-
-    result = await asyncio.to_thread(generate_code, body.query)
+    from generate import (
+        answer_without_llm,
+        degraded_mode_enabled,
+        degraded_result,
+        generate_from_context,
+    )
+    from retrieve import retrieve_code
 
+    deadline = _request_deadline(request)
+    executors = request.app.state.executors
+    admission = request.app.state.generation_admission
+    # Retrieval is CPU-bound torch work, the LLM call is network I/O;
+    # separate pools keep slow generations from starving retrieval.
+    # Under a deadline, retrieval gets a share and the LLM the rest.
+    retrieval_deadline = deadline.share(_retrieval_share()) if deadline is not None else None
+    snippets = await executors["retrieval"].run(retrieve_code, body.query, 2, retrieval_deadline)
+    # Knowledge-base answers never reach the LLM, so they don't wait for a
+    # generation slot; admission only bounds concurrent LLM calls.
+    result = await executors["retrieval"].run(answer_without_llm, body.query, snippets)
+    if result is None:
+        try:
+            async with admission.slot(deadline.remaining() if deadline is not None else None):
+                result = await executors["generation"].run(
+                    generate_from_context, body.query, snippets, deadline
+                )
+        except QueueFull as e:
+            raise HTTPException(
+                status_code=503, detail=str(e), headers={"Retry-After": str(e.retry_after)}
+            )
+        except QueueTimeout as e:
+            if not degraded_mode_enabled():
+                raise HTTPException(
+                    status_code=503,
+                    detail=f"generation queue is saturated: {e}",
+                    headers={"Retry-After": str(admission.retry_after())},
+                )
+            result = degraded_result(snippets, f"generation queue is saturated: {e}")
+            result["retry_after"] = admission.retry_after()
+
+    generated = _generate_response(body.query, result)
+    if generated.degraded:
+        response.headers["Retry-After"] = str(generated.retry_after)
+    return generated
+
+
+def _retrieval_share() -> float:
+    return float(os.environ.get("DEADLINE_RETRIEVAL_SHARE", "0.2"))
+
+
+def _generate_response(query: str, result: dict) -> GenerateResponse:
+    """Turn a generate_code result into the API response, caching it unless degraded or partial."""
     response_data = {
         "generated_code": result["generated_code"],
         "retrieved_functions": [
             RetrievedFunction(**r) for r in result["retrieved_functions"]
         ],
+        "source": result["source"],
+        "valid": result["valid"],
+        "validation_errors": result["validation_errors"],
+        "repairs": result["repairs"],
+        "usage": PromptUsage(**result["usage"]) if result.get("usage") else None,
+        "deadline_notes": result.get("deadline_notes", []),
     }
-    generation_cache.set(body.query, response_data)
+    if result["degraded"]:
+        # Not cached: the next request should try the LLM again.
+        return GenerateResponse(
+            **response_data,
+            degraded=True,
+            degraded_reason=result["degraded_reason"],
+            retry_after=result["retry_after"],
+            cached=False,
+        )
+    if result["partial"] or response_data["deadline_notes"]:
+        # Cut short by the client's deadline; a later request may have more time.
+        return GenerateResponse(**response_data, partial=result["partial"], cached=False)
+    generation_cache.set(query, response_data)
     return GenerateResponse(**response_data, cached=False)
+
+
+async def run_generation_job(app, query: str) -> GenerateResponse:
+    """JobStore handler: the /generate pipeline without admission control.
+
+    The job queue and worker count already bound how many of these run.
+    """
+    from generate import generate_from_context
+    from retrieve import retrieve_code
+
+    executors = app.state.executors
+    snippets = await executors["retrieval"].run(retrieve_code, query, 2)
+    result = await executors["generation"].run(generate_from_context, query, snippets)
+    return _generate_response(query, result)
+
+
+def _job_response(job) -> JobResponse:
+    return JobResponse(job_id=job.id, status=job.status, result=job.result, error=job.error)
+
+
+@router.post("/jobs", response_model=JobResponse, status_code=202)
+@limiter.limit("10/minute")
+async def submit_job(body: GenerateRequest, request: Request):
+    if not is_provider_configured():
+        raise HTTPException(
+            status_code=503, detail=f"{get_provider_name()} provider is not configured"
+        )
+
+    jobs = request.app.state.jobs
+    cached = generation_cache.get(body.query)
+    if cached is not None:
+        return _job_response(jobs.add_finished(body.query, GenerateResponse(**cached, cached=True)))
+
+    try:
+        job = jobs.submit(body.query)
+    except JobQueueFull as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "30"})
+    return _job_response(job)
+
+
+@router.get("/jobs/{job_id}", response_model=JobResponse)
+@limiter.limit("120/minute")
+async def get_job(
+    job_id: str,
+    request: Request,
+    wait: float = Query(0, ge=0, description="Seconds to wait for the job to finish"),
+):
+    jobs = request.app.state.jobs
+    job = jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown or expired job id")
+    # Stay well under the 60 s nginx proxy timeout; clients poll again.
+    await jobs.wait(job, min(wait, float(os.environ.get("JOBS_MAX_WAIT_S", "25"))))
+    return _job_response(job)
@@ -0,0 +1,91 @@
+"""
+On-disk cache of parsed AVP files, keyed by content.
+
+An entry holds a file's function chunks (without source_file) and its
+avp_ast Program, serialized as JSON under
+
+    <AST_CACHE_DIR>/<grammar version>/<sha256[:2]>/<sha256>.json
+
+where sha256 is tracking.compute_file_hash of the file's bytes and the grammar
+version is a hash of the generated lexer's and parser's serialized ATNs. As
+the key is the content, not the path, a file reverted to an earlier version,
+renamed or copied, or checked out again on another branch is served without
+parsing; regenerating the parser starts a fresh version directory (old ones
+can simply be deleted).
+
+Only files that parse without syntax errors are cached, so errors are still
+reported on every run.
+"""
+
+import hashlib
+import json
+import os
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+from avp_ast import Program, from_data, to_data
+from kb_store import atomic_write
+from PseudocodeLexer import serializedATN as lexer_atn
+from PseudocodeParser import serializedATN as parser_atn
+
+DEFAULT_CACHE_DIR = ".avp_cache"
+
+# Bump when avp_ast nodes or the chunk fields change shape.
+CACHE_FORMAT = 1
+
+
+def ast_cache_enabled() -> bool:
+    return os.environ.get("AST_CACHE", "true").lower() == "true"
+
+
+def default_cache_dir() -> str:
+    return os.environ.get("AST_CACHE_DIR", DEFAULT_CACHE_DIR)
+
+
+@lru_cache(maxsize=1)
+def grammar_version() -> str:
+    sha256 = hashlib.sha256(f"format {CACHE_FORMAT}\n".encode())
+    sha256.update(repr(lexer_atn()).encode())
+    sha256.update(repr(parser_atn()).encode())
+    return sha256.hexdigest()
+
+
+class AstCache:
+    """Parse results for one grammar version, one JSON file per content hash."""
+
+    def __init__(self, root: Optional[str] = None, version: Optional[str] = None):
+        self.root = os.path.join(root or default_cache_dir(), (version or grammar_version())[:16])
+
+    def _path(self, file_hash: str) -> str:
+        return os.path.join(self.root, file_hash[:2], f"{file_hash}.json")
+
+    def _read(self, file_hash: str) -> Optional[Dict]:
+        try:
+            with open(self._path(file_hash), encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError):
+            return None  # unreadable or truncated entry: a miss, rewritten on the next put
+
+    def get_chunks(self, file_hash: str, source_file: Optional[str] = None) -> Optional[List[Dict]]:
+        """The cached function chunks, tagged with source_file, or None on a miss."""
+        entry = self._read(file_hash)
+        if entry is None:
+            return None
+        if not source_file:
+            return entry["chunks"]
+        return [dict(chunk, source_file=source_file) for chunk in entry["chunks"]]
+
+    def get_program(self, file_hash: str) -> Optional[Program]:
+        entry = self._read(file_hash)
+        return from_data(entry["program"]) if entry is not None else None
+
+    def put(self, file_hash: str, chunks: List[Dict], program: Program) -> None:
+        path = self._path(file_hash)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        entry = {
+            "chunks": [{k: v for k, v in chunk.items() if k != "source_file"} for chunk in chunks],
+            "program": to_data(program),
+        }
+        atomic_write(path, lambda f: json.dump(entry, f, separators=(",", ":")))
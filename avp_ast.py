@@ -0,0 +1,381 @@
+"""
+Compact AST for AVP programs.
+
+ANTLR parse trees keep every token and every pass-through precedence level as
+a full context object, which makes them large and awkward to analyse. The
+nodes here keep only what the code says, with a source span on each, and
+can be serialized to plain JSON data:
+
+    start, stop   character offsets of the node's first and last token
+                  (stop inclusive, as in ANTLR)
+    line, column  position of the first token (line 1-based, column 0-based)
+
+A node's span covers the tokens it was parsed from; a parenthesized
+expression's node covers just the contents of the parentheses, and a
+statement's node covers its annotation and trailing semicolon.
+
+Both front ends produce the same tree: ``AstBuilder`` converts an ANTLR
+parse tree in one pass, and fastparse.py builds nodes as it parses. Trees are
+only built for input without syntax errors.
+"""
+
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from antlr4.tree.Tree import TerminalNode
+
+from PseudocodeParser import PseudocodeParser
+
+
+class Node:
+    __slots__ = ("start", "stop", "line", "column")
+    _fields: Tuple[str, ...] = ()
+
+    def __init__(self, start: int, stop: int, line: int, column: int, *values):
+        self.start = start
+        self.stop = stop
+        self.line = line
+        self.column = column
+        for name, value in zip(self._fields, values):
+            setattr(self, name, value)
+
+    def __eq__(self, other):
+        return type(self) is type(other) and all(
+            getattr(self, name) == getattr(other, name) for name in Node.__slots__ + self._fields
+        )
+
+    def __repr__(self):
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self._fields)
+        return f"{type(self).__name__}({fields}) @{self.line}:{self.column}"
+
+
+class Program(Node):
+    __slots__ = _fields = ("statements",)
+
+
+class Annotation(Node):
+    """``@name<arg, ...>``; args are the token texts (strings keep their quotes)."""
+
+    __slots__ = _fields = ("name", "args")
+
+
+class Param(Node):
+    __slots__ = _fields = ("name", "annotation")
+
+
+class Function(Node):
+    __slots__ = _fields = ("name", "params", "body")
+
+
+# Statements. ``annotation`` is the statement's prefix annotation, or for
+# loops the one between ``for`` and the loop header.
+
+
+class Assign(Node):
+    """``target op value`` for ``=`` and the compound operators; also a for-loop update."""
+
+    __slots__ = _fields = ("target", "op", "value", "annotation")
+
+
+class CallStatement(Node):
+    __slots__ = _fields = ("call", "annotation")
+
+
+class If(Node):
+    """``tests[i]`` guards ``bodies[i]`` (if, then each else if); ``orelse`` is None without else."""
+
+    __slots__ = _fields = ("tests", "bodies", "orelse", "annotation")
+
+
+class While(Node):
+    __slots__ = _fields = ("condition", "body", "annotation")
+
+
+class ForEach(Node):
+    __slots__ = _fields = ("variable", "iterable", "body", "annotation")
+
+
+class For(Node):
+    __slots__ = _fields = ("variable", "init", "condition", "update", "body", "annotation")
+
+
+class Return(Node):
+    __slots__ = _fields = ("value", "annotation")
+
+
+class Break(Node):
+    __slots__ = _fields = ("annotation",)
+
+
+# Expressions
+
+
+class ArrayInit(Node):
+    """``arr[a to b]`` (kind "range"), ``arr(size[, fill])`` ("size") or ``arr[x, ...]`` ("values")."""
+
+    __slots__ = _fields = ("kind", "items")
+
+
+class BinaryOp(Node):
+    __slots__ = _fields = ("op", "left", "right")
+
+
+class UnaryMinus(Node):
+    __slots__ = _fields = ("operand",)
+
+
+class Call(Node):
+    __slots__ = _fields = ("name", "args")
+
+
+class Index(Node):
+    __slots__ = _fields = ("name", "index")
+
+
+class Name(Node):
+    __slots__ = _fields = ("id",)
+
+
+class Literal(Node):
+    """kind is the token type: INT, FLOAT, STRING, TRUE, FALSE or NULL."""
+
+    __slots__ = _fields = ("kind", "text")
+
+
+NODE_TYPES = {
+    cls.__name__: cls
+    for cls in (
+        Program, Annotation, Param, Function, Assign, CallStatement, If, While, ForEach, For,
+        Return, Break, ArrayInit, BinaryOp, UnaryMinus, Call, Index, Name, Literal,
+    )
+}
+
+
+def walk(node) -> Iterator[Node]:
+    """Yield node and every node below it, in source (pre-)order."""
+    stack = [node]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, Node):
+            yield item
+            stack.extend(reversed([getattr(item, name) for name in item._fields]))
+        elif isinstance(item, list):
+            stack.extend(reversed(item))
+
+
+def functions(node) -> List[Function]:
+    return [n for n in walk(node) if isinstance(n, Function)]
+
+
+def function_chunks(program: Program, text: str, source_file: Optional[str] = None) -> List[Dict]:
+    """The knowledge-base chunks for the functions in a program, nested ones included."""
+    chunks = []
+    for fn in functions(program):
+        chunk = {
+            "type": "function",
+            "name": fn.name,
+            "parameters": [p.name for p in fn.params],
+            "code_content": text[fn.start : fn.stop + 1],
+        }
+        if source_file:
+            chunk["source_file"] = source_file
+        chunks.append(chunk)
+    return chunks
+
+
+def annotation_spans(node, base: int = 0) -> Tuple[Tuple[int, int], ...]:
+    """(start, stop) offsets of the annotations under node, relative to ``base``."""
+    return tuple((n.start - base, n.stop - base) for n in walk(node) if isinstance(n, Annotation))
+
+
+def to_data(node):
+    """JSON-serializable form of a node (or list of nodes); see from_data."""
+    if isinstance(node, Node):
+        data = {"node": type(node).__name__, "span": [node.start, node.stop, node.line, node.column]}
+        for name in node._fields:
+            data[name] = to_data(getattr(node, name))
+        return data
+    if isinstance(node, list):
+        return [to_data(item) for item in node]
+    return node
+
+
+def from_data(data):
+    if isinstance(data, dict):
+        cls = NODE_TYPES[data["node"]]
+        return cls(*data["span"], *(from_data(data[name]) for name in cls._fields))
+    if isinstance(data, list):
+        return [from_data(item) for item in data]
+    return data
+
+
+class AstBuilder:
+    """
+    Converts an error-free ANTLR ``program`` parse tree into a Program.
+
+    Each precedence level is ``operand (operator operand)*`` in the grammar,
+    so all of them are folded left by one generic loop.
+    """
+
+    def __init__(self):
+        self._statements = {
+            PseudocodeParser.AssignmentContext: self._assignment,
+            PseudocodeParser.CompoundAssignmentContext: self._assignment,
+            PseudocodeParser.FunctionDeclContext: self._function,
+            PseudocodeParser.FunctionCallStatementContext: self._call_statement,
+            PseudocodeParser.ForEachLoopContext: self._for_each,
+            PseudocodeParser.RegularForLoopContext: self._for,
+            PseudocodeParser.IfStatementContext: self._if,
+            PseudocodeParser.WhileLoopContext: self._while,
+            PseudocodeParser.ReturnStatementContext: self._return,
+            PseudocodeParser.BreakStatementContext: self._break,
+        }
+
+    def build(self, ctx: PseudocodeParser.ProgramContext, text: str) -> Program:
+        return Program(0, len(text) - 1, 1, 0, self._statement_list(ctx.statement()))
+
+    # -- helpers ---------------------------------------------------------
+
+    @staticmethod
+    def _span(ctx) -> Tuple[int, int, int, int]:
+        return ctx.start.start, ctx.stop.stop, ctx.start.line, ctx.start.column
+
+    @staticmethod
+    def _token_span(node: TerminalNode) -> Tuple[int, int, int, int]:
+        token = node.symbol
+        return token.start, token.stop, token.line, token.column
+
+    def _statement_list(self, contexts) -> list:
+        return [self._statement(ctx) for ctx in contexts]
+
+    def _annotation(self, ctx) -> Optional[Annotation]:
+        if ctx is None:
+            return None
+        args = [arg.getText() for arg in ctx.annotationArgList().annotationArg()]
+        return Annotation(*self._span(ctx), ctx.ID().getText(), args)
+
+    # -- statements ------------------------------------------------------
+
+    def _statement(self, ctx) -> Node:
+        annotation = self._annotation(ctx.annotation())
+        for child in ctx.getChildren():
+            convert = self._statements.get(type(child))
+            if convert is not None:
+                return convert(child, self._span(ctx), annotation)
+        raise ValueError(f"unexpected statement: {ctx.getText()!r}")
+
+    def _assignment(self, ctx, span, annotation) -> Assign:
+        value = ctx.expression()
+        if value is None:
+            value = self._array_init(ctx.arrayInitialization())
+        else:
+            value = self._expression(value)
+        return Assign(*span, self._lvalue(ctx.lvalue()), ctx.getChild(1).getText(), value, annotation)
+
+    def _lvalue(self, ctx) -> Node:
+        if isinstance(ctx, PseudocodeParser.ArrayLvalueContext):
+            return Index(*self._span(ctx), ctx.ID().getText(), self._expression(ctx.expression()))
+        return Name(*self._span(ctx), ctx.ID().getText())
+
+    def _array_init(self, ctx) -> ArrayInit:
+        if isinstance(ctx, PseudocodeParser.RangeArrayContext):
+            kind = "range"
+        elif isinstance(ctx, PseudocodeParser.SizeArrayContext):
+            kind = "size"
+        else:
+            kind = "values"
+        # RangeArray's start=/stop= labels shadow the context's token fields.
+        first, last = ctx.getChild(0).symbol, ctx.getChild(ctx.getChildCount() - 1).symbol
+        span = first.start, last.stop, first.line, first.column
+        return ArrayInit(*span, kind, [self._expression(e) for e in ctx.expression()])
+
+    def _function(self, ctx, span, annotation) -> Function:
+        params = []
+        if ctx.paramList():
+            for p in ctx.paramList().annotatedParam():
+                params.append(Param(*self._span(p), p.ID().getText(), self._annotation(p.annotation())))
+        return Function(*span, ctx.ID().getText(), params, self._statement_list(ctx.statement()))
+
+    def _call_statement(self, ctx, span, annotation) -> CallStatement:
+        return CallStatement(*span, self._call(ctx), annotation)
+
+    def _for_each(self, ctx, span, annotation) -> ForEach:
+        annotation = self._annotation(ctx.annotation())
+        variable, iterable = ctx.ID(0).getText(), ctx.ID(1).getText()
+        return ForEach(*span, variable, iterable, self._statement_list(ctx.statement()), annotation)
+
+    def _for(self, ctx, span, annotation) -> For:
+        update = ctx.forUpdate()
+        return For(
+            *span,
+            ctx.ID().getText(),
+            self._expression(ctx.expression(0)),
+            self._expression(ctx.expression(1)),
+            Assign(
+                *self._span(update),
+                Name(*self._token_span(update.ID()), update.ID().getText()),
+                update.getChild(1).getText(),
+                self._expression(update.expression()),
+                None,
+            ),
+            self._statement_list(ctx.block().statement()),
+            self._annotation(ctx.annotation()),
+        )
+
+    def _if(self, ctx, span, annotation) -> If:
+        tests = [self._expression(e) for e in ctx.expression()]
+        bodies = [self._statement_list(b.statement()) for b in ctx.block()]
+        orelse = bodies.pop() if len(bodies) > len(tests) else None
+        return If(*span, tests, bodies, orelse, annotation)
+
+    def _while(self, ctx, span, annotation) -> While:
+        body = self._statement_list(ctx.statement())
+        return While(*span, self._expression(ctx.expression()), body, annotation)
+
+    def _return(self, ctx, span, annotation) -> Return:
+        return Return(*span, self._expression(ctx.expression()), annotation)
+
+    def _break(self, ctx, span, annotation) -> Break:
+        return Break(*span, annotation)
+
+    # -- expressions -----------------------------------------------------
+
+    def _expression(self, ctx) -> Node:
+        if isinstance(ctx, PseudocodeParser.UnaryMinusExprContext):
+            return UnaryMinus(*self._span(ctx), self._expression(ctx.unaryExpression()))
+        if isinstance(ctx, PseudocodeParser.UnaryPassContext):
+            return self._expression(ctx.primaryExpression())
+        if isinstance(ctx, PseudocodeParser.ParenExpressionContext):
+            return self._expression(ctx.expression())
+        if isinstance(ctx, PseudocodeParser.FunctionCallExpressionContext):
+            return self._call(ctx)
+        if isinstance(ctx, PseudocodeParser.ArrayAccessExpressionContext):
+            return Index(*self._span(ctx), ctx.ID().getText(), self._expression(ctx.expression()))
+        if isinstance(ctx, PseudocodeParser.AtomExpressionContext):
+            token = ctx.atom().getChild(0).symbol
+            span = token.start, token.stop, token.line, token.column
+            if token.type == PseudocodeParser.ID:
+                return Name(*span, token.text)
+            return Literal(*span, PseudocodeParser.symbolicNames[token.type], token.text)
+
+        # A precedence level: operand (operator operand)*
+        children = list(ctx.getChildren())
+        left = self._expression(children[0])
+        first = children[0].start
+        for i in range(1, len(children), 2):
+            operand = children[i + 1]
+            right = self._expression(operand)
+            left = BinaryOp(
+                first.start, operand.stop.stop, first.line, first.column,
+                children[i].getText(), left, right,
+            )
+        return left
+
+    def _call(self, ctx) -> Call:
+        args = ctx.expressionList()
+        args = [self._expression(e) for e in args.expression()] if args else []
+        return Call(*self._span(ctx), ctx.ID().getText(), args)
+
+
+def build_ast(tree: PseudocodeParser.ProgramContext, text: str) -> Program:
+    """AST for an ANTLR parse tree of ``text`` that has no syntax errors."""
+    return AstBuilder().build(tree, text)
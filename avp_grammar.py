@@ -0,0 +1,183 @@
+"""
+Lark grammar for AVP, derived mechanically from Pseudocode.g4.
+
+vLLM's guided decoding accepts a Lark grammar (``guided_grammar``) and masks
+tokens that would make the output invalid, so the model cannot emit markdown
+fences or Python-isms. Deriving it from the ANTLR grammar at runtime keeps the
+two in sync: edit Pseudocode.g4 and the constraint follows.
+
+Only the subset of ANTLR syntax used by Pseudocode.g4 is supported: rule
+alternatives, ``# Label`` and ``name=`` labels, sub-rules with ``? * +``,
+string literals, character sets and their negation, and ``-> skip``.
+"""
+
+import os
+import re
+from functools import lru_cache
+from typing import List, Tuple
+
+GRAMMAR_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Pseudocode.g4")
+
+MODES = ("off", "program", "strict")
+
+# "strict" forces the shape the prompt asks for: optional setup assignments,
+# one or more functions, then a single call of the function.
+_STRICT_START = """start: NL* (assignment NL+)* function_decl (NL+ function_decl)* NL+ entry_call NL*
+entry_call: (lvalue EQ)? ID LPAREN expression_list? RPAREN SEMICOLON?
+"""
+_PROGRAM_START = "start: program\n"
+
+_G4_TOKEN_RE = re.compile(
+    r"""
+    (?P<ws>\s+)
+  | (?P<comment>//[^\n]*|/\*.*?\*/)
+  | (?P<string>'(?:\\.|[^'\\])*')
+  | (?P<charset>\[(?:\\.|[^\]\\])*\])
+  | (?P<arrow>->)
+  | (?P<option><[^>]*>)
+  | (?P<name>[A-Za-z_][A-Za-z0-9_]*)
+  | (?P<punct>[:;|()?*+~#=])
+    """,
+    re.VERBOSE | re.DOTALL,
+)
+
+
+def _tokenize_g4(text: str) -> List[Tuple[str, str]]:
+    tokens = []
+    pos = 0
+    while pos < len(text):
+        m = _G4_TOKEN_RE.match(text, pos)
+        if not m:
+            raise ValueError(f"Unsupported ANTLR syntax at offset {pos}: {text[pos:pos + 20]!r}")
+        pos = m.end()
+        kind = m.lastgroup
+        if kind in ("ws", "comment"):
+            continue
+        tokens.append((kind, m.group()))  # type: ignore[arg-type]
+    return tokens
+
+
+def _snake(name: str) -> str:
+    return re.sub(r"(?<!^)(?=[A-Z])", "_", name).lower()
+
+
+def _lark_string(g4_literal: str) -> str:
+    body = g4_literal[1:-1]
+    # ANTLR escapes \' inside '...'; Lark strings are double-quoted.
+    body = body.replace("\\'", "'").replace('"', '\\"')
+    return f'"{body}"'
+
+
+def _lark_charset(g4_set: str, negated: bool) -> str:
+    body = g4_set[1:-1].replace("/", "\\/")
+    return f"/[{'^' if negated else ''}{body}]/"
+
+
+def _convert_rule(name: str, body: List[Tuple[str, str]]) -> Tuple[str, bool]:
+    """Convert one rule body; returns (Lark definition, skipped?)."""
+    is_lexer = name[0].isupper()
+    out: List[str] = []
+    skipped = False
+    depth = 0
+    i = 0
+    while i < len(body):
+        kind, text = body[i]
+        nxt = body[i + 1] if i + 1 < len(body) else ("", "")
+        if kind == "punct" and text == "#":
+            i += 2  # alternative label
+            continue
+        if kind == "name" and nxt == ("punct", "="):
+            i += 2  # element label, e.g. left=
+            continue
+        if kind == "arrow":
+            skipped = body[i + 1][1] == "skip"
+            i += 2
+            continue
+        if kind == "option":
+            i += 1  # e.g. <assoc=right>; irrelevant for acceptance
+            continue
+        if kind == "punct" and text == "~":
+            out.append(_lark_charset(nxt[1], negated=True))
+            i += 2
+            continue
+        if kind == "string":
+            out.append(_lark_string(text))
+        elif kind == "charset":
+            out.append(_lark_charset(text, negated=False))
+        elif kind == "name":
+            if text == "EOF":
+                pass
+            elif text[0].isupper():
+                out.append(text)
+            else:
+                out.append(_snake(text))
+        elif text == "|":
+            out.append("\n    |" if depth == 0 else "|")
+        elif text in "?*+":
+            out[-1] += text  # quantifiers attach to the preceding element
+        elif text == "(":
+            depth += 1
+            out.append("(")
+        elif text == ")":
+            depth -= 1
+            out[-1] += ")"
+        else:
+            out.append(text)
+        i += 1
+    rule_name = name if is_lexer else _snake(name)
+    # Glue "(" to the element that follows it.
+    definition = " ".join(out).replace("( ", "(").replace(" \n", "\n")
+    return f"{rule_name}: {definition}", skipped
+
+
+@lru_cache(maxsize=1)
+def _converted_rules(path: str = GRAMMAR_PATH) -> Tuple[str, ...]:
+    with open(path, "r") as f:
+        tokens = _tokenize_g4(f.read())
+
+    # Drop the 'grammar Name;' header.
+    if tokens[:1] == [("name", "grammar")]:
+        tokens = tokens[3:]
+
+    rules: List[str] = []
+    ignored: List[str] = []
+    i = 0
+    while i < len(tokens):
+        name = tokens[i][1]
+        if tokens[i + 1] != ("punct", ":"):
+            raise ValueError(f"Expected ':' after rule {name!r}")
+        j = i + 2
+        while tokens[j] != ("punct", ";"):
+            j += 1
+        definition, skipped = _convert_rule(name, tokens[i + 2 : j])
+        rules.append(definition)
+        if skipped:
+            ignored.append(name)
+        i = j + 1
+
+    rules.extend(f"%ignore {name}" for name in ignored)
+    return tuple(rules)
+
+
+@lru_cache(maxsize=len(MODES))
+def lark_grammar(mode: str = "program") -> str:
+    """
+    Return the AVP grammar in Lark syntax.
+
+    Args:
+        mode: "program" accepts any valid AVP program; "strict" additionally
+              requires function definitions followed by a single call statement
+
+    Returns:
+        Lark grammar text with a ``start`` rule
+    """
+    if mode not in ("program", "strict"):
+        raise ValueError(f"Unknown grammar mode {mode!r}; expected 'program' or 'strict'")
+    start = _STRICT_START if mode == "strict" else _PROGRAM_START
+    return start + "\n".join(_converted_rules()) + "\n"
+
+
+if __name__ == "__main__":
+    import sys
+
+    print(lark_grammar(sys.argv[1] if len(sys.argv) > 1 else "program"))
@@ -0,0 +1,95 @@
+"""
+Measure the memory held by ANTLR parse trees against avp_ast trees.
+
+For data/*.avp and a synthetic large file of renamed copies of them, reports
+the bytes retained by each tree (tracemalloc, after parsing has finished and
+temporaries are freed) and per node. An ANTLR tree keeps its tokens, token
+stream and input alive, so those are counted with it; its nodes are rule
+contexts plus terminal nodes.
+
+    uv run python benchmarks/ast_memory.py --copies 20
+"""
+
+import argparse
+import gc
+import glob
+import os
+import re
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from antlr4 import CommonTokenStream, InputStream  # noqa: E402
+from antlr4.tree.Tree import TerminalNode  # noqa: E402
+
+import fastparse  # noqa: E402
+from avp_ast import build_ast, walk  # noqa: E402
+from parsing import parse_program  # noqa: E402
+from PseudocodeLexer import PseudocodeLexer  # noqa: E402
+from PseudocodeParser import PseudocodeParser  # noqa: E402
+
+DATA = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "data")
+
+
+def antlr_tree(text):
+    parser = PseudocodeParser(CommonTokenStream(PseudocodeLexer(InputStream(text))))
+    return parse_program(parser)
+
+
+def count_antlr_nodes(tree):
+    count, stack = 0, [tree]
+    while stack:
+        node = stack.pop()
+        count += 1
+        if not isinstance(node, TerminalNode):
+            stack.extend(node.getChildren())
+    return count
+
+
+def retained(build, texts):
+    """Bytes still allocated after building (and keeping) one tree per text."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    trees = [build(text) for text in texts]
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return after - before, trees
+
+
+def report(label, texts):
+    # Warm the ANTLR DFA cache so its growth isn't charged to the trees.
+    for text in texts:
+        antlr_tree(text)
+
+    antlr_bytes, antlr_trees = retained(antlr_tree, texts)
+    ast_bytes, asts = retained(lambda text: fastparse.parse(text).program, texts)
+    assert asts == [build_ast(tree, text) for tree, text in zip(antlr_trees, texts)]
+
+    antlr_nodes = sum(count_antlr_nodes(tree) for tree in antlr_trees)
+    ast_nodes = sum(sum(1 for _ in walk(tree)) for tree in asts)
+    print(label)
+    print(f"  antlr   {antlr_bytes / 1024:9.1f} KiB  {antlr_nodes:7d} nodes  {antlr_bytes / antlr_nodes:6.0f} B/node")
+    print(f"  avp_ast {ast_bytes / 1024:9.1f} KiB  {ast_nodes:7d} nodes  {ast_bytes / ast_nodes:6.0f} B/node"
+          f"  ({antlr_bytes / ast_bytes:.1f}x smaller)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--copies", type=int, default=20, help="copies of data/ in the large file")
+    args = parser.parse_args()
+
+    texts = [open(p, encoding="utf-8").read() for p in sorted(glob.glob(os.path.join(DATA, "*.avp")))]
+    big = "\n".join(
+        re.sub(r"^fun[ \t]+(\w+)", rf"fun \g<1>_{i}", text, flags=re.M)
+        for i in range(args.copies)
+        for text in texts
+    )
+    report(f"data/*.avp ({len(texts)} files)", texts)
+    report(f"synthetic file ({big.count(chr(10))} lines)", [big])
+
+
+if __name__ == "__main__":
+    main()
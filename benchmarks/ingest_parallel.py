@@ -0,0 +1,69 @@
+"""
+Time serial vs. process-pool parsing on a synthetic corpus.
+
+The corpus is built from the files in data/, copied N times with the function
+names suffixed so every copy is distinct. Usage:
+
+    uv run python benchmarks/ingest_parallel.py --copies 40 --workers 4
+"""
+
+import argparse
+import glob
+import os
+import re
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from ingest import ingest_workers, parse_files  # noqa: E402
+
+DATA = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "data")
+
+
+def build_corpus(target: str, copies: int) -> list:
+    sources = sorted(glob.glob(os.path.join(DATA, "*.avp")))
+    paths = []
+    for i in range(copies):
+        for src in sources:
+            with open(src, encoding="utf-8") as f:
+                text = re.sub(r"^fun[ \t]+(\w+)", rf"fun \g<1>_{i}", f.read(), flags=re.M)
+            name = f"{i:04d}_{os.path.basename(src)}"
+            path = os.path.join(target, name)
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(text)
+            paths.append(path)
+    return paths
+
+
+def timed(paths, **kwargs):
+    start = time.perf_counter()
+    results = parse_files(paths, **kwargs)
+    return time.perf_counter() - start, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--copies", type=int, default=40, help="copies of data/*.avp")
+    parser.add_argument("--workers", type=int, default=None, help="parser processes")
+    args = parser.parse_args()
+    workers = args.workers or ingest_workers()
+
+    with tempfile.TemporaryDirectory() as corpus:
+        paths = build_corpus(corpus, args.copies)
+        # Warm this process's ANTLR DFA cache so serial isn't charged for it;
+        # each worker process still pays its own warm-up.
+        parse_files(paths[: len(paths) // args.copies], serial=True)
+        serial_s, serial = timed(paths, serial=True)
+        parallel_s, parallel = timed(paths, workers=workers)
+
+    assert serial == parallel, "parallel results differ from serial"
+    functions = sum(len(chunks) for _, chunks, _ in serial)
+    print(f"{len(paths)} files, {functions} functions")
+    print(f"serial:              {serial_s:7.2f} s")
+    print(f"parallel ({workers:2d} workers): {parallel_s:7.2f} s  ({serial_s / parallel_s:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Time parsing of deeply nested and long expressions.
+
+Measures the compiled parser (PseudocodeParser.py) with full LL and with the
+two-stage SLL/LL entry point; README.md ("Regenerating the parser") records
+the numbers before and after the expression rules were left-factored:
+
+    uv run python benchmarks/parse_expressions.py
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from antlr4 import CommonTokenStream, InputStream  # noqa: E402
+
+from parsing import parse_program  # noqa: E402
+from PseudocodeLexer import PseudocodeLexer  # noqa: E402
+from PseudocodeParser import PseudocodeParser  # noqa: E402
+
+
+def nested(depth: int) -> str:
+    expr = "x"
+    for i in range(depth):
+        expr = f"({expr} + {i}) * 2"
+    return f"y = {expr}\n"
+
+
+def chain(length: int) -> str:
+    return "y = " + " + ".join(f"a[{i}] * f(b, {i})" for i in range(length)) + "\n"
+
+
+def condition(length: int) -> str:
+    terms = " and ".join(f"(x{i} < {i} or -x{i} >= {i} ** 2)" for i in range(length))
+    return f"if ({terms}):\n    y = 1\nend if\n"
+
+
+def parse_ms(code: str, two_stage: bool, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        parser = PseudocodeParser(CommonTokenStream(PseudocodeLexer(InputStream(code))))
+        parser.removeErrorListeners()
+        parse_program(parser, two_stage=two_stage)
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    cases = [
+        ("nested depth 10", nested(10)),
+        ("nested depth 40", nested(40)),
+        ("sum of 200 terms", chain(200)),
+        ("condition of 50 terms", condition(50)),
+    ]
+    print(f"{'input':24s} {'LL ms':>9s} {'SLL->LL ms':>11s}")
+    for name, code in cases:
+        parse_ms(code, True, 1)  # warm the DFA cache
+        ll = parse_ms(code, False, args.repeat)
+        two_stage = parse_ms(code, True, args.repeat)
+        print(f"{name:24s} {ll:9.2f} {two_stage:11.2f}")
+
+
+if __name__ == "__main__":
+    main()
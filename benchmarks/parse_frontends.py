@@ -0,0 +1,73 @@
+"""
+Time the ANTLR front end against the hand-written one in fastparse.py.
+
+Both build the avp_ast tree (ANTLR via avp_ast.build_ast) and extract function
+chunks from data/*.avp and from a synthetic large file of renamed copies of
+them; the chunks are checked to be identical:
+
+    uv run python benchmarks/parse_frontends.py --copies 50
+"""
+
+import argparse
+import glob
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import fastparse  # noqa: E402
+from avp_ast import function_chunks  # noqa: E402
+from ingest import parse_source  # noqa: E402
+
+DATA = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "data")
+
+
+def antlr_chunks(text):
+    program, _ = parse_source(text, frontend="antlr")
+    return function_chunks(program, text)
+
+
+def fast_chunks(text):
+    result = fastparse.parse(text)
+    assert not result.errors, result.errors
+    return result.functions
+
+
+def timed(extract, texts, repeat):
+    best, chunks = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        chunks = [extract(text) for text in texts]
+        best = min(best, time.perf_counter() - start)
+    return best, chunks
+
+
+def report(label, texts, repeat):
+    antlr_s, expected = timed(antlr_chunks, texts, repeat)
+    fast_s, chunks = timed(fast_chunks, texts, repeat)
+    assert chunks == expected, "fastparse chunks differ from ANTLR"
+    print(label)
+    print(f"  antlr {antlr_s:7.3f} s")
+    print(f"  fast  {fast_s:7.3f} s  ({antlr_s / fast_s:.1f}x)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--copies", type=int, default=50, help="copies of data/ in the large file")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    texts = [open(p, encoding="utf-8").read() for p in sorted(glob.glob(os.path.join(DATA, "*.avp")))]
+    big = "\n".join(
+        re.sub(r"^fun[ \t]+(\w+)", rf"fun \g<1>_{i}", text, flags=re.M)
+        for i in range(args.copies)
+        for text in texts
+    )
+    report(f"data/*.avp ({len(texts)} files)", texts, args.repeat)
+    report(f"synthetic file ({big.count(chr(10))} lines)", [big], args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Time full-LL parsing against two-stage SLL/LL parsing (parsing.parse_program).
+
+Runs over data/*.avp and over a synthetic large file made of many renamed
+copies of them, each both cold (empty DFA cache, as in a fresh ingest worker)
+and warm:
+
+    uv run python benchmarks/parse_sll.py --copies 50
+"""
+
+import argparse
+import glob
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from antlr4 import CommonTokenStream, InputStream  # noqa: E402
+from antlr4.dfa.DFA import DFA  # noqa: E402
+from antlr4.PredictionContext import PredictionContextCache  # noqa: E402
+
+from parsing import parse_program  # noqa: E402
+from PseudocodeLexer import PseudocodeLexer  # noqa: E402
+from PseudocodeParser import PseudocodeParser  # noqa: E402
+
+DATA = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "data")
+
+
+def reset_dfa_cache():
+    atn = PseudocodeParser.atn
+    PseudocodeParser.decisionsToDFA = [DFA(s, i) for i, s in enumerate(atn.decisionToState)]
+    PseudocodeParser.sharedContextCache = PredictionContextCache()
+
+
+def parse_all(texts, two_stage):
+    start = time.perf_counter()
+    for text in texts:
+        parser = PseudocodeParser(CommonTokenStream(PseudocodeLexer(InputStream(text))))
+        parser.removeErrorListeners()
+        parse_program(parser, two_stage=two_stage)
+    return time.perf_counter() - start
+
+
+def report(label, texts, repeat):
+    print(label)
+    for two_stage, name in ((False, "LL"), (True, "SLL->LL")):
+        reset_dfa_cache()
+        cold = parse_all(texts, two_stage)
+        warm = min(parse_all(texts, two_stage) for _ in range(repeat))
+        print(f"  {name:8s} cold {cold:7.3f} s   warm {warm:7.3f} s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--copies", type=int, default=50, help="copies of data/ in the large file")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    texts = [open(p, encoding="utf-8").read() for p in sorted(glob.glob(os.path.join(DATA, "*.avp")))]
+    big = "\n".join(
+        re.sub(r"^fun[ \t]+(\w+)", rf"fun \g<1>_{i}", text, flags=re.M)
+        for i in range(args.copies)
+        for text in texts
+    )
+    report(f"data/*.avp ({len(texts)} files)", texts, args.repeat)
+    report(f"synthetic file ({big.count(chr(10))} lines)", [big], args.repeat)
+
+
+if __name__ == "__main__":
+    main()
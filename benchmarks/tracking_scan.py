@@ -0,0 +1,56 @@
+"""
+Time change detection on a large synthetic corpus.
+
+Creates N small .avp files, records them as ingested, then times a no-op
+detect_changed_files run (stat only) and a full re-hash for comparison:
+
+    uv run python benchmarks/tracking_scan.py --files 50000
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from kb_store import empty_metadata  # noqa: E402
+from tracking import detect_changed_files, update_metadata  # noqa: E402
+
+TEMPLATE = "fun f_{i}(x):\n    return x + {i}\nend fun\n"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--files", type=int, default=50000)
+    parser.add_argument("--hash-workers", type=int, default=4)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as corpus:
+        for i in range(args.files):
+            with open(os.path.join(corpus, f"f_{i:06d}.avp"), "w") as f:
+                f.write(TEMPLATE.format(i=i))
+
+        metadata = empty_metadata()
+        start = time.perf_counter()
+        changed, _, _, detected = detect_changed_files(corpus, metadata)
+        for path in changed:
+            update_metadata(metadata, path, [], detected)
+        print(f"initial ingest (hash all):   {time.perf_counter() - start:6.2f} s")
+
+        start = time.perf_counter()
+        changed, unchanged, _, _ = detect_changed_files(corpus, metadata)
+        print(f"no-op scan (stat only):      {time.perf_counter() - start:6.2f} s")
+        assert not changed and len(unchanged) == args.files
+
+        for workers in (1, args.hash_workers):
+            os.environ["TRACKING_ALWAYS_HASH"] = "true"
+            start = time.perf_counter()
+            detect_changed_files(corpus, metadata, hash_workers=workers)
+            print(f"full re-hash ({workers} thread(s)):   {time.perf_counter() - start:6.2f} s")
+        os.environ.pop("TRACKING_ALWAYS_HASH")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+"""
+Lexer-based compaction of AVP reference code for the generation prompt.
+
+The LLM only needs reference functions to pick up AVP syntax, so comments,
+blank lines, alignment whitespace and (optionally) visualizer annotations are
+prefill tokens it does not need. Working from the ANTLR token stream rather
+than regexes keeps string literals like "a // b" intact.
+
+Levels are cumulative:
+    none        - leave the code untouched
+    comments    - drop // comments and blank lines
+    whitespace  - also collapse runs of spaces inside a line (indentation is kept)
+    annotations - also drop @mark<...>, @log<...>, @init<...> annotations
+"""
+
+import glob
+import os
+import sys
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+from antlr4 import InputStream
+from antlr4.error.ErrorListener import ErrorListener
+
+from PseudocodeLexer import PseudocodeLexer
+
+LEVELS = ("none", "comments", "whitespace", "annotations")
+
+
+class _LexErrorFlag(ErrorListener):
+    def __init__(self):
+        self.failed = False
+
+    def syntaxError(self, recognizer, offendingSymbol, line, column, msg, e):
+        self.failed = True
+
+
+def _spaced(tokens: list) -> List[Tuple[object, bool]]:
+    """Pair each token with whether the source had whitespace before it."""
+    return [
+        (tok, i > 0 and tok.start > tokens[i - 1].stop + 1) for i, tok in enumerate(tokens)
+    ]
+
+
+def _drop_annotations(spaced: list) -> list:
+    """Remove AT ID '<' ... '>' spans; the next token takes over the span's spacing."""
+    kept = []
+    i = 0
+    while i < len(spaced):
+        tok, space_before = spaced[i]
+        if (
+            tok.type == PseudocodeLexer.AT
+            and i + 2 < len(spaced)
+            and spaced[i + 1][0].type == PseudocodeLexer.ID
+            and spaced[i + 2][0].type == PseudocodeLexer.LOW_THAN
+        ):
+            j = i + 3
+            while j < len(spaced) and spaced[j][0].type != PseudocodeLexer.GREATER_THAN:
+                j += 1
+            i = j + 1
+            if i < len(spaced):
+                spaced[i] = (spaced[i][0], space_before)
+            continue
+        kept.append(spaced[i])
+        i += 1
+    return kept
+
+
+def _drop_spans(spaced: list, spans: Tuple[Tuple[int, int], ...]) -> list:
+    """Remove tokens inside the given (start, stop) spans, spacing as in _drop_annotations."""
+    kept = []
+    carry = None
+    for tok, space_before in spaced:
+        if any(start <= tok.start <= stop for start, stop in spans):
+            if carry is None:
+                carry = space_before
+            continue
+        if carry is not None:
+            space_before, carry = carry, None
+        kept.append((tok, space_before))
+    return kept
+
+
+def _join_tokens(spaced: list) -> str:
+    # One space wherever the source had any whitespace between two tokens.
+    parts = []
+    for tok, space_before in spaced:
+        if space_before and parts:
+            parts.append(" ")
+        parts.append(tok.text)
+    return "".join(parts)
+
+
+@lru_cache(maxsize=1024)
+def compact_code(
+    code: str, level: str = "comments", annotations: Optional[Tuple[Tuple[int, int], ...]] = None
+) -> str:
+    """
+    Compact AVP source code at the given level.
+
+    Args:
+        code: AVP source (typically one function from the knowledge base)
+        level: One of LEVELS
+        annotations: Offsets of the annotations in code when its AST is at
+            hand (avp_ast.annotation_spans); otherwise they are found by
+            matching tokens
+
+    Returns:
+        The compacted code. Code the lexer cannot tokenize cleanly is returned
+        unchanged rather than risk dropping characters.
+    """
+    if level not in LEVELS:
+        raise ValueError(f"Unknown compaction level {level!r}; expected one of {LEVELS}")
+    if level == "none":
+        return code
+
+    lexer = PseudocodeLexer(InputStream(code))
+    errors = _LexErrorFlag()
+    lexer.removeErrorListeners()
+    lexer.addErrorListener(errors)
+    tokens = lexer.getAllTokens()
+    if errors.failed:
+        return code
+
+    # Comments and whitespace are skipped by the lexer, so each line is just
+    # the tokens between NL tokens.
+    lines: List[list] = [[]]
+    for tok in tokens:
+        if tok.type == PseudocodeLexer.NL:
+            lines.append([])
+        else:
+            lines[-1].append(tok)
+
+    out = []
+    for line in lines:
+        if not line:
+            continue
+        indent = " " * line[0].column
+        if level == "comments":
+            text = code[line[0].start : line[-1].stop + 1]
+        else:
+            spaced = _spaced(line)
+            if level == "annotations":
+                spaced = _drop_annotations(spaced) if annotations is None else _drop_spans(spaced, annotations)
+            if not spaced:
+                continue
+            text = _join_tokens(spaced)
+        out.append(indent + text)
+    return "\n".join(out)
+
+
+def compaction_level() -> str:
+    return os.environ.get("PROMPT_COMPACTION", "comments")
+
+
+def compact_snippets(snippets: List[Dict], level: str, count_tokens) -> Tuple[List[Dict], Dict]:
+    """
+    Compact the code of retrieved snippets and report the token savings.
+
+    A snippet may carry "annotations" spans (see compact_code).
+
+    Returns:
+        Tuple of (snippets with compacted code, stats dict with
+        original_tokens and compacted_tokens)
+    """
+    compacted = [
+        {**s, "code": compact_code(s["code"], level, s.get("annotations"))} for s in snippets
+    ]
+    stats = {
+        "original_tokens": sum(count_tokens(s["code"]) for s in snippets),
+        "compacted_tokens": sum(count_tokens(s["code"]) for s in compacted),
+    }
+    return compacted, stats
+
+
+if __name__ == "__main__":
+    from avp_ast import annotation_spans
+    from avp_ast import functions as ast_functions
+    from fastparse import read_source
+    from ingest import parse_source
+    from packing import get_token_counter
+
+    data_folder = sys.argv[1] if len(sys.argv) > 1 else "./data"
+    count_tokens = get_token_counter()
+    functions = []
+    for path in sorted(glob.glob(os.path.join(data_folder, "*.avp"))):
+        text = read_source(path)
+        program, _ = parse_source(text)
+        for fn in ast_functions(program) if program else []:
+            functions.append({
+                "function_name": fn.name,
+                "code": text[fn.start : fn.stop + 1],
+                "annotations": annotation_spans(fn, base=fn.start),
+            })
+
+    print(f"Token savings over {len(functions)} function(s) in {data_folder}:")
+    for level in LEVELS:
+        _, stats = compact_snippets(functions, level, count_tokens)
+        saved = stats["original_tokens"] - stats["compacted_tokens"]
+        pct = 100 * saved / stats["original_tokens"] if stats["original_tokens"] else 0.0
+        print(f"  {level:<12} {stats['compacted_tokens']:>6} tokens  (saved {saved}, {pct:.1f}%)")
@@ -0,0 +1,62 @@
+"""
+Per-request deadlines shared by the retrieval and generation stages.
+
+A client can send ``X-Deadline-Ms`` with how long it is willing to wait. The
+deadline is threaded through retrieve.py and providers.py; each stage checks
+the remaining budget and cuts its own work (fewer candidates reranked, a
+shorter LLM timeout and max_tokens) rather than overrunning. Stages record
+what they cut in ``notes`` so the API can flag the response as partial.
+"""
+
+import time
+from typing import Callable, List, Optional
+
+HEADER = "X-Deadline-Ms"
+
+
+class Deadline:
+    """An absolute point in time (monotonic clock) a request must finish by."""
+
+    def __init__(
+        self,
+        seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+        notes: Optional[List[str]] = None,
+    ):
+        self._clock = clock
+        self.expires_at = clock() + seconds
+        self.notes: List[str] = notes if notes is not None else []
+
+    @classmethod
+    def from_header(cls, value: Optional[str]) -> Optional["Deadline"]:
+        """Parse an ``X-Deadline-Ms`` value; None if the header is absent.
+
+        Raises ValueError for anything but a positive number of milliseconds.
+        """
+        if value is None or not value.strip():
+            return None
+        ms = float(value)
+        if not ms > 0:
+            raise ValueError(f"{HEADER} must be a positive number of milliseconds")
+        return cls(ms / 1000.0)
+
+    def remaining(self) -> float:
+        """Seconds left (0 once expired)."""
+        return max(0.0, self.expires_at - self._clock())
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def share(self, fraction: float) -> "Deadline":
+        """A sub-deadline for one stage: ``fraction`` of what remains.
+
+        Notes are shared with the parent so cuts made by the stage are visible
+        on the request's deadline.
+        """
+        return Deadline(self.remaining() * fraction, clock=self._clock, notes=self.notes)
+
+    def note(self, what: str) -> None:
+        """Record that a stage cut its work short to meet the deadline."""
+        if what not in self.notes:
+            self.notes.append(what)
@@ -0,0 +1,608 @@
+"""
+Hand-written front end for AVP: a single-regex tokenizer and a recursive-descent
+parser for Pseudocode.g4.
+
+The generated ANTLR parser drives every decision through its ATN interpreter,
+which is slow in CPython. This front end recognises the same language with
+one-token decisions (two for ``ID (`` / ``ID [`` / ``else if``) and builds the
+same avp_ast tree as ``avp_ast.build_ast`` does from the ANTLR parse tree, so it
+yields the same function chunks.
+
+Errors match ANTLR's positions: the lexer skips unrecognised input exactly as
+the ANTLR lexer does (same "token recognition error" messages), and the parser
+stops at the first token that cannot continue a valid program, which is where
+ANTLR reports its first syntax error. It does not attempt ANTLR's error
+recovery, so callers that need the recovered tree or the full list of messages
+fall back to ANTLR when this parser reports an error (see
+``ingest.parse_file`` and ``validation.validate_code``).
+"""
+
+import codecs
+import os
+import re
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from avp_ast import (
+    Annotation,
+    ArrayInit,
+    Assign,
+    BinaryOp,
+    Break,
+    Call,
+    CallStatement,
+    For,
+    ForEach,
+    Function,
+    If,
+    Index,
+    Literal,
+    Name,
+    Node,
+    Param,
+    Program,
+    Return,
+    UnaryMinus,
+    While,
+    function_chunks,
+)
+
+FRONTENDS = ("antlr", "fast")
+
+
+def frontend() -> str:
+    """The configured parser front end: PARSER_FRONTEND, "antlr" (default) or "fast"."""
+    name = os.environ.get("PARSER_FRONTEND", "antlr").lower()
+    if name not in FRONTENDS:
+        raise ValueError(f"Unknown PARSER_FRONTEND {name!r}; expected one of {FRONTENDS}")
+    return name
+
+
+# Token types, named as in Pseudocode.g4.
+KEYWORDS = {
+    "arr": "ARR",
+    "to": "TO",
+    "fun": "FUN",
+    "for": "FOR",
+    "in": "IN",
+    "if": "IF",
+    "else": "ELSE",
+    "return": "RETURN",
+    "end": "END",
+    "while": "WHILE",
+    "break": "BREAK",
+    "True": "TRUE",
+    "true": "TRUE",
+    "False": "FALSE",
+    "and": "AND",
+    "or": "OR",
+    "Null": "NULL",
+}
+SYMBOLS = {
+    "==": "EQEQ",
+    "=": "EQ",
+    "<=": "LESS_EQ",
+    "<": "LOW_THAN",
+    ">=": "GREATER_EQ",
+    ">": "GREATER_THAN",
+    "**": "POW",
+    "*=": "STAR_EQ",
+    "*": "STAR",
+    "+=": "PLUS_EQ",
+    "+": "PLUS",
+    "-=": "MINUS_EQ",
+    "-": "MINUS",
+    "/=": "SLASH_EQ",
+    "/": "SLASH",
+    "[": "LBRACK",
+    "]": "RBRACK",
+    "(": "LPAREN",
+    ")": "RPAREN",
+    ":": "COLON",
+    ",": "COMMA",
+    ";": "SEMICOLON",
+    "@": "AT",
+}
+
+# Alternatives are ordered so the first match is also ANTLR's longest match.
+# The last three reproduce how the ANTLR lexer skips input no rule accepts:
+# everything it read, plus the character that failed (unless at EOF).
+_TOKEN_RE = re.compile(
+    r"""
+    (?P<NL>\r?\n)
+  | (?P<WS>[ \t]+)
+  | (?P<COMMENT>//[^\r\n]*)
+  | (?P<FLOAT>[0-9]+\.[0-9]+)
+  | (?P<INT>[0-9]+)
+  | (?P<WORD>[a-zA-Z_][a-zA-Z_0-9]*)
+  | (?P<STRING>"[^"\r\n]*")
+  | (?P<SYMBOL>==|<=|>=|\*\*|\*=|\+=|-=|/=|[=<>*+\-/\[\]():,;@])
+  | (?P<BAD_STRING>"[^"\r\n]*(?:[\r\n]|\Z))
+  | (?P<BAD_CR>\r(?:[\s\S]|\Z))
+  | (?P<BAD>[\s\S])
+    """,
+    re.VERBOSE,
+)
+
+_STATEMENT_START = frozenset({"ID", "FUN", "FOR", "IF", "WHILE", "RETURN", "BREAK", "AT"})
+_COMPOUND_OPS = frozenset({"PLUS_EQ", "MINUS_EQ", "STAR_EQ", "SLASH_EQ"})
+_COMPARISON_OPS = frozenset({"EQEQ", "LOW_THAN", "GREATER_THAN", "LESS_EQ", "GREATER_EQ"})
+_LITERALS = frozenset({"INT", "FLOAT", "TRUE", "FALSE", "NULL", "STRING"})
+_ANNOTATION_ARGS = frozenset({"ID", "STRING", "INT"})
+
+
+class Token(NamedTuple):
+    type: str
+    text: str
+    line: int
+    column: int
+    start: int
+    stop: int  # inclusive, as in ANTLR
+
+
+class SyntaxIssue(NamedTuple):
+    line: int
+    column: int
+    message: str
+
+    def __str__(self) -> str:
+        return f"line {self.line}:{self.column} {self.message}"
+
+
+class ParseResult(NamedTuple):
+    functions: List[Dict]
+    errors: List[str]  # "line L:C message", in source order
+    program: Optional[Program] = None  # None if there are errors
+
+
+def _display(text: str) -> str:
+    return text.replace("\n", "\\n").replace("\r", "\\r").replace("\t", "\\t")
+
+
+def tokenize(text: str) -> Tuple[List[Token], List[SyntaxIssue]]:
+    """Split AVP source into tokens (whitespace and comments dropped), ending with EOF."""
+    tokens: List[Token] = []
+    errors: List[SyntaxIssue] = []
+    line, line_start = 1, 0
+    for m in _TOKEN_RE.finditer(text):
+        kind = m.lastgroup
+        value = m.group()
+        start = m.start()
+        column = start - line_start
+        if kind == "WORD":
+            tokens.append(Token(KEYWORDS.get(value, "ID"), value, line, column, start, m.end() - 1))
+        elif kind == "SYMBOL":
+            tokens.append(Token(SYMBOLS[value], value, line, column, start, m.end() - 1))
+        elif kind in ("NL", "FLOAT", "INT", "STRING"):
+            tokens.append(Token(kind, value, line, column, start, m.end() - 1))  # type: ignore[arg-type]
+        elif kind not in ("WS", "COMMENT"):
+            errors.append(SyntaxIssue(line, column, f"token recognition error at: '{_display(value)}'"))
+        newlines = value.count("\n")
+        if newlines:
+            line += newlines
+            line_start = start + value.rindex("\n") + 1
+    tokens.append(Token("EOF", "<EOF>", line, len(text) - line_start, len(text), len(text) - 1))
+    return tokens, errors
+
+
+class _SyntaxError(Exception):
+    def __init__(self, token: Token, message: str):
+        super().__init__(message)
+        self.issue = SyntaxIssue(token.line, token.column, message)
+
+
+class _Parser:
+    """Recursive descent over Pseudocode.g4; one method per grammar rule, returning avp_ast nodes."""
+
+    def __init__(self, tokens: List[Token]):
+        self.tokens = tokens
+        self.pos = 0
+
+    # -- helpers ---------------------------------------------------------
+
+    def la(self, offset: int = 0) -> str:
+        return self.tokens[min(self.pos + offset, len(self.tokens) - 1)].type
+
+    def node(self, cls, first: int, *values) -> Node:
+        """A node spanning tokens[first] through the last token consumed."""
+        token = self.tokens[first]
+        return cls(token.start, self.tokens[self.pos - 1].stop, token.line, token.column, *values)
+
+    def error(self, expecting: Optional[str] = None):
+        token = self.tokens[self.pos]
+        text = "<EOF>" if token.type == "EOF" else _display(token.text)
+        if expecting is None:
+            raise _SyntaxError(token, f"no viable alternative at input '{text}'")
+        raise _SyntaxError(token, f"mismatched input '{text}' expecting {expecting}")
+
+    def match(self, token_type: str) -> Token:
+        token = self.tokens[self.pos]
+        if token.type != token_type:
+            self.error(token_type)
+        self.pos += 1
+        return token
+
+    def operator(self) -> str:
+        self.pos += 1
+        return self.tokens[self.pos - 1].text
+
+    def skip_newlines(self) -> None:
+        while self.tokens[self.pos].type == "NL":
+            self.pos += 1
+
+    def newlines(self) -> None:
+        """NL+"""
+        self.match("NL")
+        self.skip_newlines()
+
+    def optional_semicolon(self) -> None:
+        if self.tokens[self.pos].type == "SEMICOLON":
+            self.pos += 1
+
+    # -- statements ------------------------------------------------------
+
+    def program(self, text: str) -> Program:
+        self.skip_newlines()
+        statements = [self.statement()]
+        self.statements_tail(statements)
+        self.match("EOF")
+        return Program(0, len(text) - 1, 1, 0, statements)
+
+    def statements_tail(self, statements: list) -> None:
+        """(NL+ statement)* NL*"""
+        while self.la() == "NL":
+            self.skip_newlines()
+            if self.la() not in _STATEMENT_START:
+                return
+            statements.append(self.statement())
+
+    def block(self) -> list:
+        """(statement (NL+ statement)*)? NL*"""
+        statements: list = []
+        if self.la() in _STATEMENT_START:
+            statements.append(self.statement())
+            self.statements_tail(statements)
+        self.skip_newlines()
+        return statements
+
+    def statement(self) -> Node:
+        first = self.pos
+        kind = self.la()
+        annotation = None
+        if kind == "AT":
+            annotation = self.annotation()
+            kind = self.la()
+            if kind not in ("ID", "IF", "WHILE", "RETURN", "BREAK"):
+                self.error()
+        if kind == "ID":
+            return self.id_statement(first, annotation)
+        if kind == "FUN":
+            return self.function_decl()
+        if kind == "FOR":
+            return self.for_loop()
+        if kind == "IF":
+            return self.if_statement(first, annotation)
+        if kind == "WHILE":
+            return self.while_loop(first, annotation)
+        if kind == "RETURN":
+            self.pos += 1
+            value = self.expression()
+            self.optional_semicolon()
+            return self.node(Return, first, value, annotation)
+        if kind == "BREAK":
+            self.pos += 1
+            self.optional_semicolon()
+            return self.node(Break, first, annotation)
+        self.error()
+
+    def id_statement(self, first: int, annotation: Optional[Annotation]) -> Node:
+        """assignment | functionCallStatement | compoundAssignment"""
+        if self.la(1) == "LPAREN":
+            call = self.call()
+            self.optional_semicolon()
+            return self.node(CallStatement, first, call, annotation)
+
+        target = self.lvalue()
+        kind = self.la()
+        if kind == "EQ":
+            op = self.operator()
+            value = self.array_initialization() if self.la() == "ARR" else self.expression()
+        elif kind in _COMPOUND_OPS:
+            op = self.operator()
+            value = self.expression()
+        else:
+            self.error()
+        self.optional_semicolon()
+        return self.node(Assign, first, target, op, value, annotation)
+
+    def lvalue(self) -> Node:
+        first = self.pos
+        name = self.match("ID").text
+        if self.la() == "LBRACK":
+            self.pos += 1
+            index = self.expression()
+            self.match("RBRACK")
+            return self.node(Index, first, name, index)
+        return self.node(Name, first, name)
+
+    def array_initialization(self) -> ArrayInit:
+        first = self.pos
+        self.match("ARR")
+        if self.la() == "LPAREN":
+            self.pos += 1
+            items = [self.expression()]
+            if self.la() == "COMMA":
+                self.pos += 1
+                items.append(self.expression())
+            self.match("RPAREN")
+            return self.node(ArrayInit, first, "size", items)
+        self.match("LBRACK")
+        items = [self.expression()]
+        kind = "values"
+        if self.la() == "TO":
+            self.pos += 1
+            items.append(self.expression())
+            kind = "range"
+        else:
+            while self.la() == "COMMA":
+                self.pos += 1
+                items.append(self.expression())
+        self.match("RBRACK")
+        return self.node(ArrayInit, first, kind, items)
+
+    def function_decl(self) -> Function:
+        first = self.pos
+        self.match("FUN")
+        name = self.match("ID").text
+        self.match("LPAREN")
+        params: List[Param] = []
+        if self.la() != "RPAREN":
+            params.append(self.annotated_param())
+            while self.la() == "COMMA":
+                self.pos += 1
+                params.append(self.annotated_param())
+        self.match("RPAREN")
+        self.match("COLON")
+        self.newlines()
+        body = self.block()
+        self.match("END")
+        self.match("FUN")
+        return self.node(Function, first, name, params, body)
+
+    def annotated_param(self) -> Param:
+        first = self.pos
+        annotation = self.annotation() if self.la() == "AT" else None
+        name = self.match("ID").text
+        return self.node(Param, first, name, annotation)
+
+    def annotation(self) -> Annotation:
+        first = self.pos
+        self.match("AT")
+        name = self.match("ID").text
+        self.match("LOW_THAN")
+        args = [self.annotation_arg()]
+        while self.la() == "COMMA":
+            self.pos += 1
+            args.append(self.annotation_arg())
+        self.match("GREATER_THAN")
+        return self.node(Annotation, first, name, args)
+
+    def annotation_arg(self) -> str:
+        if self.la() not in _ANNOTATION_ARGS:
+            self.error("{ID, STRING, INT}")
+        self.pos += 1
+        return self.tokens[self.pos - 1].text
+
+    def for_loop(self) -> Node:
+        first = self.pos
+        self.match("FOR")
+        annotation = self.annotation() if self.la() == "AT" else None
+        if self.la() == "ID":
+            variable = self.match("ID").text
+            self.match("IN")
+            iterable = self.match("ID").text
+            self.match("COLON")
+            self.newlines()
+            body = self.block()
+            self.match("END")
+            self.match("FOR")
+            return self.node(ForEach, first, variable, iterable, body, annotation)
+        if self.la() != "LPAREN":
+            self.error()
+        self.pos += 1
+        variable = self.match("ID").text
+        self.match("EQ")
+        init = self.expression()
+        self.for_separator()
+        condition = self.expression()
+        self.for_separator()
+        update = self.for_update()
+        self.match("RPAREN")
+        self.match("COLON")
+        self.newlines()
+        body = self.block()
+        self.match("END")
+        self.match("FOR")
+        return self.node(For, first, variable, init, condition, update, body, annotation)
+
+    def for_separator(self) -> None:
+        if self.la() not in ("COMMA", "SEMICOLON"):
+            self.error("{',', ';'}")
+        self.pos += 1
+
+    def for_update(self) -> Assign:
+        first = self.pos
+        self.match("ID")
+        target = self.node(Name, first, self.tokens[first].text)
+        if self.la() not in _COMPOUND_OPS:
+            self.error("{'+=', '-=', '*=', '/='}")
+        op = self.operator()
+        value = self.expression()
+        return self.node(Assign, first, target, op, value, None)
+
+    def condition_block(self) -> Tuple[Node, list]:
+        self.match("LPAREN")
+        condition = self.expression()
+        self.match("RPAREN")
+        self.match("COLON")
+        self.newlines()
+        return condition, self.block()
+
+    def if_statement(self, first: int, annotation: Optional[Annotation]) -> If:
+        self.match("IF")
+        test, body = self.condition_block()
+        tests, bodies = [test], [body]
+        while self.la() == "ELSE" and self.la(1) == "IF":
+            self.pos += 2
+            test, body = self.condition_block()
+            tests.append(test)
+            bodies.append(body)
+        orelse = None
+        if self.la() == "ELSE":
+            self.pos += 1
+            self.match("COLON")
+            self.newlines()
+            orelse = self.block()
+        self.match("END")
+        self.match("IF")
+        return self.node(If, first, tests, bodies, orelse, annotation)
+
+    def while_loop(self, first: int, annotation: Optional[Annotation]) -> While:
+        self.match("WHILE")
+        condition, body = self.condition_block()
+        self.match("END")
+        self.match("WHILE")
+        return self.node(While, first, condition, body, annotation)
+
+    # -- expressions -----------------------------------------------------
+    # A binary node spans the tokens of both operands, parentheses included.
+
+    def expression(self) -> Node:
+        first = self.pos
+        left = self.and_expression()
+        while self.la() == "OR":
+            op = self.operator()
+            left = self.node(BinaryOp, first, op, left, self.and_expression())
+        return left
+
+    def and_expression(self) -> Node:
+        first = self.pos
+        left = self.comparison()
+        while self.la() == "AND":
+            op = self.operator()
+            left = self.node(BinaryOp, first, op, left, self.comparison())
+        return left
+
+    def comparison(self) -> Node:
+        first = self.pos
+        left = self.additive()
+        if self.la() in _COMPARISON_OPS:
+            op = self.operator()
+            left = self.node(BinaryOp, first, op, left, self.additive())
+        return left
+
+    def additive(self) -> Node:
+        first = self.pos
+        left = self.multiplicative()
+        while self.la() in ("PLUS", "MINUS"):
+            op = self.operator()
+            left = self.node(BinaryOp, first, op, left, self.multiplicative())
+        return left
+
+    def multiplicative(self) -> Node:
+        first = self.pos
+        left = self.power()
+        while self.la() in ("STAR", "SLASH"):
+            op = self.operator()
+            left = self.node(BinaryOp, first, op, left, self.power())
+        return left
+
+    def power(self) -> Node:
+        first = self.pos
+        left = self.unary()
+        while self.la() == "POW":
+            op = self.operator()
+            left = self.node(BinaryOp, first, op, left, self.unary())
+        return left
+
+    def unary(self) -> Node:
+        if self.la() == "MINUS":
+            first = self.pos
+            self.pos += 1
+            return self.node(UnaryMinus, first, self.unary())
+        return self.primary()
+
+    def primary(self) -> Node:
+        first = self.pos
+        kind = self.la()
+        if kind == "LPAREN":
+            self.pos += 1
+            inner = self.expression()
+            self.match("RPAREN")
+            return inner
+        if kind == "ID":
+            following = self.la(1)
+            if following == "LPAREN":
+                return self.call()
+            self.pos += 1
+            if following == "LBRACK":
+                self.pos += 1
+                index = self.expression()
+                self.match("RBRACK")
+                return self.node(Index, first, self.tokens[first].text, index)
+            return self.node(Name, first, self.tokens[first].text)
+        if kind in _LITERALS:
+            self.pos += 1
+            return self.node(Literal, first, kind, self.tokens[first].text)
+        self.error()
+
+    def call(self) -> Call:
+        first = self.pos
+        name = self.match("ID").text
+        self.match("LPAREN")
+        args = []
+        if self.la() != "RPAREN":
+            args.append(self.expression())
+            while self.la() == "COMMA":
+                self.pos += 1
+                args.append(self.expression())
+        self.match("RPAREN")
+        return self.node(Call, first, name, args)
+
+
+def parse(text: str, source_file: Optional[str] = None) -> ParseResult:
+    """
+    Parse AVP source into an avp_ast Program and extract its functions.
+
+    Args:
+        text: AVP source code
+        source_file: Recorded on each chunk, as ingest does
+
+    Returns:
+        ParseResult with the function chunks and program (both empty/None
+        unless there are no errors) and "line L:C message" errors: every
+        lexer error plus the first syntax error
+    """
+    tokens, issues = tokenize(text)
+    parser = _Parser(tokens)
+    program = None
+    try:
+        program = parser.program(text)
+    except _SyntaxError as e:
+        issues.append(e.issue)
+    except RecursionError:
+        token = tokens[parser.pos]
+        issues.append(SyntaxIssue(token.line, token.column, "expression nested too deeply"))
+    if issues:
+        issues.sort(key=lambda issue: (issue.line, issue.column))
+        return ParseResult([], [str(issue) for issue in issues])
+    return ParseResult(function_chunks(program, text, source_file), [], program)
+
+
+def read_source(file_path: str) -> str:
+    """File contents decoded as ASCII, like ANTLR's FileStream."""
+    with open(file_path, "rb") as f:
+        return codecs.decode(f.read(), "ascii", "strict")
+
+
+def parse_file(file_path: str, source_file: Optional[str] = None) -> ParseResult:
+    return parse(read_source(file_path), source_file=source_file)
@@ -1,15 +1,64 @@
-from providers import call_llm, get_provider_name, is_provider_configured
+import math
+import os
+import re
+
+from compaction import compact_snippets, compaction_level
+from packing import (
+    get_token_counter,
+    output_token_budget,
+    pack_snippets,
+    reference_token_budget,
+    render_reference_block,
+)
+from deadline import Deadline
+from providers import (
+    CallOptions,
+    DeadlineExceeded,
+    call_llm,
+    get_provider_name,
+    is_provider_configured,
+    retry_after_hint,
+)
 from retrieve import retrieve_code
+from validation import ValidationResult, build_repair_prompt, extract_code, validate_code
+
+# Static instructions sent as the system message. Keep this byte-identical
+# across requests (no per-request values, no timestamps): vLLM's prefix cache
+# and Anthropic's prompt cache only reuse an exactly matching prefix. At about
+# 280 tokens it is below Anthropic's minimum cacheable length (1024 tokens), so
+# only vLLM benefits until it grows past that.
+SYSTEM_PROMPT = """You are an expert developer in the 'AVP' Pseudocode language.
+
+AVP language summary:
+- Functions: fun name(param1, param2): ... end fun
+- Blocks close with a matching end: end if, end while, end for, end fun
+- Conditionals: if (cond): ... else if (cond): ... else: ... end if
+- Loops: while (cond): ... end while
+         for item in collection: ... end for
+         for (i = 0, i < n, i += 1): ... end for
+- Arrays: arr[1, 2, 3], arr[1 to 10], arr(size) or arr(size, fill); index with a[i]
+- Operators: + - * / ** == < > <= >= and or; compound assignment += -= *= /=
+- Literals: integers, floats, "strings", True, False, Null
+- Comments start with //
+- Optional visualizer annotations prefix a statement or parameter:
+  @mark<var, highlight, yellow>, @log<warn, "message">, @init<table>
+
+Rules:
+1. Use strict 4-space indentation.
+2. Use 'fun name(args): ... end fun' syntax.
+3. Only use standard keywords (if, while, for, etc.) seen in the reference.
+4. Always include a function call after the function definition (e.g. result = function_name(args)).
+5. Do not explain, just output the code with detailed comments.
+"""
 
 
 def _build_prompt(user_request: str, context_snippets: list) -> str:
-    """Build the LLM prompt from retrieved snippets."""
-    reference_block = "".join(
-        f"\n// From file: {s['function_name']}\n{s['code']}\n" for s in context_snippets
-    )
-    return f"""
-You are an expert developer in the 'AVP' Pseudocode language.
-Here is the strict syntax definition based on existing codebase examples:
+    """Build the per-request user message (reference code + task).
+
+    Everything static lives in SYSTEM_PROMPT so the variable parts come last.
+    """
+    reference_block = render_reference_block(context_snippets)
+    return f"""Here is the strict syntax definition based on existing codebase examples:
 
 --- REFERENCE CODE START ---
 {reference_block}
@@ -17,31 +66,242 @@ Here is the strict syntax definition based on existing codebase examples:
 
 Using the syntax and style from the reference code above, write a new AVP function to solve this task:
 TASK: {user_request}
-
-Rules:
-1. Use strict 4-space indentation.
-2. Use 'fun name(args): ... end fun' syntax.
-3. Only use standard keywords (if, while, for, etc.) seen in the reference.
-4. Always include a function call after the function definition (e.g. result = function_name(args)).
-5. Do not explain, just output the code with detailed comments.
 """
 
 
-def generate_code(user_request: str, k: int = 2) -> dict:
-    """Core generation logic. Returns dict with generated_code, retrieved_functions, prompt."""
-    context_snippets = retrieve_code(user_request, k=k)
+def _pack_prompt(user_request: str, context_snippets: list) -> tuple[str, dict]:
+    """Compact the reference code, fit it into the token budget and build the user message.
 
-    if not context_snippets:
-        return {"generated_code": None, "retrieved_functions": [], "prompt": None}
+    Returns the prompt and usage stats: counted_prompt_tokens (system + user,
+    by our tokenizer), compaction_tokens_saved, reference_tokens,
+    snippets_truncated, snippets_dropped, and max_output_tokens (the output
+    limit derived from the uncompacted reference functions, 0 if none).
+    """
+    count_tokens = get_token_counter()
+    compacted, compaction = compact_snippets(context_snippets, compaction_level(), count_tokens)
+    packed, stats = pack_snippets(compacted, reference_token_budget(), count_tokens)
+    prompt = _build_prompt(user_request, packed)
+    stats["compaction_tokens_saved"] = compaction["original_tokens"] - compaction["compacted_tokens"]
+    stats["counted_prompt_tokens"] = count_tokens(SYSTEM_PROMPT) + count_tokens(prompt)
+    stats["max_output_tokens"] = output_token_budget(context_snippets, count_tokens) or 0
+    return prompt, stats
+
+
+_WORD_RE = re.compile(r"[A-Z]?[a-z]+|[A-Z]+(?![a-z])|\d+")
+
+
+def _words(text: str) -> list[str]:
+    """Lowercased words, splitting snake_case and camelCase."""
+    return [w.lower() for w in _WORD_RE.findall(text)]
+
+
+# Request words that say how to answer rather than what to compute.
+_REQUEST_STOP_WORDS = frozenset(
+    "a an and the of in on for to from with using that which is are by into "
+    "write create implement make give me please function program code algorithm avp pseudocode".split()
+)
 
-    prompt = _build_prompt(user_request, context_snippets)
-    generated_code = call_llm(prompt)
 
-    return {
-        "generated_code": generated_code,
+def _prefix_match(a: str, b: str) -> bool:
+    return a.startswith(b) or b.startswith(a)
+
+
+def _name_match(function_name: str, user_request: str) -> float:
+    """How well a function name and a request describe the same thing, 0.0 to 1.0.
+
+    The smaller of two fractions: the name's words found in the request, and
+    the request's content words (stop words dropped) found in the name. Words
+    match when one is a prefix of the other, so "max_value" matches "maximum
+    value" and "Insertion_Sort" matches "insertion sorting"; but a request with
+    extra qualifiers, such as "insertion sort in descending order", does not
+    match "Insertion_Sort".
+    """
+    name_words = _words(function_name)
+    request_words = [w for w in _words(user_request) if w not in _REQUEST_STOP_WORDS]
+    if not name_words or not request_words:
+        return 0.0
+    name_hits = sum(any(_prefix_match(r, n) for r in request_words) for n in name_words)
+    request_hits = sum(any(_prefix_match(r, n) for n in name_words) for r in request_words)
+    return min(name_hits / len(name_words), request_hits / len(request_words))
+
+
+def _result(context_snippets: list, **fields) -> dict:
+    """A generate_code result dict: defaults for every key, overridden by ``fields``."""
+    result = {
+        "generated_code": None,
         "retrieved_functions": context_snippets,
-        "prompt": prompt,
+        "prompt": None,
+        "system_prompt": SYSTEM_PROMPT,
+        "source": "llm",
+        "valid": None,
+        "validation_errors": [],
+        "repairs": 0,
+        "usage": {},
+        "degraded": False,
+        "partial": False,
+        "deadline_notes": [],
     }
+    result.update(fields)
+    return result
+
+
+def _knowledge_base_answer(user_request: str, context_snippets: list) -> dict | None:
+    """Return the top retrieved function if it already answers the request.
+
+    The top hit must clear KB_SHORTCIRCUIT_NAME_MATCH (see _name_match) and
+    KB_SHORTCIRCUIT_MIN_SCORE if the reranker scored it, else
+    KB_SHORTCIRCUIT_MIN_SIMILARITY (cosine similarity: reranker disabled, or
+    skipped under a deadline). Disabled with KB_SHORTCIRCUIT=false.
+    """
+    if os.environ.get("KB_SHORTCIRCUIT", "true").lower() != "true":
+        return None
+    top = context_snippets[0]
+    if "rerank_score" in top:
+        score = top["rerank_score"]
+        min_score = float(os.environ.get("KB_SHORTCIRCUIT_MIN_SCORE", "2.0"))
+    else:
+        score = top["score"]
+        min_score = float(os.environ.get("KB_SHORTCIRCUIT_MIN_SIMILARITY", "0.75"))
+    min_match = float(os.environ.get("KB_SHORTCIRCUIT_NAME_MATCH", "1.0"))
+    if score < min_score or _name_match(top["function_name"], user_request) < min_match:
+        return None
+    validation = validate_code(top["code"])
+    return _result(
+        context_snippets,
+        generated_code=top["code"],
+        source="knowledge_base",
+        valid=validation.valid,
+        validation_errors=validation.errors,
+    )
+
+
+def _add_provider_usage(usage: dict, provider_usage: dict) -> None:
+    # Repair calls are extra requests; their prompt tokens add up.
+    for key, value in provider_usage.items():
+        usage[key] = usage.get(key, 0) + value
+
+
+def _generate_valid_code(
+    prompt: str, usage: dict, deadline: Deadline | None = None
+) -> tuple[str, ValidationResult, int]:
+    """Call the LLM and parse its reply, asking for up to GENERATION_MAX_REPAIRS fixes.
+
+    Returns (code, validation result of the final code, repairs attempted).
+    No repair is attempted once the request deadline has passed.
+    """
+    max_repairs = int(os.environ.get("GENERATION_MAX_REPAIRS", "1"))
+    max_tokens = usage.get("max_output_tokens") or None
+    options = CallOptions(system=SYSTEM_PROMPT, max_tokens=max_tokens, deadline=deadline)
+    code = extract_code(call_llm(prompt, options))
+    _add_provider_usage(usage, options.usage)
+    validation = validate_code(code)
+
+    repairs = 0
+    while not validation.valid and repairs < max_repairs:
+        if deadline is not None and deadline.expired:
+            deadline.note("repair_skipped")
+            break
+        repairs += 1
+        options = CallOptions(system=SYSTEM_PROMPT, max_tokens=max_tokens, deadline=deadline)
+        reply = call_llm(build_repair_prompt(prompt, code, validation.errors), options)
+        _add_provider_usage(usage, options.usage)
+        code = extract_code(reply)
+        validation = validate_code(code)
+    return code, validation, repairs
+
+
+def degraded_mode_enabled() -> bool:
+    return os.environ.get("GENERATION_DEGRADED_MODE", "true").lower() == "true"
+
+
+def degraded_result(context_snippets: list, reason: str, usage: dict | None = None) -> dict:
+    """Retrieval-only result returned when the LLM cannot be used right now."""
+    default_s = float(os.environ.get("GENERATION_DEGRADED_RETRY_AFTER_S", "30"))
+    return _result(
+        context_snippets,
+        source="knowledge_base",
+        usage=usage or {},
+        degraded=True,
+        degraded_reason=reason,
+        retry_after=math.ceil(retry_after_hint(default_s)),
+    )
+
+
+def _partial_result(context_snippets: list, deadline: Deadline, usage: dict | None = None) -> dict:
+    """Retrieval-only result returned when the request deadline is blown."""
+    deadline.note("generation_skipped")
+    return _result(
+        context_snippets,
+        source="knowledge_base",
+        usage=usage or {},
+        partial=True,
+        deadline_notes=deadline.notes,
+    )
+
+
+def answer_without_llm(user_request: str, context_snippets: list) -> dict | None:
+    """The result when the request needs no LLM call, else None.
+
+    That is when nothing was retrieved, or when the top retrieved function
+    already answers the request (see _knowledge_base_answer).
+    """
+    if not context_snippets:
+        return _result([])
+    return _knowledge_base_answer(user_request, context_snippets)
+
+
+def generate_code(user_request: str, k: int = 2, deadline: Deadline | None = None) -> dict:
+    """Core generation logic: retrieve k reference functions, then generate_from_context."""
+    return generate_from_context(
+        user_request, retrieve_code(user_request, k=k, deadline=deadline), deadline
+    )
+
+
+def generate_from_context(
+    user_request: str, context_snippets: list, deadline: Deadline | None = None
+) -> dict:
+    """Generation stage, given the already retrieved reference functions.
+
+    Returns dict with generated_code, retrieved_functions, prompt, system_prompt,
+    source ("llm", or "knowledge_base" when the top retrieved function is
+    returned as is), valid / validation_errors / repairs (grammar check of the generated code and
+    how many repair requests it took), and usage (prompt token counts, packing
+    stats, and how many prompt tokens were served from the provider's prefix cache).
+
+    If every provider fails and GENERATION_DEGRADED_MODE is on, the retrieved
+    functions are returned without code, with degraded=True, degraded_reason and
+    retry_after (seconds) instead of raising. If the request ``deadline`` runs
+    out first, they are returned with partial=True; deadline_notes lists what
+    was cut short.
+    """
+    answer = answer_without_llm(user_request, context_snippets)
+    if answer is not None:
+        return answer
+
+    if deadline is not None and deadline.expired:
+        return _partial_result(context_snippets, deadline)
+
+    prompt, usage = _pack_prompt(user_request, context_snippets)
+    try:
+        generated_code, validation, repairs = _generate_valid_code(prompt, usage, deadline)
+    except Exception as e:
+        if deadline is not None and isinstance(e, DeadlineExceeded):
+            return _partial_result(context_snippets, deadline, usage)
+        if not degraded_mode_enabled():
+            raise
+        print(f"LLM generation failed, returning retrieved functions only: {e}")
+        return degraded_result(context_snippets, f"LLM unavailable: {e}", usage)
+
+    return _result(
+        context_snippets,
+        generated_code=generated_code,
+        prompt=prompt,
+        valid=validation.valid,
+        validation_errors=validation.errors,
+        repairs=repairs,
+        usage=usage,
+        deadline_notes=deadline.notes if deadline is not None else [],
+    )
 
 
 def _print_simulation_help(provider: str) -> None:
@@ -64,12 +324,21 @@ def generate_solution(user_request):
         print("No relevant code found in knowledge base.")
         return None
 
-    prompt = _build_prompt(user_request, context_snippets)
+    prompt, stats = _pack_prompt(user_request, context_snippets)
     print("\n" + "=" * 60)
     print("      GENERATED PROMPT (What gets sent to the LLM)")
     print("=" * 60)
+    print("[system]")
+    print(SYSTEM_PROMPT)
+    print("[user]")
     print(prompt)
     print("=" * 60)
+    print(
+        f"Prompt tokens: {stats['counted_prompt_tokens']} "
+        f"(reference: {stats['reference_tokens']}/{reference_token_budget()}, "
+        f"saved by compaction: {stats['compaction_tokens_saved']}, "
+        f"truncated: {stats['snippets_truncated']}, dropped: {stats['snippets_dropped']})"
+    )
 
     if not is_provider_configured():
         _print_simulation_help(get_provider_name())
@@ -81,13 +350,32 @@ def generate_solution(user_request):
         print(f"\nError: {e}")
         return None
 
-    print(f"\nCalling {get_provider_name()} provider...")
+    if result["degraded"]:
+        print(f"\n{result['degraded_reason']} (retry after {result['retry_after']}s)")
+        return None
+
+    if result["source"] == "knowledge_base":
+        print(f"\nServed from the knowledge base: {result['retrieved_functions'][0]['function_name']}")
+    else:
+        print(f"\nCalling {get_provider_name()} provider...")
 
     print("\n" + "=" * 60)
     print("      GENERATED CODE")
     print("=" * 60)
     print(result["generated_code"])
     print("=" * 60)
+    if result["valid"]:
+        print(f"Valid AVP (repairs: {result['repairs']})")
+    else:
+        print(f"WARNING: output does not parse after {result['repairs']} repair(s):")
+        for error in result["validation_errors"]:
+            print(f"  - {error}")
+    usage = result["usage"]
+    if usage:
+        print(
+            f"Prompt tokens: {usage.get('prompt_tokens', 0)} "
+            f"(prefill saved by prefix cache: {usage.get('cached_prompt_tokens', 0)})"
+        )
     return result["generated_code"]
 
 
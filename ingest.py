@@ -1,21 +1,30 @@
+import argparse
+import hashlib
 import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Mapping, Optional, Tuple
 
-from antlr4 import CommonTokenStream, FileStream
+from antlr4 import CommonTokenStream, InputStream
 
 from PseudocodeLexer import PseudocodeLexer
 from PseudocodeParser import PseudocodeParser
 from PseudocodeVisitor import PseudocodeVisitor
+import fastparse
+from ast_cache import AstCache, ast_cache_enabled
+from avp_ast import build_ast, function_chunks
+from kb_store import default_kb_path
+from parsing import parse_program
 from tracking import (
+    current_hash,
     detect_changed_files,
-    load_existing_chunks,
     load_metadata,
     remove_deleted_from_metadata,
-    save_with_metadata,
+    update_knowledge_base,
     update_metadata,
 )
 
 
-# This class defines HOW we extract data from the code
+# Extracts functions from parse trees with syntax errors (valid files go through avp_ast)
 class CodeStructureVisitor(PseudocodeVisitor):
     def __init__(self, source_file=None):
         self.functions = []
@@ -45,38 +54,188 @@ class CodeStructureVisitor(PseudocodeVisitor):
         return self.visitChildren(ctx)
 
 
-def parse_file(file_path, source_file=None):
-    lexer = PseudocodeLexer(FileStream(file_path))
-    parser = PseudocodeParser(CommonTokenStream(lexer))
+def parse_source(text, frontend=None):
+    """
+    Parse AVP source once, with the configured front end.
 
-    # Parse the 'program' rule
-    tree = parser.program()
+    Returns:
+        Tuple of (avp_ast.Program, None) for valid source, or (None, ANTLR
+        parse tree) when it has syntax errors; ANTLR reports those and
+        recovers what it can.
+    """
+    # The hand-written front end (PARSER_FRONTEND=fast) builds the same AST;
+    # on a syntax error fall through so ANTLR reports and recovers as before.
+    if (frontend or fastparse.frontend()) == "fast":
+        program = fastparse.parse(text).program
+        if program is not None:
+            return program, None
 
-    visitor = CodeStructureVisitor(source_file=source_file)
-    visitor.visit(tree)
+    lexer = PseudocodeLexer(InputStream(text))
+    parser = PseudocodeParser(CommonTokenStream(lexer))
 
+    # Parse the 'program' rule (SLL first, full LL only if needed)
+    tree = parse_program(parser)
+    if parser.getNumberOfSyntaxErrors():
+        return None, tree
+    return build_ast(tree, text), None
+
+
+def parse_file(file_path, source_file=None, frontend=None, cache=None, file_hash=None):
+    """
+    Extract the function chunks of an AVP file.
+
+    Args:
+        file_path: File to parse
+        source_file: Recorded on each chunk
+        frontend: "antlr" or "fast" (default PARSER_FRONTEND)
+        cache: An ast_cache.AstCache that serves and stores results by content
+        file_hash: The file's SHA256 if already known (tracking.current_hash),
+                   so a cache hit doesn't read the file at all
+
+    Returns:
+        List of chunk dicts, one per function (nested ones included)
+    """
+    data = None
+    if cache is not None:
+        if file_hash is None:
+            data = _read_bytes(file_path)
+            file_hash = hashlib.sha256(data).hexdigest()
+        chunks = cache.get_chunks(file_hash, source_file)
+        if chunks is not None:
+            return chunks
+    if data is None:
+        data = _read_bytes(file_path)
+
+    text = data.decode("ascii")  # as ANTLR's FileStream does
+    program, recovered = parse_source(text, frontend=frontend)
+    if program is not None:
+        chunks = function_chunks(program, text, source_file=source_file)
+        if cache is not None:
+            # Keyed by the bytes actually parsed (the same digest as
+            # tracking.compute_file_hash), in case the file changed after hashing.
+            cache.put(hashlib.sha256(data).hexdigest(), chunks, program)
+        return chunks
+
+    # Keep the functions ANTLR's error recovery managed to parse
+    visitor = CodeStructureVisitor(source_file=source_file)
+    visitor.visit(recovered)
     return visitor.functions
 
 
-def _print_file_list(label: str, files: list) -> None:
+def _read_bytes(file_path):
+    with open(file_path, "rb") as f:
+        return f.read()
+
+
+ParseResult = Tuple[str, List[Dict], Optional[str]]
+
+
+def _parse_one(
+    path: str, file_hash: Optional[str] = None, cache: Optional[AstCache] = None
+) -> ParseResult:
+    """Parse one file for parse_files; errors are returned, not raised, so one
+    bad file doesn't take down a worker's whole chunk."""
+    try:
+        return path, parse_file(path, source_file=path, cache=cache, file_hash=file_hash), None
+    except Exception as e:
+        return path, [], str(e)
+
+
+def ingest_workers() -> int:
+    return int(os.environ.get("INGEST_WORKERS", "0")) or os.cpu_count() or 1
+
+
+def parse_files(
+    paths: List[str],
+    workers: Optional[int] = None,
+    serial: bool = False,
+    chunksize: Optional[int] = None,
+    cache: Optional[AstCache] = None,
+    hashes: Optional[Mapping[str, str]] = None,
+) -> List[ParseResult]:
+    """
+    Parse many files, in a process pool unless serial.
+
+    The ANTLR Python runtime is pure Python and CPU-bound, so threads don't
+    help; each worker process parses a chunk of files at a time.
+
+    Args:
+        paths: Files to parse
+        workers: Worker processes (default INGEST_WORKERS, else CPU count)
+        serial: Parse in this process instead (for debugging)
+        chunksize: Files handed to a worker per task (default spreads the
+                   files over about 4 tasks per worker)
+        cache: AstCache consulted before parsing and filled after
+        hashes: Known SHA256 per path, used as cache keys
+
+    Returns:
+        (path, chunks, error) per file, in the order of ``paths``; error is
+        None on success
+    """
+    file_hashes = [(hashes or {}).get(p) for p in paths]
+    workers = workers or ingest_workers()
+    if serial or workers <= 1 or len(paths) <= 1:
+        return [_parse_one(p, h, cache) for p, h in zip(paths, file_hashes)]
+
+    workers = min(workers, len(paths))
+    if chunksize is None:
+        chunksize = max(1, len(paths) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # map() yields results in submission order, so output is deterministic.
+        return list(
+            pool.map(_parse_one, paths, file_hashes, [cache] * len(paths), chunksize=chunksize)
+        )
+
+
+def _print_file_list(label: str, files: list, root: str) -> None:
     print(f"\n{label}: {len(files)}")
     for f in files:
-        print(f"  - {os.path.basename(f)}")
+        print(f"  - {os.path.relpath(f, root)}")
 
 
 # Main Execution
 if __name__ == "__main__":
-    data_folder = "./data"
-    kb_path = "code_knowledge_base.json"
+    arg_parser = argparse.ArgumentParser(description="Parse AVP files into the knowledge base.")
+    arg_parser.add_argument("--data", default="./data", help="corpus root, searched recursively")
+    arg_parser.add_argument(
+        "--kb",
+        default=default_kb_path(),
+        help="knowledge base: a store directory, a *.sqlite database or a single *.json file"
+        " (default: KB_PATH)",
+    )
+    arg_parser.add_argument(
+        "--workers", type=int, default=None, help="parser processes (default: INGEST_WORKERS or CPU count)"
+    )
+    arg_parser.add_argument(
+        "--serial",
+        action="store_true",
+        default=os.environ.get("INGEST_SERIAL", "").lower() == "true",
+        help="parse in the main process (debugging)",
+    )
+    arg_parser.add_argument(
+        "--no-cache",
+        dest="cache",
+        action="store_false",
+        default=ast_cache_enabled(),
+        help="parse every changed file instead of reusing cached results (default: AST_CACHE)",
+    )
+    arg_parser.add_argument(
+        "--include", action="append", default=None, help="file glob to ingest (repeatable; default *.avp)"
+    )
+    arg_parser.add_argument(
+        "--exclude", action="append", default=None, help="file or directory glob to skip (repeatable)"
+    )
+    args = arg_parser.parse_args()
+    data_folder = args.data
+    kb_path = args.kb
 
     print("=" * 60)
     print("AVP Code Ingestion with Change Tracking")
     print("=" * 60)
 
-    # Load existing metadata and chunks
+    # Load existing metadata; chunks of unchanged files are left where they are
     print("\nLoading existing knowledge base...")
     metadata = load_metadata(kb_path)
-    existing_chunks = load_existing_chunks(kb_path)
 
     if metadata.get("last_ingestion"):
         print(f"Last ingestion: {metadata['last_ingestion']}")
@@ -85,45 +244,43 @@ if __name__ == "__main__":
         print("No previous ingestion found. Will process all files.")
 
     # Detect changed files
-    print(f"\nScanning {data_folder} for .avp files...")
-    changed_files, unchanged_files, deleted_files = detect_changed_files(data_folder, metadata)
+    print(f"\nScanning {data_folder} recursively...")
+    changed_files, unchanged_files, deleted_files, detected = detect_changed_files(
+        data_folder, metadata, include=args.include, exclude=args.exclude
+    )
 
-    _print_file_list("Changed files", changed_files)
-    _print_file_list("Unchanged files", unchanged_files)
-    _print_file_list("Deleted files", deleted_files)
+    _print_file_list("Changed files", changed_files, data_folder)
+    _print_file_list("Unchanged files", unchanged_files, data_folder)
+    _print_file_list("Deleted files", deleted_files, data_folder)
 
     # Remove deleted files from metadata
     if deleted_files:
         print(f"\nRemoving {len(deleted_files)} deleted file(s) from metadata...")
         metadata = remove_deleted_from_metadata(metadata, deleted_files)
 
-    # Start with existing chunks, but remove chunks from changed/deleted files
-    excluded_files = set(changed_files) | set(deleted_files)
-    all_code_chunks = []
-    if existing_chunks:
-        print(f"\nPreserving {len(existing_chunks)} existing chunks...")
-        all_code_chunks = [c for c in existing_chunks if c.get("source_file") not in excluded_files]
-        print(f"Preserved {len(all_code_chunks)} chunks from unchanged files.")
-
     # Process changed files
+    updated_chunks: Dict[str, List[Dict]] = {}
     failed_files = []
     if changed_files:
-        print(f"\nProcessing {len(changed_files)} changed file(s)...")
-        for full_path in changed_files:
-            filename = os.path.basename(full_path)
-            print(f"  Parsing {filename}...")
-
-            try:
-                chunks = parse_file(full_path, source_file=full_path)
-                all_code_chunks.extend(chunks)
-
-                function_names = [chunk["name"] for chunk in chunks]
-                metadata = update_metadata(metadata, full_path, function_names)
-
-                print(f"    Extracted {len(chunks)} function(s): {', '.join(function_names)}")
-            except Exception as e:
-                failed_files.append((full_path, str(e)))
-                print(f"    ERROR: Failed to parse {filename}: {e}")
+        mode = "serially" if args.serial else f"with up to {args.workers or ingest_workers()} worker(s)"
+        print(f"\nProcessing {len(changed_files)} changed file(s) {mode}...")
+        cache = AstCache() if args.cache else None
+        if cache is not None:
+            print(f"Reusing parse results from {cache.root}")
+        # Hashes from change detection key the cache, so hits aren't even read
+        hashes = {path: current_hash(path, detected) for path in changed_files} if cache is not None else None
+        results = parse_files(changed_files, args.workers, args.serial, cache=cache, hashes=hashes)
+        for full_path, chunks, error in results:
+            filename = os.path.relpath(full_path, data_folder)
+            if error is not None:
+                failed_files.append((full_path, error))
+                print(f"  ERROR: Failed to parse {filename}: {error}")
+                continue
+
+            updated_chunks[full_path] = chunks
+            function_names = [chunk["name"] for chunk in chunks]
+            metadata = update_metadata(metadata, full_path, function_names, detected)
+            print(f"  {filename}: {len(chunks)} function(s): {', '.join(function_names)}")
     else:
         print("\nNo files changed. Knowledge base is up to date.")
 
@@ -131,14 +288,16 @@ if __name__ == "__main__":
     if failed_files:
         print(f"\nWARNING: {len(failed_files)} file(s) failed to parse:")
         for path, error in failed_files:
-            print(f"  - {os.path.basename(path)}: {error}")
+            print(f"  - {os.path.relpath(path, data_folder)}: {error}")
 
-    # Save with metadata wrapper
-    print("\nSaving knowledge base...")
-    save_with_metadata(all_code_chunks, metadata, kb_path)
+    # Replace changed files' chunks; files that failed to parse lose theirs,
+    # and keep their old hash so they are retried next time.
+    print(f"\nSaving knowledge base to {kb_path}...")
+    removed_files = set(deleted_files) | {path for path, _ in failed_files}
+    total_chunks = update_knowledge_base(kb_path, metadata, updated_chunks, removed_files)
 
     print("=" * 60)
-    print(f"Successfully indexed {len(all_code_chunks)} code blocks")
+    print(f"Successfully indexed {total_chunks} code blocks")
     print(f"Tracking method: {metadata.get('tracking_method', 'hash')}")
     print(f"Total source files: {len(metadata.get('source_files', {}))}")
     print("=" * 60)
@@ -0,0 +1,414 @@
+"""
+Knowledge base storage backends.
+
+The original format is one indented JSON document, which every ingest reads
+and rewrites whole. The sharded store keeps one JSONL segment per source file
+plus a small manifest, so an ingest only rewrites the segments of files that
+changed and readers stream chunks a segment at a time.
+
+The backend is picked from the path: ``*.json`` is the single-file format,
+``*.sqlite`` an SQLite database, anything else a sharded store directory::
+
+    code_knowledge_base/
+        manifest.json          # tracking metadata + source file -> segment
+        segments/<sha1>.jsonl  # one chunk per line
+
+Every file is written to a temporary name and renamed into place, and the
+manifest is written after the segments it references, so an interrupted
+ingest never leaves a half-written file behind. The SQLite store gets the same
+guarantee from transactions, and adds indexed lookups and an embedding cache.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+from typing import IO, Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence
+
+DEFAULT_KB_PATH = "code_knowledge_base"
+MANIFEST = "manifest.json"
+SEGMENTS = "segments"
+FORMAT_VERSION = 1
+
+
+def default_kb_path() -> str:
+    return os.environ.get("KB_PATH", DEFAULT_KB_PATH)
+
+
+def empty_metadata() -> Dict:
+    return {
+        "last_ingestion": None,
+        "tracking_method": "hash",
+        "source_files": {},
+    }
+
+
+def content_hash(code: str) -> str:
+    return hashlib.sha256(code.encode("utf-8")).hexdigest()
+
+
+def _project(chunks: Iterable[Dict], columns: Optional[Sequence[str]]) -> Iterator[Dict]:
+    if columns is None:
+        yield from chunks
+    else:
+        for chunk in chunks:
+            yield {c: chunk[c] for c in columns if c in chunk}
+
+
+def atomic_write(path: str, write: Callable[[IO[str]], None]) -> None:
+    """Write via ``write(f)`` to a temp file next to ``path``, then rename over it."""
+    tmp = f"{path}.tmp-{os.getpid()}"
+    try:
+        with open(tmp, "w", encoding="utf-8") as f:
+            write(f)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+class JsonStore:
+    """Single JSON document: ``{"metadata": ..., "chunks": [...]}`` or a legacy bare list."""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def exists(self) -> bool:
+        return os.path.exists(self.path)
+
+    def _read(self):
+        if not self.exists():
+            return None
+        with open(self.path, "r") as f:
+            return json.load(f)
+
+    def load_metadata(self) -> Dict:
+        data = self._read()
+        if isinstance(data, dict) and "metadata" in data:
+            return data["metadata"]
+        # Missing file, legacy list format, or unknown format
+        return empty_metadata()
+
+    def iter_chunks(self, columns: Optional[Sequence[str]] = None) -> Iterator[Dict]:
+        data = self._read()
+        if data is None:
+            return
+        if isinstance(data, list):
+            # Old format - direct array
+            yield from _project(data, columns)
+        elif isinstance(data, dict) and "chunks" in data:
+            yield from _project(data["chunks"], columns)
+        else:
+            raise ValueError(f"Unknown knowledge base format in {self.path}")
+
+    def count(self) -> int:
+        return sum(1 for _ in self.iter_chunks())
+
+    def save(self, chunks: List[Dict], metadata: Dict) -> int:
+        atomic_write(self.path, lambda f: json.dump({"metadata": metadata, "chunks": chunks}, f, indent=4))
+        return len(chunks)
+
+    def update(
+        self, metadata: Dict, updated: Mapping[str, List[Dict]], removed: Iterable[str] = ()
+    ) -> int:
+        replaced = set(updated) | set(removed)
+        chunks = [c for c in self.iter_chunks() if c.get("source_file") not in replaced]
+        for file_chunks in updated.values():
+            chunks.extend(file_chunks)
+        return self.save(chunks, metadata)
+
+
+class ShardedStore:
+    """Directory of per-source-file JSONL segments plus a manifest."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._manifest: Optional[Dict] = None
+
+    @property
+    def _manifest_path(self) -> str:
+        return os.path.join(self.path, MANIFEST)
+
+    def _segment_path(self, name: str) -> str:
+        return os.path.join(self.path, SEGMENTS, name)
+
+    @staticmethod
+    def segment_name(source_file: str) -> str:
+        return hashlib.sha1(source_file.encode("utf-8")).hexdigest()[:20] + ".jsonl"
+
+    def exists(self) -> bool:
+        return os.path.exists(self._manifest_path)
+
+    def _read_manifest(self) -> Dict:
+        if self._manifest is None:
+            if self.exists():
+                with open(self._manifest_path, "r") as f:
+                    self._manifest = json.load(f)
+            else:
+                self._manifest = {"format": FORMAT_VERSION, "metadata": empty_metadata(), "segments": {}}
+        return self._manifest
+
+    def load_metadata(self) -> Dict:
+        return self._read_manifest()["metadata"]
+
+    def count(self) -> int:
+        return sum(seg["chunks"] for seg in self._read_manifest()["segments"].values())
+
+    def iter_chunks(self, columns: Optional[Sequence[str]] = None) -> Iterator[Dict]:
+        for seg in self._read_manifest()["segments"].values():
+            with open(self._segment_path(seg["file"]), "r", encoding="utf-8") as f:
+                lines = (json.loads(line) for line in f if line.strip())
+                yield from _project(lines, columns)
+
+    def update(
+        self, metadata: Dict, updated: Mapping[str, List[Dict]], removed: Iterable[str] = ()
+    ) -> int:
+        """Replace the chunks of ``updated`` files and drop those of ``removed`` ones.
+
+        Only the affected segments are touched; returns the total chunk count.
+        """
+        os.makedirs(os.path.join(self.path, SEGMENTS), exist_ok=True)
+        segments = dict(self._read_manifest()["segments"])
+
+        for source_file, chunks in updated.items():
+            name = self.segment_name(source_file)
+            atomic_write(
+                self._segment_path(name),
+                lambda f, chunks=chunks: f.writelines(json.dumps(c) + "\n" for c in chunks),
+            )
+            segments[source_file] = {"file": name, "chunks": len(chunks)}
+        stale = [segments.pop(source_file)["file"] for source_file in removed if source_file in segments]
+
+        manifest = {"format": FORMAT_VERSION, "metadata": metadata, "segments": segments}
+        atomic_write(self._manifest_path, lambda f: json.dump(manifest, f))
+        self._manifest = manifest
+
+        # Unreferenced once the manifest is in place.
+        for name in stale:
+            try:
+                os.remove(self._segment_path(name))
+            except FileNotFoundError:
+                pass
+        return self.count()
+
+    def save(self, chunks: List[Dict], metadata: Dict) -> int:
+        by_file: Dict[str, List[Dict]] = {}
+        for chunk in chunks:
+            by_file.setdefault(chunk.get("source_file") or "", []).append(chunk)
+        removed = [f for f in self._read_manifest()["segments"] if f not in by_file]
+        return self.update(metadata, by_file, removed)
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS files (
+    source_file TEXT PRIMARY KEY,
+    hash TEXT,
+    mtime REAL,
+    size INTEGER,
+    functions TEXT NOT NULL DEFAULT '[]'
+);
+CREATE TABLE IF NOT EXISTS chunks (
+    id INTEGER PRIMARY KEY,
+    source_file TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    type TEXT,
+    name TEXT,
+    parameters TEXT NOT NULL DEFAULT '[]',
+    code_content TEXT,
+    content_hash TEXT
+);
+CREATE INDEX IF NOT EXISTS chunks_source_file ON chunks (source_file, position);
+CREATE INDEX IF NOT EXISTS chunks_name ON chunks (name);
+CREATE INDEX IF NOT EXISTS chunks_content_hash ON chunks (content_hash);
+CREATE TABLE IF NOT EXISTS embeddings (
+    content_hash TEXT NOT NULL,
+    model TEXT NOT NULL,
+    vector BLOB NOT NULL,
+    PRIMARY KEY (content_hash, model)
+);
+"""
+
+# Chunk keys stored as columns; parameters is JSON-encoded.
+_CHUNK_COLUMNS = ("type", "name", "parameters", "code_content", "source_file", "content_hash")
+
+# Hashes per IN (...) query; older SQLite builds allow 999 host parameters.
+_MAX_SQL_PARAMS = 900
+
+
+class SqliteStore:
+    """SQLite database with files, chunks and embeddings tables.
+
+    Each file's chunks are replaced in one transaction, lookups by source file,
+    name or content hash use indexes, and ``iter_chunks(columns=...)`` selects
+    only the requested columns.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def exists(self) -> bool:
+        return os.path.exists(self.path)
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path)
+            # WAL lets the API read while an ingest is writing.
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(_SCHEMA)
+        return self._conn
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def load_metadata(self) -> Dict:
+        if not self.exists():
+            return empty_metadata()
+        metadata = empty_metadata()
+        metadata.update({k: json.loads(v) for k, v in self.conn.execute("SELECT key, value FROM meta")})
+        for source_file, file_hash, mtime, size, functions in self.conn.execute(
+            "SELECT source_file, hash, mtime, size, functions FROM files"
+        ):
+            metadata["source_files"][source_file] = {
+                "hash": file_hash,
+                "mtime": mtime,
+                "size": size,
+                "functions": json.loads(functions),
+            }
+        return metadata
+
+    def count(self) -> int:
+        if not self.exists():
+            return 0
+        return self.conn.execute("SELECT COUNT(*) FROM chunks").fetchone()[0]
+
+    def _rows_to_chunks(self, columns: Sequence[str], rows) -> Iterator[Dict]:
+        for row in rows:
+            chunk = dict(zip(columns, row))
+            if "parameters" in chunk:
+                chunk["parameters"] = json.loads(chunk["parameters"])
+            yield chunk
+
+    def _select(self, columns: Optional[Sequence[str]], where: str = "", args: Sequence = ()):
+        columns = [c for c in (columns or _CHUNK_COLUMNS) if c in _CHUNK_COLUMNS]
+        rows = self.conn.execute(
+            f"SELECT {', '.join(columns)} FROM chunks {where} ORDER BY source_file, position", args
+        )
+        return self._rows_to_chunks(columns, rows)
+
+    def iter_chunks(self, columns: Optional[Sequence[str]] = None) -> Iterator[Dict]:
+        if not self.exists():
+            return iter(())
+        return self._select(columns)
+
+    def find_by_name(self, name: str, columns: Optional[Sequence[str]] = None) -> List[Dict]:
+        return list(self._select(columns, "WHERE name = ?", (name,)))
+
+    def chunks_for_file(self, source_file: str, columns: Optional[Sequence[str]] = None) -> List[Dict]:
+        return list(self._select(columns, "WHERE source_file = ?", (source_file,)))
+
+    def _replace_file(self, source_file: str, chunks: List[Dict]) -> None:
+        self.conn.execute("DELETE FROM chunks WHERE source_file = ?", (source_file,))
+        self.conn.executemany(
+            "INSERT INTO chunks (source_file, position, type, name, parameters, code_content, content_hash)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [
+                (
+                    source_file,
+                    i,
+                    c.get("type"),
+                    c.get("name"),
+                    json.dumps(c.get("parameters", [])),
+                    c.get("code_content"),
+                    content_hash(c.get("code_content") or ""),
+                )
+                for i, c in enumerate(chunks)
+            ],
+        )
+
+    def _sync_files(self, metadata: Dict) -> None:
+        source_files = metadata.get("source_files", {})
+        self.conn.executemany(
+            "INSERT INTO files (source_file, hash, mtime, size, functions) VALUES (?, ?, ?, ?, ?)"
+            " ON CONFLICT (source_file) DO UPDATE SET hash = excluded.hash, mtime = excluded.mtime,"
+            " size = excluded.size, functions = excluded.functions",
+            [
+                (path, info.get("hash"), info.get("mtime"), info.get("size"), json.dumps(info.get("functions", [])))
+                for path, info in source_files.items()
+            ],
+        )
+        known = [row[0] for row in self.conn.execute("SELECT source_file FROM files")]
+        self.conn.executemany(
+            "DELETE FROM files WHERE source_file = ?", [(path,) for path in known if path not in source_files]
+        )
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+            [(k, json.dumps(v)) for k, v in metadata.items() if k != "source_files"],
+        )
+
+    def update(
+        self, metadata: Dict, updated: Mapping[str, List[Dict]], removed: Iterable[str] = ()
+    ) -> int:
+        """Replace each updated file's chunks in its own transaction, then sync metadata."""
+        for source_file, chunks in updated.items():
+            with self.conn:
+                self._replace_file(source_file, chunks)
+        with self.conn:
+            self.conn.executemany("DELETE FROM chunks WHERE source_file = ?", [(f,) for f in removed])
+            self._sync_files(metadata)
+        return self.count()
+
+    def save(self, chunks: List[Dict], metadata: Dict) -> int:
+        by_file: Dict[str, List[Dict]] = {}
+        for chunk in chunks:
+            by_file.setdefault(chunk.get("source_file") or "", []).append(chunk)
+        with self.conn:
+            self.conn.execute("DELETE FROM chunks")
+            for source_file, file_chunks in by_file.items():
+                self._replace_file(source_file, file_chunks)
+            self._sync_files(metadata)
+        return self.count()
+
+    def get_embeddings(self, model: str, hashes: Iterable[str]) -> Dict[str, bytes]:
+        """Cached embedding vectors (raw float32 bytes) for the given content hashes."""
+        wanted = list(dict.fromkeys(hashes))
+        found: Dict[str, bytes] = {}
+        # Primary-key lookups, in batches under SQLite's host-parameter limit.
+        for start in range(0, len(wanted), _MAX_SQL_PARAMS):
+            batch = wanted[start : start + _MAX_SQL_PARAMS]
+            rows = self.conn.execute(
+                "SELECT content_hash, vector FROM embeddings"
+                f" WHERE model = ? AND content_hash IN ({', '.join('?' * len(batch))})",
+                (model, *batch),
+            )
+            found.update(rows)
+        return found
+
+    def put_embeddings(self, model: str, vectors: Mapping[str, bytes]) -> None:
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (content_hash, model, vector) VALUES (?, ?, ?)",
+                [(h, model, v) for h, v in vectors.items()],
+            )
+            # Drop vectors no chunk refers to any more.
+            self.conn.execute(
+                "DELETE FROM embeddings WHERE content_hash NOT IN (SELECT content_hash FROM chunks)"
+            )
+
+
+def open_store(path: Optional[str] = None):
+    """The storage backend for ``path`` (default KB_PATH, else code_knowledge_base/)."""
+    path = path or default_kb_path()
+    if path.endswith(".json"):
+        return JsonStore(path)
+    if path.endswith(".sqlite"):
+        return SqliteStore(path)
+    return ShardedStore(path)
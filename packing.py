@@ -0,0 +1,136 @@
+"""
+Token counting and token-budget packing of reference code for the generation prompt.
+
+Prefill time on the GPU box grows with prompt length, so the reference block is
+filled in retrieval rank order up to a fixed token budget instead of including
+every retrieved function verbatim.
+"""
+
+import math
+import os
+from functools import lru_cache
+from typing import Callable, Dict, List, Tuple
+
+TokenCounter = Callable[[str], int]
+
+TRUNCATION_MARKER = "// ... (truncated)"
+
+
+def _estimate_tokens(text: str) -> int:
+    # Rough BPE average for code; used only when no tokenizer is configured.
+    return math.ceil(len(text) / 4)
+
+
+@lru_cache(maxsize=1)
+def get_token_counter() -> TokenCounter:
+    """
+    Return a token counter for the served model.
+
+    Uses the Hugging Face tokenizer named by PROMPT_TOKENIZER (e.g.
+    "Qwen/Qwen3.6-27B", matching the model behind VLLM_MODEL). Falls back to a
+    character-based estimate if it is unset or cannot be loaded.
+    """
+    name = os.environ.get("PROMPT_TOKENIZER", "")
+    if not name:
+        return _estimate_tokens
+    try:
+        from transformers import AutoTokenizer
+
+        tokenizer = AutoTokenizer.from_pretrained(name)
+    except Exception as e:
+        print(f"Could not load tokenizer {name!r} ({e}); estimating token counts.")
+        return _estimate_tokens
+    return lambda text: len(tokenizer.encode(text, add_special_tokens=False))
+
+
+def reference_header(snippet: Dict) -> str:
+    return f"\n// From file: {snippet['function_name']}\n"
+
+
+def render_reference_block(snippets: List[Dict]) -> str:
+    return "".join(f"{reference_header(s)}{s['code']}\n" for s in snippets)
+
+
+def _truncate_code(code: str, budget: int, count_tokens: TokenCounter) -> str:
+    """Keep as many leading lines of ``code`` as fit in ``budget`` tokens."""
+    used = count_tokens(TRUNCATION_MARKER + "\n")
+    kept = []
+    for line in code.splitlines():
+        cost = count_tokens(line + "\n")
+        if used + cost > budget:
+            break
+        kept.append(line)
+        used += cost
+    return "\n".join(kept + [TRUNCATION_MARKER])
+
+
+def pack_snippets(
+    snippets: List[Dict],
+    budget: int,
+    count_tokens: TokenCounter,
+    min_truncated_tokens: int = 64,
+) -> Tuple[List[Dict], Dict]:
+    """
+    Fit retrieved snippets into a token budget, in rank order.
+
+    Snippets that fit are kept verbatim. The first one that does not fit is cut
+    down to its leading lines if at least ``min_truncated_tokens`` remain;
+    otherwise it is dropped, and later (lower-ranked) snippets may still fill the
+    remaining space.
+
+    Args:
+        snippets: Retrieved snippets (dicts with function_name and code), best first
+        budget: Maximum tokens for the rendered reference block
+        count_tokens: Token counter for the served model
+        min_truncated_tokens: Smallest useful size for a truncated snippet
+
+    Returns:
+        Tuple of (packed snippets, stats dict with reference_tokens,
+        snippets_truncated and snippets_dropped)
+    """
+    packed: List[Dict] = []
+    used = 0
+    truncated = dropped = 0
+
+    for snippet in snippets:
+        overhead = count_tokens(reference_header(snippet) + "\n")
+        cost = overhead + count_tokens(snippet["code"])
+        remaining = budget - used
+        if cost <= remaining:
+            packed.append(snippet)
+            used += cost
+        elif remaining - overhead >= min_truncated_tokens:
+            code = _truncate_code(snippet["code"], remaining - overhead, count_tokens)
+            packed.append({**snippet, "code": code, "truncated": True})
+            used += overhead + count_tokens(code)
+            truncated += 1
+        else:
+            dropped += 1
+
+    stats = {
+        "reference_tokens": used,
+        "snippets_truncated": truncated,
+        "snippets_dropped": dropped,
+    }
+    return packed, stats
+
+
+def reference_token_budget() -> int:
+    return int(os.environ.get("PROMPT_REFERENCE_TOKEN_BUDGET", "3000"))
+
+
+def output_token_budget(snippets: List[Dict], count_tokens: TokenCounter) -> int | None:
+    """
+    Output-token limit for a generation, scaled from the reference functions.
+
+    A generated program is usually about as long as the functions it was
+    modelled on, so the limit is the longest retrieved function times
+    GENERATION_OUTPUT_TOKEN_FACTOR, but at least GENERATION_MIN_OUTPUT_TOKENS.
+    Returns None (use the provider's MAX_TOKENS) when the factor is 0.
+    """
+    factor = float(os.environ.get("GENERATION_OUTPUT_TOKEN_FACTOR", "2.0"))
+    if factor <= 0 or not snippets:
+        return None
+    floor = int(os.environ.get("GENERATION_MIN_OUTPUT_TOKENS", "256"))
+    longest = max(count_tokens(s["code"]) for s in snippets)
+    return max(floor, math.ceil(factor * longest))
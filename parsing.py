@@ -0,0 +1,64 @@
+"""
+Two-stage ANTLR parsing for AVP source.
+
+ANTLR's default full-LL prediction is the expensive part of parsing. SLL
+prediction is much cheaper and gives the same tree for almost every input;
+when it can't decide (or the input has a syntax error), a bail-out error
+strategy aborts the parse and it is re-run with full LL and normal error
+reporting. Used by ingest.py and validation.py.
+"""
+
+import os
+from typing import Optional
+
+from antlr4.atn.PredictionMode import PredictionMode
+from antlr4.error.ErrorStrategy import BailErrorStrategy, DefaultErrorStrategy
+from antlr4.error.Errors import ParseCancellationException
+
+from PseudocodeParser import PseudocodeParser
+
+
+def two_stage_enabled() -> bool:
+    return os.environ.get("PARSER_TWO_STAGE", "true").lower() == "true"
+
+
+def _parse_ll(parser: PseudocodeParser):
+    parser._interp.predictionMode = PredictionMode.LL
+    parser._errHandler = DefaultErrorStrategy()
+    return parser.program()
+
+
+def parse_program(parser: PseudocodeParser, two_stage: Optional[bool] = None):
+    """
+    Parse the ``program`` rule, trying SLL with bail-out before full LL.
+
+    The parser's error listeners only hear the LL pass, so an input SLL gives
+    up on but LL parses cleanly reports no errors. Lexer errors are reported
+    once, as tokens are buffered by the first pass.
+
+    Args:
+        parser: A parser over a fresh token stream
+        two_stage: Try SLL first (default PARSER_TWO_STAGE, true)
+
+    Returns:
+        The ProgramContext parse tree
+    """
+    if two_stage is None:
+        two_stage = two_stage_enabled()
+    if not two_stage:
+        return _parse_ll(parser)
+
+    listeners = list(parser._listeners)
+    parser.removeErrorListeners()
+    parser._interp.predictionMode = PredictionMode.SLL
+    parser._errHandler = BailErrorStrategy()
+    try:
+        return parser.program()
+    except ParseCancellationException:
+        pass
+    finally:
+        for listener in listeners:
+            parser.addErrorListener(listener)
+
+    parser.reset()  # rewinds the token stream
+    return _parse_ll(parser)
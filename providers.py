@@ -1,13 +1,23 @@
-"""LLM provider abstraction with optional fallback."""
+"""LLM provider abstraction with an ordered fallback chain."""
 
+import dataclasses
 import os
+import random
 import re
 import sys
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
 from typing import Callable
 
 import anthropic
 import openai
 
+from avp_grammar import lark_grammar
+from deadline import Deadline
+from stopping import STOP_SEQUENCES, ProgramEndDetector
+
 
 # Matches a leading Qwen-style reasoning block, so we can drop when thinkin is disabled
 # but the served model still emits it. This is a bit hacky but allows us to use the same model for both providers.
@@ -21,47 +31,342 @@ def strip_thinking(text: str) -> str:
     return _THINK_RE.sub("", text, count=1)
 
 
-def _call_anthropic(prompt: str) -> str:
-    api_key = os.environ.get("ANTHROPIC_API_KEY")
+@dataclass(frozen=True)
+class ProviderConfig:
+    """Settings for one hop of the provider chain.
+
+    ``name`` is the chain entry (e.g. ``vllm-secondary``); its first dash-separated
+    part is the provider kind. Settings are read from ``<NAME>_<KEY>`` (with dashes
+    turned into underscores) and fall back to the kind's ``<KIND>_<KEY>`` variables,
+    so ``vllm-secondary`` reads ``VLLM_SECONDARY_BASE_URL`` before ``VLLM_BASE_URL``.
+    """
+
+    name: str
+    kind: str
+    connect_timeout: float = 5.0
+    read_timeout: float = 60.0
+    max_retries: int = 1
+
+    def env(self, key: str, default: str = "") -> str:
+        prefix = self.name.upper().replace("-", "_")
+        for var in (f"{prefix}_{key}", f"{self.kind.upper()}_{key}"):
+            value = os.environ.get(var)
+            if value:
+                return value
+        return default
+
+    @classmethod
+    def from_env(cls, name: str) -> "ProviderConfig":
+        base = cls(name=name, kind=name.split("-", 1)[0])
+        return dataclasses.replace(
+            base,
+            connect_timeout=float(base.env("CONNECT_TIMEOUT_S", "5")),
+            read_timeout=float(base.env("READ_TIMEOUT_S", "60")),
+            max_retries=int(base.env("MAX_RETRIES", "1")),
+        )
+
+
+@dataclass
+class CallOptions:
+    """Per-request inputs and outputs threaded from call_llm to the provider.
+
+    ``system`` is the static instruction prefix. It is sent as a separate system
+    message so it can be served from the provider's prefix cache, which only
+    works if it stays byte-identical across requests. ``max_tokens`` lowers the
+    provider's configured output limit for this request. ``deadline`` is the
+    client's request deadline; call_llm shortens timeouts and max_tokens to fit
+    it. ``usage`` is filled in by the provider that answered.
+    """
+
+    system: str | None = None
+    max_tokens: int | None = None
+    deadline: Deadline | None = None
+    usage: dict = field(default_factory=dict)
+
+
+def _max_tokens(config: "ProviderConfig", options: CallOptions) -> int:
+    limit = int(config.env("MAX_TOKENS", "1024"))
+    if options.max_tokens:
+        limit = min(limit, options.max_tokens)
+    return limit
+
+
+def _stream_stop_enabled(config: "ProviderConfig") -> bool:
+    # Streaming lets ProgramEndDetector close the request as soon as the
+    # program is complete instead of waiting for EOS or max_tokens.
+    return config.env("STREAM_STOP", "false").lower() == "true"
+
+
+def _as_int(value) -> int:
+    # SDK usage fields are optional and may be absent on some backends.
+    return value if isinstance(value, int) else 0
+
+
+class EndpointBalancer:
+    """Least-outstanding-requests balancer over OpenAI-compatible endpoints.
+
+    Each call goes to the endpoint with the fewest in-flight requests, breaking
+    ties by recent latency (EWMA). Endpoints are ejected passively: after
+    ``eject_after`` consecutive failures they are skipped for ``eject_s`` seconds,
+    unless every endpoint is ejected, in which case the least-bad one is used.
+    """
+
+    def __init__(
+        self,
+        urls: list[str],
+        eject_after: int = 3,
+        eject_s: float = 30.0,
+        ewma_alpha: float = 0.3,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if not urls:
+            raise ValueError("EndpointBalancer needs at least one endpoint")
+        self.eject_after = eject_after
+        self.eject_s = eject_s
+        self.ewma_alpha = ewma_alpha
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._stats = {
+            url: {"in_flight": 0, "latency_s": 0.0, "failures": 0, "ejected_until": 0.0, "picks": 0}
+            for url in urls
+        }
+
+    @classmethod
+    def from_env(cls, urls: list[str]) -> "EndpointBalancer":
+        return cls(
+            urls,
+            eject_after=int(os.environ.get("VLLM_EJECT_AFTER", "3")),
+            eject_s=float(os.environ.get("VLLM_EJECT_S", "30")),
+        )
+
+    def acquire(self) -> str:
+        """Pick an endpoint and count the request as in flight on it."""
+        with self._lock:
+            now = self._clock()
+            healthy = [u for u, st in self._stats.items() if st["ejected_until"] <= now]
+            candidates = healthy or list(self._stats)
+            url = min(
+                candidates,
+                key=lambda u: (
+                    self._stats[u]["failures"] > 0,
+                    self._stats[u]["in_flight"],
+                    self._stats[u]["latency_s"],
+                    self._stats[u]["picks"],
+                ),
+            )
+            st = self._stats[url]
+            st["in_flight"] += 1
+            st["picks"] += 1
+            return url
+
+    def release(self, url: str, latency_s: float, error: bool) -> None:
+        with self._lock:
+            st = self._stats[url]
+            st["in_flight"] -= 1
+            if error:
+                st["failures"] += 1
+                if st["failures"] >= self.eject_after:
+                    st["ejected_until"] = self._clock() + self.eject_s
+                return
+            st["failures"] = 0
+            st["ejected_until"] = 0.0
+            previous = st["latency_s"]
+            st["latency_s"] = latency_s if previous == 0.0 else (
+                self.ewma_alpha * latency_s + (1 - self.ewma_alpha) * previous
+            )
+
+    def snapshot(self) -> list[dict]:
+        with self._lock:
+            now = self._clock()
+            return [
+                {
+                    "url": url,
+                    "in_flight": st["in_flight"],
+                    "latency_s": round(st["latency_s"], 3),
+                    "consecutive_failures": st["failures"],
+                    "ejected": st["ejected_until"] > now,
+                }
+                for url, st in self._stats.items()
+            ]
+
+
+_balancers: dict[tuple[str, tuple[str, ...]], EndpointBalancer] = {}
+_balancers_lock = threading.Lock()
+
+
+def _split_urls(value: str) -> list[str]:
+    return [u.strip() for u in value.split(",") if u.strip()]
+
+
+def get_balancer(config: ProviderConfig) -> EndpointBalancer:
+    """Balancer for a vLLM hop; ``<HOP>_BASE_URL`` may list several endpoints."""
+    urls = tuple(_split_urls(config.env("BASE_URL", "http://localhost:8001/v1")))
+    key = (config.name, urls)
+    with _balancers_lock:
+        balancer = _balancers.get(key)
+        if balancer is None:
+            balancer = _balancers[key] = EndpointBalancer.from_env(list(urls))
+        return balancer
+
+
+def reset_balancers() -> None:
+    """Forget all endpoint load/ejection state (used by tests)."""
+    with _balancers_lock:
+        _balancers.clear()
+
+
+def _call_anthropic(
+    prompt: str, config: ProviderConfig | None = None, options: CallOptions | None = None
+) -> str:
+    config = config or ProviderConfig.from_env("anthropic")
+    options = options or CallOptions()
+    api_key = config.env("API_KEY")
     if not api_key:
         raise RuntimeError(
             "ANTHROPIC_API_KEY is not set. Set the environment variable to enable generation."
         )
-    model = os.environ.get("ANTHROPIC_MODEL", "claude-sonnet-4-20250514")
-    client = anthropic.Anthropic(api_key=api_key)
-    message = client.messages.create(
-        model=model,
-        max_tokens=1024,
-        messages=[{"role": "user", "content": prompt}],
+    model = config.env("MODEL", "claude-sonnet-4-20250514")
+    client = anthropic.Anthropic(
+        api_key=api_key,
+        timeout=anthropic.Timeout(config.read_timeout, connect=config.connect_timeout),
+        max_retries=0,  # retries are handled by call_llm's retry budget
     )
-    return message.content[0].text
+    kwargs = {}
+    if options.system:
+        # Mark the static prefix as cacheable; later requests read it from
+        # Anthropic's prompt cache instead of re-processing it. Anthropic
+        # ignores the marker on prefixes under 1024 tokens (2048 for Haiku),
+        # which generate.SYSTEM_PROMPT currently is.
+        kwargs["system"] = [
+            {"type": "text", "text": options.system, "cache_control": {"type": "ephemeral"}}
+        ]
+    request = {
+        "model": model,
+        "max_tokens": _max_tokens(config, options),
+        "stop_sequences": STOP_SEQUENCES,
+        "messages": [{"role": "user", "content": prompt}],
+        **kwargs,
+    }
+    if _stream_stop_enabled(config):
+        detector = ProgramEndDetector()
+        with client.messages.stream(**request) as stream:
+            for text in stream.text_stream:
+                if detector.feed(text):
+                    break  # leaving the block closes the connection
+            message = stream.current_message_snapshot
+        result = detector.text
+    else:
+        message = client.messages.create(**request)
+        result = message.content[0].text
+    usage = getattr(message, "usage", None)
+    cached = _as_int(getattr(usage, "cache_read_input_tokens", None))
+    options.usage = {
+        "prompt_tokens": _as_int(getattr(usage, "input_tokens", None))
+        + cached
+        + _as_int(getattr(usage, "cache_creation_input_tokens", None)),
+        "cached_prompt_tokens": cached,
+    }
+    return result
 
 
-def _call_vllm(prompt: str) -> str:
-    base_url = os.environ.get("VLLM_BASE_URL", "http://localhost:8001/v1")
-    model = os.environ.get("VLLM_MODEL", "qwen3.6-27b-awq")
-    api_key = os.environ.get("VLLM_API_KEY", "token-placeholder")
+def _call_vllm(
+    prompt: str, config: ProviderConfig | None = None, options: CallOptions | None = None
+) -> str:
+    config = config or ProviderConfig.from_env("vllm")
+    options = options or CallOptions()
+    model = config.env("MODEL", "qwen3.6-27b-awq")
+    api_key = config.env("API_KEY", "token-placeholder")
 
     # Qwen3.6 runs in thinking mode by default, so we strip out the leading reasoning block if present to avoid confusion
     # unless VLLM_THINKING_MODE is explicitly set to "enabled".
-    enable_thinking = os.environ.get("VLLM_ENABLE_THINKING", "false").lower() == "true"
-
-    client = openai.OpenAI(base_url=base_url, api_key=api_key)
-    response = client.chat.completions.create(
-        model=model,
-        max_tokens=int(os.environ.get("VLLM_MAX_TOKENS", "1024")),
-        temperature=float(os.environ.get("VLLM_TEMPERATURE", "0.6")),
-        top_p=float(os.environ.get("VLLM_TOP_P", "0.95")),
-        messages=[{"role": "user", "content": prompt}],
-        # top_k and the thinking switch are currently only supported in the vllm provider, so we set them here to avoid issues with the anthropic provider which doesn't support them.
-        extra_body={
-            "top_k": int(os.environ.get("VLLM_TOP_K", "20")),
-            "chat_template_kwargs": {
-                "enable_thinking": enable_thinking,
-            },
+    enable_thinking = config.env("ENABLE_THINKING", "false").lower() == "true"
+
+    extra_body: dict = {
+        "top_k": int(config.env("TOP_K", "20")),
+        "chat_template_kwargs": {
+            "enable_thinking": enable_thinking,
         },
-    )
-    result = response.choices[0].message.content or ""
+    }
+    # Constrain decoding to valid AVP. Skipped in thinking mode, where the
+    # reasoning block itself would have to match the grammar.
+    grammar_mode = config.env("GUIDED_GRAMMAR", "off")
+    if grammar_mode != "off" and not enable_thinking:
+        extra_body["guided_grammar"] = lark_grammar(grammar_mode)
+
+    request: dict = {
+        "model": model,
+        "temperature": float(config.env("TEMPERATURE", "0.6")),
+        "top_p": float(config.env("TOP_P", "0.95")),
+    }
+    # The reasoning block needs its own room and may legitimately contain
+    # fences or code, so AVP-aware stopping only applies without thinking.
+    stream_stop = False
+    if enable_thinking:
+        request["max_tokens"] = int(config.env("MAX_TOKENS", "1024"))
+    else:
+        request["max_tokens"] = _max_tokens(config, options)
+        request["stop"] = STOP_SEQUENCES
+        stream_stop = _stream_stop_enabled(config)
+    if stream_stop:
+        # Usage on every chunk, so it is known even if we close the stream early.
+        extra_body["stream_options"] = {"include_usage": True, "continuous_usage_stats": True}
+
+    messages = [{"role": "user", "content": prompt}]
+    if options.system:
+        # vLLM's automatic prefix caching reuses KV blocks for an identical
+        # leading system message across requests.
+        messages.insert(0, {"role": "system", "content": options.system})
+
+    balancer = get_balancer(config)
+    base_url = balancer.acquire()
+    started = time.monotonic()
+    try:
+        client = openai.OpenAI(
+            base_url=base_url,
+            api_key=api_key,
+            timeout=openai.Timeout(config.read_timeout, connect=config.connect_timeout),
+            max_retries=0,  # retries are handled by call_llm's retry budget
+        )
+        if stream_stop:
+            stream = client.chat.completions.create(
+                messages=messages,  # type: ignore[arg-type]
+                stream=True,
+                extra_body=extra_body,
+                **request,
+            )
+            detector = ProgramEndDetector()
+            usage = None
+            try:
+                for chunk in stream:
+                    usage = getattr(chunk, "usage", None) or usage
+                    if chunk.choices and detector.feed(chunk.choices[0].delta.content or ""):
+                        break
+            finally:
+                stream.close()  # vLLM aborts the request when the client disconnects
+            result = detector.text
+        else:
+            response = client.chat.completions.create(
+                messages=messages,  # type: ignore[arg-type]
+                # top_k, the thinking switch and guided decoding are vLLM extensions the anthropic provider doesn't support.
+                extra_body=extra_body,
+                **request,
+            )
+            usage = getattr(response, "usage", None)
+            result = response.choices[0].message.content or ""
+    except Exception as e:
+        # Only transport-level trouble counts against the endpoint; a bad
+        # request would fail the same way on any of them.
+        balancer.release(base_url, time.monotonic() - started, error=isinstance(e, _RETRYABLE_ERRORS))
+        raise
+    balancer.release(base_url, time.monotonic() - started, error=False)
+
+    details = getattr(usage, "prompt_tokens_details", None)
+    options.usage = {
+        "prompt_tokens": _as_int(getattr(usage, "prompt_tokens", None)),
+        # Only reported when vLLM runs with --enable-prompt-tokens-details.
+        "cached_prompt_tokens": _as_int(getattr(details, "cached_tokens", None)),
+    }
+
     if not enable_thinking:
         result = strip_thinking(result)
     return result
@@ -73,12 +378,161 @@ _PROVIDER_FN_NAMES = {
     "anthropic": _call_anthropic.__name__,
     "vllm": _call_vllm.__name__,
 }
-_CONFIG_ENV_VAR = {"anthropic": "ANTHROPIC_API_KEY", "vllm": "VLLM_BASE_URL"}
+_CONFIG_ENV_KEY = {"anthropic": "API_KEY", "vllm": "BASE_URL"}
+
+# Transient failures worth retrying on the same hop; anything else (bad request,
+# auth, missing config) moves straight on to the next provider.
+_RETRYABLE_ERRORS: tuple[type[BaseException], ...] = (
+    ConnectionError,
+    TimeoutError,
+    openai.APIConnectionError,
+    openai.RateLimitError,
+    openai.InternalServerError,
+    anthropic.APIConnectionError,
+    anthropic.RateLimitError,
+    anthropic.InternalServerError,
+)
 
 
-def _get_provider_fn(name: str) -> Callable[[str], str]:
+class DeadlineExceeded(TimeoutError):
+    """The overall LLM call ran out of time before any provider succeeded."""
+
+
+def _get_provider_fn(kind: str) -> Callable[..., str]:
     # Look up by attribute so unittest.mock.patch on the module can override.
-    return getattr(sys.modules[__name__], _PROVIDER_FN_NAMES[name])
+    return getattr(sys.modules[__name__], _PROVIDER_FN_NAMES[kind])
+
+
+class CircuitBreaker:
+    """Per-provider circuit breaker over a rolling window of recent calls.
+
+    A call counts as a failure if it raised or took longer than ``slow_call_s``.
+    Once at least ``min_calls`` outcomes are in the window and the failure rate
+    reaches ``error_rate``, the breaker opens and the provider is skipped
+    without being called. After ``cooldown_s`` it goes half-open and lets a
+    single probe through; the probe's outcome closes or re-opens it.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        name: str,
+        window: int = 20,
+        min_calls: int = 5,
+        error_rate: float = 0.5,
+        slow_call_s: float = 30.0,
+        cooldown_s: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.name = name
+        self.min_calls = min_calls
+        self.error_rate = error_rate
+        self.slow_call_s = slow_call_s
+        self.cooldown_s = cooldown_s
+        self._clock = clock
+        self._outcomes: deque[bool] = deque(maxlen=window)  # True = failure
+        self._state = self.CLOSED
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls, name: str) -> "CircuitBreaker":
+        return cls(
+            name,
+            window=int(os.environ.get("LLM_BREAKER_WINDOW", "20")),
+            min_calls=int(os.environ.get("LLM_BREAKER_MIN_CALLS", "5")),
+            error_rate=float(os.environ.get("LLM_BREAKER_ERROR_RATE", "0.5")),
+            slow_call_s=float(os.environ.get("LLM_BREAKER_SLOW_CALL_S", "30")),
+            cooldown_s=float(os.environ.get("LLM_BREAKER_COOLDOWN_S", "30")),
+        )
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            self._maybe_half_open()
+            return self._state
+
+    def _maybe_half_open(self) -> None:
+        if self._state == self.OPEN and self._clock() - self._opened_at >= self.cooldown_s:
+            self._state = self.HALF_OPEN
+            self._probe_in_flight = False
+
+    def _open(self) -> None:
+        self._state = self.OPEN
+        self._opened_at = self._clock()
+        self._probe_in_flight = False
+
+    def allow_request(self) -> bool:
+        """Return True if a call may go through; claims the probe when half-open."""
+        with self._lock:
+            self._maybe_half_open()
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            return False
+
+    def record(self, latency_s: float, error: bool) -> None:
+        failed = error or latency_s > self.slow_call_s
+        with self._lock:
+            if self._state == self.HALF_OPEN:
+                if failed:
+                    self._open()
+                else:
+                    self._state = self.CLOSED
+                    self._outcomes.clear()
+                    self._probe_in_flight = False
+                return
+            self._outcomes.append(failed)
+            if self._state == self.CLOSED and len(self._outcomes) >= self.min_calls:
+                if self._failure_rate() >= self.error_rate:
+                    self._open()
+
+    def _failure_rate(self) -> float:
+        if not self._outcomes:
+            return 0.0
+        return sum(self._outcomes) / len(self._outcomes)
+
+    def retry_after(self) -> float:
+        """Seconds until an open breaker lets a probe through (0 otherwise)."""
+        with self._lock:
+            if self._state != self.OPEN:
+                return 0.0
+            return max(0.0, self.cooldown_s - (self._clock() - self._opened_at))
+
+    def snapshot(self) -> dict:
+        retry_after = self.retry_after()
+        with self._lock:
+            self._maybe_half_open()
+            return {
+                "state": self._state,
+                "failure_rate": round(self._failure_rate(), 3),
+                "window_calls": len(self._outcomes),
+                "retry_after_s": round(retry_after, 1),
+            }
+
+
+_breakers: dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(name: str) -> CircuitBreaker:
+    with _breakers_lock:
+        breaker = _breakers.get(name)
+        if breaker is None:
+            breaker = _breakers[name] = CircuitBreaker.from_env(name)
+        return breaker
+
+
+def reset_breakers() -> None:
+    """Forget all breaker state (used by tests and on config reload)."""
+    with _breakers_lock:
+        _breakers.clear()
 
 
 def get_provider_name() -> str:
@@ -86,17 +540,150 @@ def get_provider_name() -> str:
 
 
 def is_provider_configured() -> bool:
-    env_var = _CONFIG_ENV_VAR.get(get_provider_name())
-    return bool(env_var and os.environ.get(env_var))
+    """Whether the first provider in the chain has its credentials or URL set.
 
+    False, rather than an error, when the chain names an unknown provider.
+    """
+    try:
+        chain = get_provider_chain()
+    except ValueError:
+        return False
+    config = ProviderConfig.from_env(chain[0])
+    key = _CONFIG_ENV_KEY.get(config.kind)
+    return bool(key and config.env(key))
 
-def call_llm(prompt: str) -> str:
-    provider = get_provider_name()
-    fallback = os.environ.get("LLM_FALLBACK_PROVIDER", "")
 
-    try:
-        return _get_provider_fn(provider)(prompt)
-    except Exception:
+def get_provider_chain() -> list[str]:
+    """Provider names in preference order.
+
+    ``LLM_PROVIDER_CHAIN`` (e.g. ``vllm-local,vllm-secondary,anthropic``) takes
+    precedence; otherwise the chain is ``LLM_PROVIDER`` plus the optional
+    ``LLM_FALLBACK_PROVIDER``.
+    """
+    configured = os.environ.get("LLM_PROVIDER_CHAIN", "")
+    if configured.strip():
+        chain = [n.strip() for n in configured.split(",") if n.strip()]
+    else:
+        chain = [get_provider_name()]
+        fallback = os.environ.get("LLM_FALLBACK_PROVIDER", "")
         if fallback in _PROVIDER_FN_NAMES:
-            return _get_provider_fn(fallback)(prompt)
-        raise
+            chain.append(fallback)
+    deduped = list(dict.fromkeys(chain))
+    unknown = [n for n in deduped if n.split("-", 1)[0] not in _PROVIDER_FN_NAMES]
+    if unknown:
+        raise ValueError(f"Unknown LLM provider(s) in chain: {', '.join(unknown)}")
+    return deduped
+
+
+def provider_health() -> dict[str, dict]:
+    """Breaker snapshot (plus endpoint load for vLLM hops) for every provider in the chain.
+
+    Empty when the chain names an unknown provider (is_provider_configured is False).
+    """
+    try:
+        chain = get_provider_chain()
+    except ValueError:
+        return {}
+    health = {}
+    for name in chain:
+        health[name] = get_breaker(name).snapshot()
+        config = ProviderConfig.from_env(name)
+        if config.kind == "vllm":
+            health[name]["endpoints"] = get_balancer(config).snapshot()
+    return health
+
+
+def retry_after_hint(default_s: float) -> float:
+    """Seconds until an open breaker in the chain lets a probe through.
+
+    ``default_s`` when no breaker is open (the chain failed on live calls).
+    """
+    waits = [get_breaker(name).retry_after() for name in get_provider_chain()]
+    open_waits = [w for w in waits if w > 0]
+    return min(open_waits) if open_waits else default_s
+
+
+def _route(chain: list[str]) -> list[str]:
+    # Healthy (closed) providers keep their configured order and go before
+    # half-open ones, which are only tried as a probe; open ones are skipped.
+    closed = [n for n in chain if get_breaker(n).state == CircuitBreaker.CLOSED]
+    half_open = [n for n in chain if get_breaker(n).state == CircuitBreaker.HALF_OPEN]
+    return closed + half_open
+
+
+def _backoff(attempt: int) -> float:
+    """Full-jitter exponential backoff before retry number ``attempt`` (1-based)."""
+    base = float(os.environ.get("LLM_RETRY_BACKOFF_S", "0.5"))
+    cap = float(os.environ.get("LLM_RETRY_BACKOFF_MAX_S", "4"))
+    return random.uniform(0, min(cap, base * 2 ** (attempt - 1)))
+
+
+def _deadline_max_tokens(requested: int | None, remaining_s: float, deadline: Deadline) -> int | None:
+    """Lower max_tokens to what the remaining time can decode; raise if that is too little."""
+    affordable = int(remaining_s * float(os.environ.get("LLM_DECODE_TOKENS_PER_S", "40")))
+    if affordable < int(os.environ.get("LLM_MIN_DEADLINE_TOKENS", "64")):
+        raise DeadlineExceeded(f"request deadline leaves {remaining_s:.1f}s, too little to generate")
+    if requested is not None and requested <= affordable:
+        return requested
+    deadline.note("max_tokens_shortened")
+    return affordable
+
+
+def call_llm(prompt: str, options: CallOptions | None = None) -> str:
+    """Send ``prompt`` down the provider chain and return the first success.
+
+    Each hop gets ``1 + max_retries`` attempts for retryable errors, with jittered
+    backoff between them, and its read timeout is clamped to whatever remains of
+    the overall ``LLM_DEADLINE_S`` budget (or of ``options.deadline``, if sooner).
+    With a request deadline, max_tokens is also capped to what can be decoded in
+    the remaining time at ``LLM_DECODE_TOKENS_PER_S``.
+    """
+    options = options or CallOptions()
+    chain = get_provider_chain()
+    budget = float(os.environ.get("LLM_DEADLINE_S", "90"))
+    if options.deadline is not None:
+        budget = min(budget, options.deadline.remaining())
+    deadline = time.monotonic() + budget
+    requested_max_tokens = options.max_tokens
+    last_error: Exception | None = None
+
+    for name in _route(chain):
+        config = ProviderConfig.from_env(name)
+        breaker = get_breaker(name)
+        for attempt in range(config.max_retries + 1):
+            if attempt:
+                delay = _backoff(attempt)
+                if time.monotonic() + delay >= deadline:
+                    break
+                time.sleep(delay)
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise DeadlineExceeded(
+                    f"LLM deadline exceeded after trying: {name}"
+                ) from last_error
+            if options.deadline is not None:
+                # Before allow_request(): this can raise DeadlineExceeded, and a
+                # half-open breaker's probe must not be claimed and then leaked.
+                options.max_tokens = _deadline_max_tokens(requested_max_tokens, remaining, options.deadline)
+            if not breaker.allow_request():
+                break
+            hop = dataclasses.replace(config, read_timeout=min(config.read_timeout, remaining))
+            started = time.monotonic()
+            try:
+                result = _get_provider_fn(config.kind)(prompt, hop, options)
+            except Exception as e:
+                breaker.record(time.monotonic() - started, error=True)
+                last_error = e
+                if isinstance(e, _RETRYABLE_ERRORS):
+                    continue
+                break
+            breaker.record(time.monotonic() - started, error=False)
+            return result
+
+    if time.monotonic() >= deadline:
+        raise DeadlineExceeded("LLM deadline exceeded") from last_error
+    if last_error is not None:
+        raise last_error
+    raise RuntimeError(
+        f"All LLM providers are unavailable (circuit open): {', '.join(chain)}"
+    )
@@ -1,12 +1,16 @@
-import json
+import math
 import os
 import sys
+import time
 import warnings
 from typing import Dict, List, Optional
 
 import faiss
 import numpy as np
 
+from deadline import Deadline
+from kb_store import content_hash, open_store
+
 # Suppress tokenizer warnings (safe — only affects Python warnings, not errors)
 warnings.filterwarnings("ignore", category=UserWarning)
 os.environ["TOKENIZERS_PARALLELISM"] = "false"
@@ -24,27 +28,23 @@ except ImportError as e:
     sys.exit(1)
 
 
-def _load_knowledge_base(path: str) -> List[Dict]:
-    """Load the knowledge base JSON, supporting both legacy and tracked formats."""
-    print(f"Loading knowledge base from {path}...")
-    with open(path, "r") as f:
-        data = json.load(f)
+# The only chunk fields the retriever uses; stores that can select columns skip the rest.
+RETRIEVER_COLUMNS = ("name", "parameters", "code_content")
 
-    if isinstance(data, list):
-        # Old format - flat array
-        print(f"Loaded {len(data)} code snippets (legacy format).")
-        return data
 
-    if isinstance(data, dict) and "chunks" in data:
-        # New format - with metadata wrapper
-        chunks = data["chunks"]
-        metadata = data.get("metadata", {})
-        print(f"Loaded {len(chunks)} code snippets (tracked format).")
-        print(f"  Tracking method: {metadata.get('tracking_method', 'unknown')}")
-        print(f"  Last ingestion: {metadata.get('last_ingestion', 'unknown')}")
-        return chunks
+def _load_knowledge_base(store) -> List[Dict]:
+    """Load the chunks the retriever needs, streaming them from the store."""
+    print(f"Loading knowledge base from {store.path}...")
+    if not store.exists():
+        raise FileNotFoundError(f"No knowledge base at {store.path}; run ingest.py first")
 
-    raise ValueError(f"Unknown knowledge base format in {path}")
+    chunks = list(store.iter_chunks(columns=RETRIEVER_COLUMNS))
+    metadata = store.load_metadata()
+    print(f"Loaded {len(chunks)} code snippets.")
+    if metadata.get("last_ingestion"):
+        print(f"  Tracking method: {metadata.get('tracking_method', 'unknown')}")
+        print(f"  Last ingestion: {metadata['last_ingestion']}")
+    return chunks
 
 
 def _normalize(vectors: np.ndarray) -> np.ndarray:
@@ -63,7 +63,7 @@ class CodeRetriever:
 
     def __init__(
         self,
-        knowledge_base_path: str = "code_knowledge_base.json",
+        knowledge_base_path: Optional[str] = None,
         embedding_model: str = "BAAI/bge-base-en-v1.5",
         reranker_model: str = "BAAI/bge-reranker-base",
         use_reranker: bool = True,
@@ -73,7 +73,9 @@ class CodeRetriever:
             device = os.environ.get("EMBEDDING_DEVICE", "cpu")
         self.device = device
         self.use_reranker = use_reranker
-        self.knowledge_base = _load_knowledge_base(knowledge_base_path)
+        self.store = open_store(knowledge_base_path)
+        self.knowledge_base = _load_knowledge_base(self.store)
+        self.embedding_model_name = embedding_model
 
         # Init the Embedding Model
         use_fp16 = device == "cuda"
@@ -93,6 +95,8 @@ class CodeRetriever:
             )
         else:
             self.reranker = None
+        # Measured cross-encoder cost, used to fit reranking into a deadline
+        self.rerank_s_per_pair: float | None = None
 
         self._build_index()
 
@@ -106,7 +110,7 @@ class CodeRetriever:
             for item in self.knowledge_base
         ]
 
-        embeddings = self.embedding_model.encode(self.code_texts)
+        embeddings = self._encode_corpus()
         self.embeddings = _normalize(embeddings).astype("float32")
 
         # Build FAISS index with Inner Product
@@ -118,11 +122,33 @@ class CodeRetriever:
             f"Index built successfully. Dimension: {dimension}, Vectors: {len(self.code_texts)}"
         )
 
+    def _encode_corpus(self) -> np.ndarray:
+        """Embed code_texts, reusing vectors cached in the store if it has an embeddings table."""
+        if not hasattr(self.store, "get_embeddings"):
+            return self.embedding_model.encode(self.code_texts)
+
+        hashes = [content_hash(item["code_content"]) for item in self.knowledge_base]
+        cached = self.store.get_embeddings(self.embedding_model_name, hashes)
+        missing = [i for i, h in enumerate(hashes) if h not in cached]
+        if missing:
+            fresh = np.asarray(
+                self.embedding_model.encode([self.code_texts[i] for i in missing]), dtype="float32"
+            )
+            new = {hashes[i]: fresh[j].tobytes() for j, i in enumerate(missing)}
+            cached.update(new)
+            try:
+                self.store.put_embeddings(self.embedding_model_name, new)
+            except Exception as e:
+                print(f"Warning: could not cache embeddings: {e}")
+        print(f"Embeddings: {len(hashes) - len(missing)} cached, {len(missing)} computed.")
+        return np.stack([np.frombuffer(cached[h], dtype="float32") for h in hashes])
+
     def retrieve(
         self,
         query: str,
         k: int = 5,
         rerank_top_k: Optional[int] = None,
+        deadline: Optional[Deadline] = None,
     ) -> List[Dict]:
         """
         Retrieve relevant code snippets for a query
@@ -132,9 +158,14 @@ class CodeRetriever:
             k: Number of final results to return
             rerank_top_k: Number of candidates to fetch before reranking.
                          If None, defaults to k * 3 (or k if reranker is disabled)
+            deadline: Optional request deadline. Reranking is limited to as many
+                      candidates as fit in the remaining time, or skipped
+                      (noted on the deadline as "rerank_shrunk"/"rerank_skipped")
 
         Returns:
-            List of dicts with keys: score, function_name, parameters, code
+            List of dicts with keys: score, function_name, parameters, code,
+            plus rerank_score for results the cross encoder scored (score is
+            then the reranker logit, otherwise the cosine similarity)
         """
         # Determine how many candidates to fetch for reranking
         if rerank_top_k is None:
@@ -165,27 +196,63 @@ class CodeRetriever:
 
         # Reranking
         if self.use_reranker and self.reranker and candidates:
-            # Cross-encoder scoring on (query, code) pairs
-            pairs = [[query, c["code"]] for c in candidates]
-            rerank_scores = self.reranker.compute_score(pairs)
-            for c, rs in zip(candidates, rerank_scores):
-                c["rerank_score"] = float(rs)
-                c["score"] = float(rs)
-            candidates.sort(key=lambda x: x["rerank_score"], reverse=True)
+            n_rerank = self._rerank_budget(len(candidates), deadline)
+            if deadline is not None and n_rerank < len(candidates):
+                deadline.note("rerank_skipped" if n_rerank == 0 else "rerank_shrunk")
+            reranked, rest = candidates[:n_rerank], candidates[n_rerank:]
+            if reranked:
+                # Cross-encoder scoring on (query, code) pairs
+                pairs = [[query, c["code"]] for c in reranked]
+                started = time.monotonic()
+                rerank_scores = self.reranker.compute_score(pairs)
+                self._record_rerank_time(time.monotonic() - started, len(pairs))
+                if not isinstance(rerank_scores, list):
+                    rerank_scores = [rerank_scores]  # FlagReranker returns a float for one pair
+                for c, rs in zip(reranked, rerank_scores):
+                    c["rerank_score"] = float(rs)
+                    c["score"] = float(rs)
+                reranked.sort(key=lambda x: x["rerank_score"], reverse=True)
+            # Candidates the budget left out keep their vector-search order and score
+            for c in rest:
+                c["score"] = c["initial_score"]
+            candidates = reranked + rest
         else:
             for c in candidates:
                 c["score"] = c["initial_score"]
 
         # Return top-k results
-        return [
-            {
+        results = []
+        for c in candidates[:k]:
+            result = {
                 "score": c["score"],
                 "function_name": c["function_name"],
                 "parameters": c["parameters"],
                 "code": c["code"],
             }
-            for c in candidates[:k]
-        ]
+            if "rerank_score" in c:
+                result["rerank_score"] = c["rerank_score"]
+            results.append(result)
+        return results
+
+    def _rerank_budget(self, n_candidates: int, deadline: Optional[Deadline]) -> int:
+        """How many of the top candidates can be reranked before the deadline (0 = skip)."""
+        if deadline is None:
+            return n_candidates
+        remaining = deadline.remaining()
+        if remaining < float(os.environ.get("RERANK_MIN_BUDGET_S", "0.05")):
+            return 0
+        if self.rerank_s_per_pair is None:
+            return n_candidates  # no measurement yet
+        affordable = math.floor(remaining / self.rerank_s_per_pair)
+        # Reranking a single candidate cannot change the order.
+        return min(n_candidates, affordable) if affordable >= 2 else 0
+
+    def _record_rerank_time(self, elapsed_s: float, n_pairs: int) -> None:
+        per_pair = elapsed_s / n_pairs
+        if self.rerank_s_per_pair is None:
+            self.rerank_s_per_pair = per_pair
+        else:
+            self.rerank_s_per_pair += 0.2 * (per_pair - self.rerank_s_per_pair)
 
     def retrieve_simple(self, query: str, k: int = 1) -> List[Dict]:
         """Backward compatible version of the retrieval function."""
@@ -203,8 +270,8 @@ def get_retriever() -> CodeRetriever:
     return _retriever
 
 
-def retrieve_code(query: str, k: int = 1) -> List[Dict]:
-    return get_retriever().retrieve(query, k=k)
+def retrieve_code(query: str, k: int = 1, deadline: Optional[Deadline] = None) -> List[Dict]:
+    return get_retriever().retrieve(query, k=k, deadline=deadline)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,82 @@
+"""
+AVP-aware stopping for LLM generation.
+
+The prompt asks for function definitions followed by one call of the function.
+Anything after that call (explanations, a second variant, a closing markdown
+fence) is decode time spent on tokens we throw away. Two mechanisms cut it off:
+
+- STOP_SEQUENCES, passed to the provider, catch the usual trailers.
+- ProgramEndDetector watches a streamed reply and reports when the last
+  top-level ``end fun`` is followed by a complete call of a function the reply
+  defined, or by the markdown fence closing the code block, so the caller can
+  close the stream.
+
+A fence can't be a static stop sequence: replies often open with a sentence
+and a fence before the code, and the provider would stop there with nothing
+generated.
+"""
+
+import re
+from typing import List, Set
+
+# None of these can start a line of valid AVP.
+STOP_SEQUENCES = ["\nExplanation", "\nNote:"]
+
+_FUN_RE = re.compile(r"^fun\s+([A-Za-z_]\w*)\s*\(")
+_END_FUN_RE = re.compile(r"^end\s+fun\b")
+# Optional "lvalue =" then name(...), optionally ending in ';'.
+_CALL_RE = re.compile(r"^(?:[A-Za-z_]\w*(?:\[.*\])?\s*=\s*)?([A-Za-z_]\w*)\s*\(.*\)\s*;?$")
+
+
+class ProgramEndDetector:
+    """Incrementally detects the end of a generated AVP program.
+
+    Feed streamed text with ``feed``; once it returns True, ``text`` holds the
+    reply up to and including the entry-point call line (or up to, not
+    including, the closing fence).
+    """
+
+    def __init__(self):
+        self._buffer = ""
+        self._lines: List[str] = []
+        self._defined: Set[str] = set()
+        self._depth = 0
+        self._seen_function = False
+        self.done = False
+
+    @property
+    def text(self) -> str:
+        if self.done:
+            return "\n".join(self._lines)
+        return "\n".join(self._lines + [self._buffer])
+
+    def feed(self, chunk: str) -> bool:
+        """Add streamed text; returns True once the program is complete."""
+        if self.done:
+            return True
+        self._buffer += chunk
+        while "\n" in self._buffer and not self.done:
+            line, self._buffer = self._buffer.split("\n", 1)
+            self._lines.append(line)
+            self._check_line(line)
+        return self.done
+
+    def _check_line(self, line: str) -> None:
+        code = line.split("//", 1)[0].strip()
+        if not code:
+            return
+        fun = _FUN_RE.match(code)
+        if fun:
+            self._defined.add(fun.group(1))
+            self._depth += 1
+        elif _END_FUN_RE.match(code):
+            self._depth = max(self._depth - 1, 0)
+            self._seen_function = True
+        elif self._depth == 0 and self._seen_function:
+            if code.startswith("```"):
+                self._lines.pop()
+                self.done = True
+                return
+            call = _CALL_RE.match(code)
+            if call and call.group(1) in self._defined:
+                self.done = True
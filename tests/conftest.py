@@ -10,6 +10,7 @@ from starlette.testclient import TestClient
 MOCK_RETRIEVE_RESULT = [
     {
         "score": 0.95,
+        "rerank_score": 0.95,
         "function_name": "addNumbers",
         "parameters": ["a", "b"],
         "code": "fun addNumbers(a, b):\n    return a + b\nend fun",
@@ -19,6 +20,18 @@ MOCK_RETRIEVE_RESULT = [
 MOCK_LLM_OUTPUT = "fun mock():\n    return 1\nend fun"
 
 
+@pytest.fixture(autouse=True)
+def _reset_provider_state():
+    """Circuit breakers and endpoint balancers are module-level state; keep tests independent."""
+    from providers import reset_balancers, reset_breakers
+
+    reset_breakers()
+    reset_balancers()
+    yield
+    reset_breakers()
+    reset_balancers()
+
+
 @pytest.fixture()
 def client():
     """TestClient with mocked retriever, LLM, and env vars.
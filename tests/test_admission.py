@@ -0,0 +1,82 @@
+"""Unit tests for api/admission.py (bounded concurrency and wait queue)"""
+
+import asyncio
+
+import pytest
+
+from api.admission import AdmissionController, QueueFull, QueueTimeout
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+class TestAdmissionController:
+    def test_waiters_get_slots_in_turn(self):
+        async def scenario():
+            admission = AdmissionController(max_concurrent=1, max_queue=2, queue_timeout_s=5)
+            order = []
+
+            async def job(name):
+                async with admission.slot():
+                    order.append(name)
+                    await asyncio.sleep(0.01)
+
+            tasks = [asyncio.create_task(job(n)) for n in "abc"]
+            await asyncio.sleep(0)
+            assert admission.active == 1
+            assert admission.queued == 2
+            await asyncio.gather(*tasks)
+            return admission, order
+
+        admission, order = run(scenario())
+        assert order == ["a", "b", "c"]
+        assert admission.snapshot()["admitted_total"] == 3
+        assert admission.queued == admission.active == 0
+
+    def test_rejects_when_queue_is_full(self):
+        async def scenario():
+            admission = AdmissionController(max_concurrent=1, max_queue=1, queue_timeout_s=5)
+            release = asyncio.Event()
+
+            async def holder():
+                async with admission.slot():
+                    await release.wait()
+
+            tasks = [asyncio.create_task(holder()) for _ in range(2)]
+            await asyncio.sleep(0)
+            with pytest.raises(QueueFull) as exc:
+                async with admission.slot():
+                    pass
+            release.set()
+            await asyncio.gather(*tasks)
+            return admission, exc.value
+
+        admission, error = run(scenario())
+        assert error.retry_after >= 1
+        assert admission.rejected_total == 1
+
+    def test_queue_deadline(self):
+        async def scenario():
+            admission = AdmissionController(max_concurrent=1, max_queue=4, queue_timeout_s=0.01)
+            release = asyncio.Event()
+
+            async def holder():
+                async with admission.slot():
+                    await release.wait()
+
+            task = asyncio.create_task(holder())
+            await asyncio.sleep(0)
+            with pytest.raises(QueueTimeout):
+                async with admission.slot():
+                    pass
+            release.set()
+            await task
+            # The slot is usable again once released.
+            async with admission.slot():
+                pass
+            return admission
+
+        admission = run(scenario())
+        assert admission.timed_out_total == 1
+        assert admission.queued == 0
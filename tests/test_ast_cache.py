@@ -0,0 +1,115 @@
+"""Unit tests for the content-addressed parse cache in ast_cache.py"""
+
+import glob
+import os
+import shutil
+from unittest.mock import patch
+
+import fastparse
+import ingest
+from ast_cache import AstCache, grammar_version
+from ingest import parse_file, parse_files
+from tracking import compute_file_hash
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+DATA_FILES = sorted(glob.glob(os.path.join(DATA_DIR, "*.avp")))
+
+GOOD = "fun a(x):\n    return x\nend fun\n"
+BAD = "fun a(x):\n    return x +\nend fun\n"
+
+
+def _write(path, text):
+    with open(path, "w") as f:
+        f.write(text)
+    return str(path)
+
+
+class TestAstCache:
+    def test_round_trip_retags_source_file(self, tmp_path):
+        cache = AstCache(str(tmp_path / "cache"))
+        result = fastparse.parse(GOOD, source_file="old.avp")
+        file_hash = "ab" * 32
+        cache.put(file_hash, result.functions, result.program)
+
+        assert cache.get_chunks(file_hash, "new.avp") == [dict(result.functions[0], source_file="new.avp")]
+        assert "source_file" not in cache.get_chunks(file_hash)[0]
+        assert cache.get_program(file_hash) == result.program
+        assert cache.get_chunks("cd" * 32) is None
+
+    def test_grammar_version_partitions_entries(self, tmp_path):
+        result = fastparse.parse(GOOD)
+        AstCache(str(tmp_path), version="0" * 64).put("ab" * 32, result.functions, result.program)
+        assert AstCache(str(tmp_path)).get_chunks("ab" * 32) is None
+        assert AstCache(str(tmp_path)).root.endswith(grammar_version()[:16])
+
+    def test_corrupt_entry_is_a_miss(self, tmp_path):
+        cache = AstCache(str(tmp_path))
+        result = fastparse.parse(GOOD)
+        cache.put("ab" * 32, result.functions, result.program)
+        with open(cache._path("ab" * 32), "w") as f:
+            f.write('{"chunks": [')
+        assert cache.get_chunks("ab" * 32) is None
+
+
+class TestParseFileWithCache:
+    def test_second_parse_is_served_from_cache(self, tmp_path):
+        cache = AstCache(str(tmp_path / "cache"))
+        path = DATA_FILES[0]
+        expected = parse_file(path, source_file=path)
+        assert parse_file(path, source_file=path, cache=cache) == expected
+
+        with patch("ingest.parse_source") as mock_parse:
+            assert parse_file(path, source_file=path, cache=cache) == expected
+        mock_parse.assert_not_called()
+
+    def test_renamed_and_reverted_files_hit(self, tmp_path):
+        cache = AstCache(str(tmp_path / "cache"))
+        a = _write(tmp_path / "a.avp", GOOD)
+        parse_file(a, source_file=a, cache=cache)
+
+        b = str(tmp_path / "b.avp")
+        shutil.move(a, b)
+        _write(b, GOOD.replace("x", "y"))
+        parse_file(b, source_file=b, cache=cache)
+        _write(b, GOOD)  # reverted
+
+        with patch("ingest.parse_source") as mock_parse:
+            chunks = parse_file(b, source_file=b, cache=cache)
+        mock_parse.assert_not_called()
+        assert [(c["name"], c["source_file"]) for c in chunks] == [("a", b)]
+
+    def test_known_hash_skips_reading_on_hit(self, tmp_path):
+        cache = AstCache(str(tmp_path / "cache"))
+        a = _write(tmp_path / "a.avp", GOOD)
+        file_hash = compute_file_hash(a)
+        parse_file(a, cache=cache, file_hash=file_hash)
+
+        with patch("ingest._read_bytes") as mock_read:
+            assert parse_file(a, cache=cache, file_hash=file_hash)[0]["name"] == "a"
+        mock_read.assert_not_called()
+
+    def test_stale_hash_keys_the_parsed_content(self, tmp_path):
+        cache = AstCache(str(tmp_path / "cache"))
+        a = _write(tmp_path / "a.avp", GOOD)
+        stale = compute_file_hash(a)
+        _write(a, GOOD.replace("x", "y"))
+        parse_file(a, cache=cache, file_hash=stale)
+        assert cache.get_chunks(stale) is None
+        assert cache.get_chunks(compute_file_hash(a))[0]["parameters"] == ["y"]
+
+    def test_files_with_syntax_errors_are_not_cached(self, tmp_path):
+        cache = AstCache(str(tmp_path / "cache"))
+        bad = _write(tmp_path / "bad.avp", BAD)
+        parse_file(bad, cache=cache)
+        assert cache.get_chunks(compute_file_hash(bad)) is None
+
+    def test_parse_files_passes_hashes_and_cache_to_workers(self, tmp_path):
+        cache = AstCache(str(tmp_path / "cache"))
+        hashes = {p: compute_file_hash(p) for p in DATA_FILES[:4]}
+        first = parse_files(DATA_FILES[:4], workers=2, chunksize=1, cache=cache, hashes=hashes)
+        assert all(cache.get_chunks(h) is not None for h in hashes.values())
+
+        with patch.object(ingest, "parse_source") as mock_parse:
+            again = parse_files(DATA_FILES[:4], serial=True, cache=cache, hashes=hashes)
+        mock_parse.assert_not_called()
+        assert again == first == parse_files(DATA_FILES[:4], serial=True)
@@ -0,0 +1,149 @@
+"""Unit tests for the compact AST in avp_ast.py"""
+
+import glob
+import json
+import os
+
+import pytest
+from antlr4 import CommonTokenStream, InputStream
+
+import fastparse
+from avp_ast import (
+    Annotation,
+    BinaryOp,
+    Literal,
+    Node,
+    annotation_spans,
+    build_ast,
+    from_data,
+    functions,
+    to_data,
+    walk,
+)
+from compaction import compact_code
+from ingest import CodeStructureVisitor, parse_file, parse_source
+from parsing import parse_program
+from PseudocodeLexer import PseudocodeLexer
+from PseudocodeParser import PseudocodeParser
+from validation import validate_code
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+DATA_FILES = sorted(glob.glob(os.path.join(DATA_DIR, "*.avp")))
+
+CODE = """fun outer(@init<table> xs, n):
+    @mark<i, highlight> total = (n + 1) * -xs[0];
+    fun inner(y):
+        return y ** 2 ** 3
+    end fun
+    for @log<"loop"> (i = 0, i < n, i += 1):
+        total += inner(xs[i])
+    end for
+    if (total == 0 and n > 1):
+        a = arr[1 to n]
+    else if (total < 0):
+        break
+    else:
+        a = arr(n, Null)
+    end if
+    return total
+end fun
+"""
+
+
+def _antlr_tree(code):
+    parser = PseudocodeParser(CommonTokenStream(PseudocodeLexer(InputStream(code))))
+    return parse_program(parser)
+
+
+class TestBuild:
+    @pytest.mark.parametrize("path", DATA_FILES)
+    def test_front_ends_build_the_same_tree(self, path):
+        with open(path) as f:
+            code = f.read()
+        assert fastparse.parse(code).program == build_ast(_antlr_tree(code), code)
+
+    def test_spans_and_structure(self):
+        program = fastparse.parse(CODE).program
+        assert program == build_ast(_antlr_tree(CODE), CODE)
+
+        outer, inner = functions(program)
+        assert (outer.name, [p.name for p in outer.params]) == ("outer", ["xs", "n"])
+        assert CODE[outer.start : outer.stop + 1] == CODE.rstrip("\n")
+        assert CODE[inner.start : inner.stop + 1].startswith("fun inner(y):")
+        assert (inner.line, inner.column) == (3, 4)
+
+        assign = outer.body[0]
+        # The statement covers its annotation and semicolon; the product covers "(n + 1)".
+        assert CODE[assign.start : assign.stop + 1] == "@mark<i, highlight> total = (n + 1) * -xs[0];"
+        assert assign.annotation.args == ["i", "highlight"]
+        product = assign.value
+        assert isinstance(product, BinaryOp) and product.op == "*"
+        assert CODE[product.start : product.stop + 1] == "(n + 1) * -xs[0]"
+        assert CODE[product.left.start : product.left.stop + 1] == "n + 1"
+
+        # ** folds left, like the grammar's (POW unaryExpression)* loop.
+        power = inner.body[0].value
+        assert CODE[power.left.start : power.left.stop + 1] == "y ** 2"
+
+        if_stmt = outer.body[3]
+        assert len(if_stmt.tests) == 2 and len(if_stmt.bodies) == 2
+        assert if_stmt.orelse[0].value.kind == "size"
+        assert if_stmt.bodies[0][0].value.kind == "range"
+        assert outer.body[2].annotation.args == ['"loop"']
+
+        literals = [n for n in walk(program) if isinstance(n, Literal)]
+        assert {n.kind for n in literals} == {"INT", "NULL"}
+
+    def test_nodes_have_no_dict(self):
+        for node in walk(fastparse.parse(CODE).program):
+            assert not hasattr(node, "__dict__")
+            assert isinstance(node, Node)
+
+
+class TestSerialization:
+    @pytest.mark.parametrize("path", DATA_FILES[:3])
+    def test_json_round_trip(self, path):
+        with open(path) as f:
+            program = fastparse.parse(f.read()).program
+        assert from_data(json.loads(json.dumps(to_data(program)))) == program
+
+    def test_equality_includes_spans(self):
+        a = fastparse.parse("x = 1\n").program
+        b = fastparse.parse("x =  1\n").program
+        assert a != b
+
+
+class TestConsumers:
+    @pytest.mark.parametrize("path", DATA_FILES)
+    def test_parse_file_matches_visitor(self, path):
+        visitor = CodeStructureVisitor(source_file=path)
+        visitor.visit(_antlr_tree(fastparse.read_source(path)))
+        assert parse_file(path, source_file=path, frontend="antlr") == visitor.functions
+
+    def test_parse_source_returns_recovered_tree_on_errors(self):
+        program, recovered = parse_source("fun f(x):\n    return 1\nend fun\nx = (\n", frontend="antlr")
+        assert program is None and recovered is not None
+
+    def test_validate_code_returns_program(self):
+        result = validate_code(CODE)
+        assert result.valid and [f.name for f in functions(result.program)] == ["outer", "inner"]
+        assert validate_code("x = (\n").program is None
+
+    def test_compaction_with_ast_annotation_spans(self):
+        program = fastparse.parse(CODE).program
+        outer = functions(program)[0]
+        code = CODE[outer.start : outer.stop + 1]
+        spans = annotation_spans(outer, base=outer.start)
+        assert len(spans) == 3 and all(code[s] == "@" for s, _ in spans)
+        assert compact_code(code, "annotations", spans) == compact_code(code, "annotations")
+        assert not any(isinstance(n, Annotation) for n in walk(fastparse.parse(
+            compact_code(code, "annotations", spans)).program))
+
+    def test_data_functions_compact_the_same_either_way(self):
+        for path in DATA_FILES:
+            text = fastparse.read_source(path)
+            for fn in functions(fastparse.parse(text).program):
+                code = text[fn.start : fn.stop + 1]
+                spans = annotation_spans(fn, base=fn.start)
+                assert compact_code(code, "annotations", spans) == compact_code(code, "annotations")
+
@@ -0,0 +1,176 @@
+"""Tests for the Lark grammar derived from Pseudocode.g4 and its use in guided decoding."""
+
+import glob
+import json
+import os
+import random
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from unittest.mock import patch
+
+import pytest
+
+from avp_grammar import lark_grammar
+from providers import _call_vllm
+from validation import validate_code
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+
+GOOD_PROGRAM = """a1 = arr[3, 1, 2]
+
+fun find_max(@init<table> values, size):
+    best = values[0]
+    for (i = 1, i < size, i += 1):
+        // keep the larger one
+        @mark<i, highlight, yellow> if (values[i] > best):
+            best = values[i]
+        end if
+    end for
+    return best
+end fun
+
+result = find_max(a1, length(a1))
+"""
+
+
+class RecordingOpenAIServer:
+    """Minimal OpenAI-compatible /v1/chat/completions stand-in that records payloads."""
+
+    def __init__(self, reply: str):
+        self.payloads: list[dict] = []
+        payloads, body = self.payloads, reply
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                length = int(self.headers["Content-Length"])
+                payloads.append(json.loads(self.rfile.read(length)))
+                response = json.dumps({
+                    "id": "cmpl-test",
+                    "object": "chat.completion",
+                    "created": 0,
+                    "model": payloads[-1]["model"],
+                    "choices": [{
+                        "index": 0,
+                        "finish_reason": "stop",
+                        "message": {"role": "assistant", "content": body},
+                    }],
+                    "usage": {"prompt_tokens": 10, "completion_tokens": 5, "total_tokens": 15},
+                }).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(response)))
+                self.end_headers()
+                self.wfile.write(response)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.httpd = HTTPServer(("127.0.0.1", 0), Handler)
+        self.base_url = f"http://127.0.0.1:{self.httpd.server_port}/v1"
+
+    def __enter__(self):
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+class TestGuidedDecodingPayload:
+    @pytest.mark.parametrize("mode", ["program", "strict"])
+    def test_grammar_sent_in_request_body(self, mode):
+        with RecordingOpenAIServer(GOOD_PROGRAM) as server:
+            env = {"VLLM_BASE_URL": server.base_url, "VLLM_GUIDED_GRAMMAR": mode}
+            with patch.dict(os.environ, env, clear=True):
+                assert _call_vllm("write find_max") == GOOD_PROGRAM
+
+        payload = server.payloads[0]
+        assert payload["guided_grammar"] == lark_grammar(mode)
+        assert payload["top_k"] == 20
+
+    def test_no_grammar_by_default_or_when_thinking(self):
+        with RecordingOpenAIServer(GOOD_PROGRAM) as server:
+            with patch.dict(os.environ, {"VLLM_BASE_URL": server.base_url}, clear=True):
+                _call_vllm("task")
+            env = {
+                "VLLM_BASE_URL": server.base_url,
+                "VLLM_GUIDED_GRAMMAR": "strict",
+                "VLLM_ENABLE_THINKING": "true",
+            }
+            with patch.dict(os.environ, env, clear=True):
+                _call_vllm("task")
+
+        assert all("guided_grammar" not in p for p in server.payloads)
+
+
+class TestDerivedGrammar:
+    def test_rejects_unknown_mode(self):
+        with pytest.raises(ValueError):
+            lark_grammar("loose")
+
+    def test_program_mode_accepts_every_data_file(self):
+        lark = pytest.importorskip("lark")
+        parser = lark.Lark(lark_grammar("program"))
+        for path in sorted(glob.glob(os.path.join(DATA_DIR, "*.avp"))):
+            with open(path) as f:
+                parser.parse(f.read())
+
+    def test_strict_mode_accepts_function_then_call(self):
+        lark = pytest.importorskip("lark")
+        lark.Lark(lark_grammar("strict")).parse(GOOD_PROGRAM)
+
+    @pytest.mark.parametrize(
+        "bad",
+        [
+            "```avp\n" + GOOD_PROGRAM + "```\n",
+            GOOD_PROGRAM + "\nThis function returns the maximum.\n",
+            "def find_max(values):\n    return max(values)\n",
+            GOOD_PROGRAM.replace("result = find_max(a1, length(a1))\n", ""),
+        ],
+    )
+    def test_strict_mode_rejects_non_avp(self, bad):
+        lark = pytest.importorskip("lark")
+        with pytest.raises(lark.exceptions.LarkError):
+            lark.Lark(lark_grammar("strict")).parse(bad)
+
+
+def _random_expression(rng, depth=0):
+    if depth > 3 or rng.random() < 0.3:
+        return rng.choice(["x", "3", "2.5", "True", "Null", '"s"', "a[i]", "f(x, 1)"])
+    form = rng.random()
+    if form < 0.15:
+        return f"({_random_expression(rng, depth + 1)})"
+    if form < 0.25:
+        return f"-{_random_expression(rng, depth + 1)}"
+    op = rng.choice(["or", "and", "==", "<", ">", "<=", ">=", "+", "-", "*", "/", "**"])
+    return f"{_random_expression(rng, depth + 1)} {op} {_random_expression(rng, depth + 1)}"
+
+
+class TestExpressionRules:
+    """The left-factored expression rules accept the same language as the compiled parser."""
+
+    def _cases(self):
+        rng = random.Random(47)
+        for _ in range(60):
+            expr = _random_expression(rng)
+            yield f"y = {expr}\n"
+            tokens = expr.split(" ")
+            # Drop a token to get (mostly) invalid variants.
+            del tokens[rng.randrange(len(tokens))]
+            yield f"y = {' '.join(tokens)}\n"
+
+    def test_lark_and_antlr_agree(self):
+        lark = pytest.importorskip("lark")
+        parser = lark.Lark(lark_grammar("program"))
+        accepted = rejected = 0
+        for code in self._cases():
+            try:
+                parser.parse(code)
+                lark_ok = True
+            except lark.exceptions.LarkError:
+                lark_ok = False
+            assert lark_ok == validate_code(code).valid, code
+            accepted += lark_ok
+            rejected += not lark_ok
+        assert accepted > 20 and rejected > 20
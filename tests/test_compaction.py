@@ -0,0 +1,71 @@
+"""Unit tests for lexer-based reference compaction in compaction.py"""
+
+import glob
+import os
+
+import pytest
+
+from compaction import LEVELS, compact_code, compact_snippets
+from ingest import parse_file
+
+SAMPLE = """fun  find(@init<table>  items,   target):   // linear scan
+    // walk the array
+
+    for @mark<i, outline, yellow> (i = 0, i < length(items), i += 1):
+        @log<info, "checking // not a comment"> x = items[i]
+        if (x == target):
+            return i
+        end if
+    end for
+    return -1
+end fun"""
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+
+
+class TestCompactCode:
+    def test_none_is_identity(self):
+        assert compact_code(SAMPLE, "none") == SAMPLE
+
+    def test_comments_level_keeps_strings_and_indentation(self):
+        out = compact_code(SAMPLE, "comments")
+        assert "linear scan" not in out
+        assert "walk the array" not in out
+        assert "" not in out.split("\n")
+        assert '"checking // not a comment"' in out
+        assert "        @log<info" in out
+        assert out.startswith("fun  find(@init<table>  items,   target):")
+
+    def test_whitespace_level_collapses_inner_runs(self):
+        out = compact_code(SAMPLE, "whitespace")
+        assert out.startswith("fun find(@init<table> items, target):\n")
+        assert "    for @mark<i, outline, yellow> (i = 0" in out
+
+    def test_annotations_level_drops_annotations(self):
+        out = compact_code(SAMPLE, "annotations")
+        assert "@" not in out
+        assert out.startswith("fun find(items, target):\n")
+        assert "    for (i = 0, i < length(items), i += 1):" in out
+        assert "        x = items[i]" in out
+
+    def test_unknown_level_rejected(self):
+        with pytest.raises(ValueError):
+            compact_code(SAMPLE, "aggressive")
+
+    @pytest.mark.parametrize("level", LEVELS)
+    def test_compacted_data_files_still_parse_to_same_functions(self, level, tmp_path):
+        for path in sorted(glob.glob(os.path.join(DATA_DIR, "*.avp"))):
+            with open(path) as f:
+                compacted = compact_code(f.read(), level)
+            out = tmp_path / os.path.basename(path)
+            out.write_text(compacted)
+            original = [(c["name"], c["parameters"]) for c in parse_file(path)]
+            assert [(c["name"], c["parameters"]) for c in parse_file(str(out))] == original
+
+
+class TestCompactSnippets:
+    def test_reports_token_savings(self):
+        snippets = [{"function_name": "find", "code": SAMPLE}]
+        compacted, stats = compact_snippets(snippets, "annotations", lambda t: len(t.split()))
+        assert compacted[0]["function_name"] == "find"
+        assert stats["compacted_tokens"] < stats["original_tokens"]
@@ -0,0 +1,145 @@
+"""Tests for request deadlines (deadline.py) and how each stage honours them"""
+
+import os
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+
+from deadline import Deadline
+from generate import generate_from_context
+from providers import CallOptions, DeadlineExceeded, call_llm
+from retrieve import CodeRetriever
+from tests.conftest import MOCK_LLM_OUTPUT, MOCK_RETRIEVE_RESULT
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestDeadline:
+    def test_from_header(self):
+        assert Deadline.from_header(None) is None
+        assert 0.4 < Deadline.from_header("500").remaining() <= 0.5
+        for bad in ("0", "-5", "soon"):
+            with pytest.raises(ValueError):
+                Deadline.from_header(bad)
+
+    def test_share_splits_remaining_and_shares_notes(self):
+        clock = FakeClock()
+        deadline = Deadline(10, clock=clock)
+        clock.now += 2
+        stage = deadline.share(0.25)
+        assert stage.remaining() == pytest.approx(2.0)
+        stage.note("rerank_skipped")
+        assert deadline.notes == ["rerank_skipped"]
+        clock.now += 9
+        assert deadline.expired
+
+
+def _stub_retriever(n_items=6, rerank_s_per_pair=None):
+    retriever = CodeRetriever.__new__(CodeRetriever)
+    retriever.knowledge_base = [
+        {"name": f"fn{i}", "parameters": [], "code_content": f"fun fn{i}():\nend fun"}
+        for i in range(n_items)
+    ]
+    retriever.use_reranker = True
+    retriever.rerank_s_per_pair = rerank_s_per_pair
+    retriever.embedding_model = MagicMock()
+    retriever.embedding_model.encode_queries.return_value = np.ones((1, 4), dtype="float32")
+    retriever.index = MagicMock()
+    retriever.index.search.side_effect = lambda q, n: (
+        np.linspace(0.9, 0.5, n, dtype="float32")[None, :],
+        np.arange(n)[None, :],
+    )
+    retriever.reranker = MagicMock()
+    # Reverse the vector order so reranking is visible.
+    retriever.reranker.compute_score.side_effect = lambda pairs: [float(i) for i in range(len(pairs))]
+    return retriever
+
+
+class TestRerankBudget:
+    def test_no_deadline_reranks_everything(self):
+        retriever = _stub_retriever()
+        results = retriever.retrieve("q", k=2)
+        assert len(retriever.reranker.compute_score.call_args.args[0]) == 6
+        assert results[0]["function_name"] == "fn5"
+
+    def test_low_budget_shrinks_reranking(self):
+        retriever = _stub_retriever(rerank_s_per_pair=0.1)
+        deadline = Deadline(0.35)
+        retriever.retrieve("q", k=2, deadline=deadline)
+        assert len(retriever.reranker.compute_score.call_args.args[0]) == 3
+        assert deadline.notes == ["rerank_shrunk"]
+
+    def test_exhausted_budget_skips_reranking(self):
+        retriever = _stub_retriever(rerank_s_per_pair=0.1)
+        deadline = Deadline(0.01)
+        results = retriever.retrieve("q", k=2, deadline=deadline)
+        retriever.reranker.compute_score.assert_not_called()
+        assert [r["function_name"] for r in results] == ["fn0", "fn1"]
+        assert deadline.notes == ["rerank_skipped"]
+
+
+class TestLlmDeadline:
+    @patch("providers._call_vllm")
+    def test_max_tokens_fit_remaining_time(self, mock_vllm):
+        seen = {}
+
+        def fake(prompt, config, options):
+            seen["max_tokens"] = options.max_tokens
+            seen["read_timeout"] = config.read_timeout
+            return "ok"
+
+        mock_vllm.side_effect = fake
+        deadline = Deadline(5)
+        env = {"LLM_PROVIDER": "vllm", "LLM_DECODE_TOKENS_PER_S": "40"}
+        with patch.dict(os.environ, env, clear=True):
+            call_llm("task", CallOptions(max_tokens=1000, deadline=deadline))
+
+        assert seen["max_tokens"] <= 200
+        assert seen["read_timeout"] <= 5
+        assert "max_tokens_shortened" in deadline.notes
+
+    @patch("providers._call_vllm")
+    def test_too_little_time_fails_fast(self, mock_vllm):
+        with patch.dict(os.environ, {"LLM_PROVIDER": "vllm"}, clear=True):
+            with pytest.raises(DeadlineExceeded):
+                call_llm("task", CallOptions(deadline=Deadline(0.5)))
+        mock_vllm.assert_not_called()
+
+
+class TestPartialGeneration:
+    def test_expired_deadline_skips_llm(self):
+        deadline = Deadline(0)
+        with patch("generate.call_llm") as mock_llm:
+            result = generate_from_context("add numbers", MOCK_RETRIEVE_RESULT, deadline)
+        mock_llm.assert_not_called()
+        assert result["partial"] is True
+        assert result["generated_code"] is None
+        assert result["retrieved_functions"] == MOCK_RETRIEVE_RESULT
+        assert "generation_skipped" in result["deadline_notes"]
+
+    def test_llm_deadline_returns_partial(self):
+        with patch("generate.call_llm", side_effect=DeadlineExceeded("late")):
+            result = generate_from_context("add numbers", MOCK_RETRIEVE_RESULT, Deadline(30))
+        assert result["partial"] is True
+        assert result["degraded"] is False
+
+
+class TestDeadlineHeader:
+    def test_invalid_header_is_400(self, client):
+        resp = client.post("/api/retrieve", json={"query": "x"}, headers={"X-Deadline-Ms": "soon"})
+        assert resp.status_code == 400
+
+    def test_generate_with_ample_deadline(self, client):
+        resp = client.post(
+            "/api/generate", json={"query": "add numbers"}, headers={"X-Deadline-Ms": "60000"}
+        )
+        assert resp.status_code == 200
+        assert resp.json()["generated_code"] == MOCK_LLM_OUTPUT
+        assert resp.json()["partial"] is False
@@ -0,0 +1,66 @@
+"""Unit tests for api/executors.py (per-stage thread pools)"""
+
+import asyncio
+import os
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from api.executors import StageExecutor, configure_torch_threads, create_executors
+
+
+class TestStageExecutor:
+    def test_runs_on_its_own_threads_and_counts(self):
+        executor = StageExecutor("retrieval", max_workers=1)
+        started = threading.Event()
+        release = threading.Event()
+
+        def blocking():
+            started.set()
+            release.wait(5)
+            return threading.current_thread().name
+
+        async def scenario():
+            first = asyncio.create_task(executor.run(blocking))
+            second = asyncio.create_task(executor.run(lambda: "second"))
+            await asyncio.to_thread(started.wait, 5)
+            busy = executor.snapshot()
+            release.set()
+            return busy, await first, await second
+
+        try:
+            busy, thread_name, second = asyncio.run(scenario())
+        finally:
+            executor.shutdown()
+
+        assert busy["running"] == 1
+        assert busy["queued"] == 1
+        assert thread_name.startswith("avp-retrieval")
+        assert second == "second"
+        assert executor.snapshot()["completed_total"] == 2
+
+    def test_pool_sizes_from_env(self):
+        env = {"RETRIEVAL_WORKERS": "3", "GENERATION_WORKERS": "20"}
+        with patch.dict(os.environ, env), patch("api.executors.configure_torch_threads"):
+            executors = create_executors()
+        try:
+            assert executors["retrieval"].max_workers == 3
+            assert executors["generation"].max_workers == 20
+        finally:
+            for executor in executors.values():
+                executor.shutdown()
+
+
+def test_torch_threads_split_across_retrieval_workers():
+    torch = pytest.importorskip("torch")
+    original = torch.get_num_threads()
+    try:
+        with (
+            patch.dict(os.environ, {}, clear=True),
+            patch("api.executors.os.cpu_count", return_value=8),
+        ):
+            assert configure_torch_threads(retrieval_workers=2) == 4
+        assert torch.get_num_threads() == 4
+    finally:
+        torch.set_num_threads(original)
@@ -124,7 +124,25 @@ class TestProviderFallback:
             resp = client.get("/api/health")
             assert resp.json()["provider_configured"] is False
 
-    def test_generate_500_when_all_providers_fail(self):
+    def test_unknown_provider_reported_as_not_configured(self):
+        app, mock_retriever, _, fresh_limiter = _setup()
+
+        with (
+            patch("retrieve._retriever", mock_retriever),
+            patch.dict(os.environ, {"LLM_PROVIDER": "openrouter"}, clear=True),
+            patch("api.dependencies.limiter", fresh_limiter),
+            patch("api.routes.limiter", fresh_limiter),
+            TestClient(app) as client,
+        ):
+            resp = client.get("/api/health")
+            assert resp.status_code == 200
+            assert resp.json()["provider_configured"] is False
+
+            resp = client.post("/api/generate", json={"query": "add numbers"})
+            assert resp.status_code == 503
+            assert "openrouter" in resp.json()["detail"]
+
+    def test_generate_degrades_when_all_providers_fail(self):
         app, mock_retriever, env, fresh_limiter = _setup(
             env_overrides={"LLM_FALLBACK_PROVIDER": "vllm"},
         )
@@ -140,5 +158,99 @@ class TestProviderFallback:
             patch("providers._call_vllm", mock_vllm),
             TestClient(app, raise_server_exceptions=False) as client,
         ):
-            resp = client.post("/api/generate", json={"message": "add numbers"})
+            resp = client.post("/api/generate", json={"query": "add numbers"})
+            assert resp.status_code == 200
+            data = resp.json()
+            assert data["degraded"] is True
+            assert data["generated_code"] is None
+            assert data["retrieved_functions"][0]["function_name"] == "addNumbers"
+            assert resp.headers["Retry-After"] == str(data["retry_after"])
+
+            # Degraded answers are not cached; the next request tries the LLM again.
+            mock_anthropic.side_effect = None
+            mock_anthropic.return_value = MOCK_LLM_OUTPUT
+            resp = client.post("/api/generate", json={"query": "add numbers"})
+            assert resp.json()["degraded"] is False
+            assert resp.json()["generated_code"] == MOCK_LLM_OUTPUT
+
+    def test_generate_500_when_degraded_mode_disabled(self):
+        app, mock_retriever, env, fresh_limiter = _setup(
+            env_overrides={"GENERATION_DEGRADED_MODE": "false"},
+        )
+        mock_anthropic = MagicMock(side_effect=RuntimeError("primary down"))
+
+        with (
+            patch("retrieve._retriever", mock_retriever),
+            patch.dict(os.environ, env, clear=True),
+            patch("api.dependencies.limiter", fresh_limiter),
+            patch("api.routes.limiter", fresh_limiter),
+            patch("providers._call_anthropic", mock_anthropic),
+            TestClient(app, raise_server_exceptions=False) as client,
+        ):
+            resp = client.post("/api/generate", json={"query": "add numbers"})
             assert resp.status_code == 500
+
+    def test_generate_degrades_when_saturated(self):
+        app, mock_retriever, env, fresh_limiter = _setup(
+            env_overrides={"GENERATION_MAX_IN_FLIGHT": "0", "GENERATION_QUEUE_TIMEOUT_S": "0"},
+        )
+        mock_anthropic = MagicMock(return_value=MOCK_LLM_OUTPUT)
+
+        with (
+            patch("retrieve._retriever", mock_retriever),
+            patch.dict(os.environ, env, clear=True),
+            patch("api.dependencies.limiter", fresh_limiter),
+            patch("api.routes.limiter", fresh_limiter),
+            patch("providers._call_anthropic", mock_anthropic),
+            TestClient(app) as client,
+        ):
+            resp = client.post("/api/generate", json={"query": "add numbers"})
+            assert resp.status_code == 200
+            assert resp.json()["degraded"] is True
+            assert "saturated" in resp.json()["degraded_reason"]
+            assert "Retry-After" in resp.headers
+            mock_anthropic.assert_not_called()
+
+    def test_knowledge_base_answer_bypasses_saturated_queue(self):
+        app, mock_retriever, env, fresh_limiter = _setup(
+            env_overrides={"GENERATION_MAX_IN_FLIGHT": "0", "GENERATION_MAX_QUEUE": "0"},
+        )
+        mock_retriever.retrieve.return_value = [dict(MOCK_RETRIEVE_RESULT[0], score=6.0, rerank_score=6.0)]
+        mock_anthropic = MagicMock(return_value=MOCK_LLM_OUTPUT)
+
+        with (
+            patch("retrieve._retriever", mock_retriever),
+            patch.dict(os.environ, env, clear=True),
+            patch("api.dependencies.limiter", fresh_limiter),
+            patch("api.routes.limiter", fresh_limiter),
+            patch("providers._call_anthropic", mock_anthropic),
+            TestClient(app) as client,
+        ):
+            resp = client.post("/api/generate", json={"query": "add numbers"})
+            assert resp.status_code == 200
+            assert resp.json()["source"] == "knowledge_base"
+            assert resp.json()["degraded"] is False
+            mock_anthropic.assert_not_called()
+
+    def test_generate_503_when_queue_full(self):
+        app, mock_retriever, env, fresh_limiter = _setup(
+            env_overrides={"GENERATION_MAX_IN_FLIGHT": "0", "GENERATION_MAX_QUEUE": "0"},
+        )
+        mock_anthropic = MagicMock(return_value=MOCK_LLM_OUTPUT)
+
+        with (
+            patch("retrieve._retriever", mock_retriever),
+            patch.dict(os.environ, env, clear=True),
+            patch("api.dependencies.limiter", fresh_limiter),
+            patch("api.routes.limiter", fresh_limiter),
+            patch("providers._call_anthropic", mock_anthropic),
+            TestClient(app) as client,
+        ):
+            resp = client.post("/api/generate", json={"query": "add numbers"})
+            assert resp.status_code == 503
+            assert int(resp.headers["Retry-After"]) >= 1
+            mock_anthropic.assert_not_called()
+
+            metrics = client.get("/api/metrics").text
+            assert "avp_generation_rejected_total 1" in metrics
+            assert "avp_generation_queue_depth 0" in metrics
@@ -0,0 +1,148 @@
+"""Conformance tests for the hand-written front end in fastparse.py against the ANTLR parser."""
+
+import glob
+import os
+import random
+import re
+
+import pytest
+from antlr4 import CommonTokenStream, InputStream
+
+import fastparse
+from ingest import CodeStructureVisitor, parse_file
+from parsing import parse_program
+from PseudocodeLexer import PseudocodeLexer
+from PseudocodeParser import PseudocodeParser
+from validation import CollectingErrorListener, validate_code
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+DATA_FILES = sorted(glob.glob(os.path.join(DATA_DIR, "*.avp")))
+
+_POSITION_RE = re.compile(r"line (\d+):(\d+) ")
+_INSERTS = [
+    "(", ")", "[", "]", "=", "+=", "-", "**", ",", ";", ":", "\n", " ", "x", "1", "2.5", '"s"',
+    "fun", "end", "if", "else", "for", "in", "arr", "to", "return", "break", "while", "and",
+    "<", "==", "@a<b>", "@", "#", '"', "\r", ".",
+]
+
+
+def _antlr(code):
+    listener = CollectingErrorListener()
+    lexer = PseudocodeLexer(InputStream(code))
+    lexer.removeErrorListeners()
+    lexer.addErrorListener(listener)
+    parser = PseudocodeParser(CommonTokenStream(lexer))
+    parser.removeErrorListeners()
+    parser.addErrorListener(listener)
+    tree = parse_program(parser)
+    visitor = CodeStructureVisitor()
+    if not listener.errors:  # the visitor expects a complete tree
+        visitor.visit(tree)
+    return visitor.functions, listener.errors
+
+
+def _first_position(errors):
+    return min((tuple(map(int, _POSITION_RE.match(e).groups())) for e in errors), default=None)
+
+
+def _lexer_errors(errors):
+    return [e for e in errors if "token recognition error" in e]
+
+
+def _assert_conforms(code):
+    functions, errors = _antlr(code)
+    result = fastparse.parse(code)
+    assert bool(result.errors) == bool(errors), (code, errors, result.errors)
+    assert _first_position(result.errors) == _first_position(errors), (code, errors, result.errors)
+    assert _lexer_errors(result.errors) == _lexer_errors(errors), code
+    if not errors:
+        assert result.functions == functions, code
+    return not errors
+
+
+def _mutations(rng, count):
+    sources = []
+    for path in DATA_FILES:
+        with open(path) as f:
+            sources.append(f.read())
+    for _ in range(count):
+        pieces = re.findall(r"\w+|\s|.", rng.choice(sources))
+        for _ in range(rng.randint(0, 3)):
+            i = rng.randrange(len(pieces))
+            edit = rng.randrange(3)
+            if edit == 0:
+                del pieces[i]
+            elif edit == 1:
+                pieces.insert(i, rng.choice(_INSERTS))
+            else:
+                pieces[i] = rng.choice(_INSERTS)
+        yield "".join(pieces)
+
+
+class TestConformance:
+    @pytest.mark.parametrize("path", DATA_FILES)
+    def test_data_file_chunks_match_antlr(self, path):
+        with open(path) as f:
+            code = f.read()
+        expected, errors = _antlr(code)
+        assert errors == []
+        assert fastparse.parse(code, source_file=path).functions == [
+            dict(chunk, source_file=path) for chunk in expected
+        ]
+
+    def test_fuzzed_data_files(self):
+        valid = invalid = 0
+        for code in _mutations(random.Random(48), 150):
+            ok = _assert_conforms(code)
+            valid += ok
+            invalid += not ok
+        assert valid > 20 and invalid > 20
+
+    @pytest.mark.parametrize(
+        "code",
+        [
+            'x = "open\ny = 1\n',  # unterminated string swallows the newline
+            "x = 1.\n",  # FLOAT backs off to INT, then '.' is skipped
+            "x = 1\r y = 2\n",  # lone carriage return
+            "fun f(:\nend fun\n",
+            "if (x):\n    y = 1\nelse z\nend if\n",
+            "@a<b> fun f():\nend fun\n",
+            "x = 1 +\n",
+            "\n\n",
+            "x = (((1)\n",
+        ],
+    )
+    def test_error_edge_cases(self, code):
+        assert not _assert_conforms(code)
+
+    def test_crlf_and_nested_functions(self):
+        code = "fun outer(a):\r\n    fun inner(@init<t> b):\r\n        return b\r\n    end fun\r\n    return inner(a)\r\nend fun\r\n"
+        assert _assert_conforms(code)
+        assert [f["name"] for f in fastparse.parse(code).functions] == ["outer", "inner"]
+
+
+class TestFrontendSelection:
+    def test_ingest_parse_file_fast_matches_antlr(self, monkeypatch):
+        path = DATA_FILES[0]
+        expected = parse_file(path, source_file="x.avp", frontend="antlr")
+        monkeypatch.setenv("PARSER_FRONTEND", "fast")
+        assert parse_file(path, source_file="x.avp") == expected
+
+    def test_ingest_falls_back_to_antlr_on_errors(self, tmp_path):
+        path = tmp_path / "bad.avp"
+        path.write_text("fun f(x):\n    return 1\nend fun\nx = (\n")
+        chunks = parse_file(str(path), frontend="fast")
+        assert [c["name"] for c in chunks] == ["f"]  # recovered by ANTLR
+
+    def test_validate_code_keeps_antlr_messages(self, monkeypatch):
+        monkeypatch.setenv("PARSER_FRONTEND", "fast")
+        assert validate_code("x = 1\n").valid
+        result = validate_code("x = (1\n")
+        assert not result.valid
+        monkeypatch.setenv("PARSER_FRONTEND", "antlr")
+        assert validate_code("x = (1\n").errors == result.errors
+
+    def test_unknown_frontend_rejected(self, monkeypatch):
+        monkeypatch.setenv("PARSER_FRONTEND", "yacc")
+        with pytest.raises(ValueError):
+            fastparse.frontend()
@@ -0,0 +1,230 @@
+"""Unit tests for prompt assembly and generate_code in generate.py"""
+
+from unittest.mock import patch
+
+import pytest
+
+from generate import SYSTEM_PROMPT, _build_prompt, generate_code
+from tests.conftest import MOCK_LLM_OUTPUT, MOCK_RETRIEVE_RESULT
+
+
+class TestPromptLayout:
+    def test_static_prefix_not_in_user_message(self):
+        prompt = _build_prompt("add numbers", MOCK_RETRIEVE_RESULT)
+        assert "Rules:" not in prompt
+        assert "Rules:" in SYSTEM_PROMPT
+        assert prompt.rstrip().endswith("TASK: add numbers")
+
+    def test_system_prompt_is_identical_across_requests(self):
+        seen = []
+
+        def fake_llm(prompt, options):
+            seen.append(options.system)
+            options.usage = {"prompt_tokens": 500, "cached_prompt_tokens": 400}
+            return MOCK_LLM_OUTPUT
+
+        with (
+            patch("generate.retrieve_code", return_value=MOCK_RETRIEVE_RESULT),
+            patch("generate.call_llm", side_effect=fake_llm),
+        ):
+            first = generate_code("add numbers")
+            generate_code("sort an array")
+
+        assert seen == [SYSTEM_PROMPT, SYSTEM_PROMPT]
+        assert first["usage"]["prompt_tokens"] == 500
+        assert first["usage"]["cached_prompt_tokens"] == 400
+
+
+class TestContextPacking:
+    def test_reference_block_respects_budget(self, monkeypatch):
+        long_code = "fun long_one():\n" + "    x = 1\n" * 400 + "end fun"
+        retrieved = MOCK_RETRIEVE_RESULT + [
+            {"score": 0.5, "function_name": "long_one", "parameters": [], "code": long_code}
+        ]
+        monkeypatch.setenv("PROMPT_REFERENCE_TOKEN_BUDGET", "200")
+        with (
+            patch("generate.retrieve_code", return_value=retrieved),
+            patch("generate.call_llm", return_value=MOCK_LLM_OUTPUT) as mock_llm,
+        ):
+            result = generate_code("add numbers", k=2)
+
+        prompt = mock_llm.call_args.args[0]
+        assert "fun addNumbers(a, b)" in prompt
+        assert prompt.count("x = 1") < 400
+        assert result["usage"]["reference_tokens"] <= 200
+        assert result["usage"]["snippets_truncated"] == 1
+        assert result["usage"]["counted_prompt_tokens"] > result["usage"]["reference_tokens"]
+        # The API still reports the untruncated retrieved functions.
+        assert result["retrieved_functions"] == retrieved
+
+
+class TestRepairLoop:
+    def test_invalid_output_is_repaired_once(self):
+        prompts = []
+        replies = iter(["fun broken(:\n    return 1", "```avp\n" + MOCK_LLM_OUTPUT + "\n```"])
+
+        def fake_llm(prompt, options):
+            prompts.append(prompt)
+            options.usage = {"prompt_tokens": 100, "cached_prompt_tokens": 80}
+            return next(replies)
+
+        with (
+            patch("generate.retrieve_code", return_value=MOCK_RETRIEVE_RESULT),
+            patch("generate.call_llm", side_effect=fake_llm),
+        ):
+            result = generate_code("add numbers")
+
+        assert len(prompts) == 2
+        assert "fun broken(:" in prompts[1]
+        assert "The parser reported:" in prompts[1]
+        assert result["generated_code"] == MOCK_LLM_OUTPUT
+        assert result["valid"] is True
+        assert result["repairs"] == 1
+        assert result["usage"]["prompt_tokens"] == 200
+        assert result["usage"]["cached_prompt_tokens"] == 160
+
+    def test_repairs_are_bounded(self, monkeypatch):
+        monkeypatch.setenv("GENERATION_MAX_REPAIRS", "1")
+        with (
+            patch("generate.retrieve_code", return_value=MOCK_RETRIEVE_RESULT),
+            patch("generate.call_llm", return_value="def python_style():") as mock_llm,
+        ):
+            result = generate_code("add numbers")
+
+        assert mock_llm.call_count == 2
+        assert result["valid"] is False
+        assert result["repairs"] == 1
+        assert result["validation_errors"]
+
+    def test_valid_output_needs_no_repair(self):
+        with (
+            patch("generate.retrieve_code", return_value=MOCK_RETRIEVE_RESULT),
+            patch("generate.call_llm", return_value=MOCK_LLM_OUTPUT) as mock_llm,
+        ):
+            result = generate_code("add numbers")
+
+        assert mock_llm.call_count == 1
+        assert result["valid"] is True
+        assert result["repairs"] == 0
+
+
+class TestOutputBudget:
+    def test_max_tokens_scales_with_reference_length(self, monkeypatch):
+        monkeypatch.setenv("GENERATION_OUTPUT_TOKEN_FACTOR", "2")
+        monkeypatch.setenv("GENERATION_MIN_OUTPUT_TOKENS", "16")
+        seen = []
+
+        def fake_llm(prompt, options):
+            seen.append(options.max_tokens)
+            return MOCK_LLM_OUTPUT
+
+        with (
+            patch("generate.retrieve_code", return_value=MOCK_RETRIEVE_RESULT),
+            patch("generate.call_llm", side_effect=fake_llm),
+        ):
+            result = generate_code("add numbers")
+
+        # MOCK_RETRIEVE_RESULT's code is 46 chars, about 12 estimated tokens
+        assert seen == [24]
+        assert result["usage"]["max_output_tokens"] == 24
+
+
+KB_HIT = [
+    {
+        "score": 6.2,
+        "rerank_score": 6.2,
+        "function_name": "Binary_Search",
+        "parameters": ["collection", "target", "size"],
+        "code": "fun Binary_Search(collection, target, size):\n    return -1\nend fun",
+    }
+]
+
+
+class TestKnowledgeBaseShortCircuit:
+    def test_confident_name_match_skips_llm(self):
+        with (
+            patch("generate.retrieve_code", return_value=KB_HIT),
+            patch("generate.call_llm") as mock_llm,
+        ):
+            result = generate_code("binary search")
+
+        mock_llm.assert_not_called()
+        assert result["source"] == "knowledge_base"
+        assert result["generated_code"] == KB_HIT[0]["code"]
+        assert result["valid"] is True
+
+    def test_name_mismatch_goes_to_llm(self):
+        with (
+            patch("generate.retrieve_code", return_value=KB_HIT),
+            patch("generate.call_llm", return_value=MOCK_LLM_OUTPUT) as mock_llm,
+        ):
+            result = generate_code("ternary search over a sorted array")
+
+        mock_llm.assert_called_once()
+        assert result["source"] == "llm"
+
+    @pytest.mark.parametrize(
+        "function_name, request_text",
+        [
+            ("Insertion_Sort", "insertion sort in descending order"),
+            ("Binary_Search", "binary search tree insertion"),
+            ("sum_array", "sum of the squares of odd numbers in a matrix"),
+        ],
+    )
+    def test_request_with_extra_qualifiers_goes_to_llm(self, function_name, request_text):
+        hit = [dict(KB_HIT[0], function_name=function_name)]
+        with (
+            patch("generate.retrieve_code", return_value=hit),
+            patch("generate.call_llm", return_value=MOCK_LLM_OUTPUT) as mock_llm,
+        ):
+            result = generate_code(request_text)
+
+        mock_llm.assert_called_once()
+        assert result["source"] == "llm"
+
+    def test_filler_words_in_request_are_ignored(self):
+        with (
+            patch("generate.retrieve_code", return_value=KB_HIT),
+            patch("generate.call_llm") as mock_llm,
+        ):
+            result = generate_code("Write a function for binary searching")
+
+        mock_llm.assert_not_called()
+        assert result["source"] == "knowledge_base"
+
+    def test_low_score_goes_to_llm(self, monkeypatch):
+        monkeypatch.setenv("KB_SHORTCIRCUIT_MIN_SCORE", "7")
+        with (
+            patch("generate.retrieve_code", return_value=KB_HIT),
+            patch("generate.call_llm", return_value=MOCK_LLM_OUTPUT) as mock_llm,
+        ):
+            generate_code("binary search")
+        mock_llm.assert_called_once()
+
+    def test_unreranked_hit_uses_similarity_threshold(self):
+        # Without the reranker (or when a deadline skipped it) score is a cosine similarity.
+        hit = {k: v for k, v in KB_HIT[0].items() if k != "rerank_score"}
+        with (
+            patch("generate.retrieve_code", return_value=[dict(hit, score=0.82)]),
+            patch("generate.call_llm") as mock_llm,
+        ):
+            result = generate_code("binary search")
+        mock_llm.assert_not_called()
+        assert result["source"] == "knowledge_base"
+
+        with (
+            patch("generate.retrieve_code", return_value=[dict(hit, score=0.6)]),
+            patch("generate.call_llm", return_value=MOCK_LLM_OUTPUT) as mock_llm,
+        ):
+            result = generate_code("binary search")
+        mock_llm.assert_called_once()
+        assert result["source"] == "llm"
+
+    def test_can_be_disabled(self, monkeypatch):
+        monkeypatch.setenv("KB_SHORTCIRCUIT", "false")
+        with (
+            patch("generate.retrieve_code", return_value=KB_HIT),
+            patch("generate.call_llm", return_value=MOCK_LLM_OUTPUT) as mock_llm,
+        ):
+            generate_code("binary search")
+        mock_llm.assert_called_once()
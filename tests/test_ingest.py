@@ -0,0 +1,40 @@
+"""Unit tests for parallel parsing in ingest.py"""
+
+import glob
+import os
+
+from ingest import parse_file, parse_files
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+DATA_FILES = sorted(glob.glob(os.path.join(DATA_DIR, "*.avp")))
+
+
+class TestParseFiles:
+    def test_serial_matches_parse_file(self):
+        results = parse_files(DATA_FILES, serial=True)
+        assert [path for path, _, _ in results] == DATA_FILES
+        for path, chunks, error in results:
+            assert error is None
+            assert chunks == parse_file(path, source_file=path)
+
+    def test_parallel_matches_serial_in_input_order(self):
+        paths = list(reversed(DATA_FILES))
+        parallel = parse_files(paths, workers=2, chunksize=3)
+        assert parallel == parse_files(paths, serial=True)
+        assert [path for path, _, _ in parallel] == paths
+
+    def test_errors_are_collected_per_file(self, tmp_path):
+        missing = str(tmp_path / "missing.avp")
+        results = parse_files([DATA_FILES[0], missing, DATA_FILES[1]], workers=2, chunksize=1)
+        assert [path for path, _, _ in results] == [DATA_FILES[0], missing, DATA_FILES[1]]
+        assert results[0][2] is None and results[2][2] is None
+        path, chunks, error = results[1]
+        assert chunks == [] and error
+
+    def test_ingest_workers_env(self, monkeypatch):
+        from ingest import ingest_workers
+
+        monkeypatch.setenv("INGEST_WORKERS", "3")
+        assert ingest_workers() == 3
+        monkeypatch.setenv("INGEST_WORKERS", "0")
+        assert ingest_workers() == (os.cpu_count() or 1)
@@ -0,0 +1,80 @@
+"""Tests for the async job API (POST /api/jobs, GET /api/jobs/{id})"""
+
+import asyncio
+
+from api.jobs import JobQueueFull, JobStore
+from tests.conftest import MOCK_LLM_OUTPUT
+
+
+class TestJobEndpoints:
+    def test_submit_and_wait_for_result(self, client):
+        resp = client.post("/api/jobs", json={"query": "add numbers"})
+        assert resp.status_code == 202
+        job_id = resp.json()["job_id"]
+        assert resp.json()["status"] in ("queued", "running", "done")
+
+        resp = client.get(f"/api/jobs/{job_id}", params={"wait": 5})
+        data = resp.json()
+        assert data["status"] == "done"
+        assert data["result"]["generated_code"] == MOCK_LLM_OUTPUT
+
+    def test_completed_job_populates_generation_cache(self, client):
+        job_id = client.post("/api/jobs", json={"query": "add numbers"}).json()["job_id"]
+        client.get(f"/api/jobs/{job_id}", params={"wait": 5})
+
+        resp = client.post("/api/generate", json={"query": "add numbers"})
+        assert resp.json()["cached"] is True
+
+        # And a cached query comes back as an already finished job.
+        resp = client.post("/api/jobs", json={"query": "add numbers"})
+        assert resp.json()["status"] == "done"
+        assert resp.json()["result"]["cached"] is True
+
+    def test_unknown_job_is_404(self, client):
+        assert client.get("/api/jobs/does-not-exist").status_code == 404
+
+
+class TestJobStore:
+    def test_failed_handler_marks_job_failed(self):
+        async def handler(query):
+            raise RuntimeError(f"cannot generate {query}")
+
+        async def scenario():
+            store = JobStore(handler, workers=1)
+            store.start()
+            job = store.submit("x")
+            await store.wait(job, 5)
+            await store.stop()
+            return job
+
+        job = asyncio.run(scenario())
+        assert job.status == "failed"
+        assert job.error == "cannot generate x"
+
+    def test_queue_is_bounded(self):
+        async def handler(query):
+            return query
+
+        async def scenario():
+            store = JobStore(handler, workers=1, max_queue=1)  # workers not started
+            store.submit("a")
+            try:
+                store.submit("b")
+            except JobQueueFull:
+                return True
+            return False
+
+        assert asyncio.run(scenario())
+
+    def test_finished_jobs_expire(self):
+        async def handler(query):
+            return query
+
+        async def scenario():
+            store = JobStore(handler, ttl_s=0)
+            old = store.add_finished("a", "result")
+            old.finished_at -= 1
+            store.submit("b")  # submitting evicts expired jobs
+            return store.get(old.id)
+
+        assert asyncio.run(scenario()) is None
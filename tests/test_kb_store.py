@@ -0,0 +1,208 @@
+"""Unit tests for knowledge base storage backends in kb_store.py"""
+
+import json
+import os
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+
+import kb_store
+from kb_store import JsonStore, ShardedStore, SqliteStore, content_hash, empty_metadata, open_store
+
+
+def _chunk(source_file, name):
+    return {
+        "type": "function",
+        "name": name,
+        "parameters": [],
+        "code_content": f"fun {name}():\n    return 1\nend fun",
+        "source_file": source_file,
+    }
+
+
+def _metadata(*files):
+    metadata = empty_metadata()
+    for path in files:
+        metadata["source_files"][path] = {"hash": path, "functions": []}
+    return metadata
+
+
+class TestOpenStore:
+    def test_backend_from_path(self, tmp_path, monkeypatch):
+        assert isinstance(open_store(str(tmp_path / "kb.json")), JsonStore)
+        assert isinstance(open_store(str(tmp_path / "kb")), ShardedStore)
+        assert isinstance(open_store(str(tmp_path / "kb.sqlite")), SqliteStore)
+        monkeypatch.setenv("KB_PATH", str(tmp_path / "env.json"))
+        assert open_store().path == str(tmp_path / "env.json")
+
+
+@pytest.mark.parametrize("name", ["kb", "kb.json", "kb.sqlite"])
+class TestStoreContract:
+    def test_missing_store_is_empty(self, tmp_path, name):
+        store = open_store(str(tmp_path / name))
+        assert not store.exists()
+        assert store.load_metadata() == empty_metadata()
+        assert list(store.iter_chunks()) == []
+
+    def test_update_replaces_and_removes_per_file(self, tmp_path, name):
+        path = str(tmp_path / name)
+        total = open_store(path).update(
+            _metadata("a.avp", "b.avp"),
+            {"a.avp": [_chunk("a.avp", "a1"), _chunk("a.avp", "a2")], "b.avp": [_chunk("b.avp", "b")]},
+        )
+        assert total == 3
+
+        store = open_store(path)
+        total = store.update(_metadata("a.avp", "c.avp"), {"c.avp": [_chunk("c.avp", "c")]}, ["b.avp"])
+        assert total == 3
+        reopened = open_store(path)
+        assert sorted(c["name"] for c in reopened.iter_chunks()) == ["a1", "a2", "c"]
+        assert set(reopened.load_metadata()["source_files"]) == {"a.avp", "c.avp"}
+        assert reopened.count() == 3
+
+    def test_save_replaces_everything(self, tmp_path, name):
+        path = str(tmp_path / name)
+        open_store(path).save([_chunk("a.avp", "a"), _chunk("b.avp", "b")], _metadata("a.avp", "b.avp"))
+        open_store(path).save([_chunk("b.avp", "b2")], _metadata("b.avp"))
+        assert [c["name"] for c in open_store(path).iter_chunks()] == ["b2"]
+
+    def test_iter_chunks_selects_columns(self, tmp_path, name):
+        path = str(tmp_path / name)
+        open_store(path).save([_chunk("a.avp", "a")], _metadata("a.avp"))
+        chunks = list(open_store(path).iter_chunks(columns=("name", "parameters")))
+        assert chunks == [{"name": "a", "parameters": []}]
+
+
+class TestJsonStore:
+    def test_reads_legacy_list(self, tmp_path):
+        path = tmp_path / "kb.json"
+        path.write_text(json.dumps([_chunk("a.avp", "a")]))
+        store = JsonStore(str(path))
+        assert [c["name"] for c in store.iter_chunks()] == ["a"]
+        assert store.load_metadata() == empty_metadata()
+
+    def test_unknown_format_raises(self, tmp_path):
+        path = tmp_path / "kb.json"
+        path.write_text(json.dumps({"something": 1}))
+        with pytest.raises(ValueError):
+            list(JsonStore(str(path)).iter_chunks())
+
+
+class TestShardedStore:
+    def test_update_only_writes_changed_segments(self, tmp_path):
+        store = ShardedStore(str(tmp_path / "kb"))
+        store.update(_metadata("a.avp", "b.avp"), {"a.avp": [_chunk("a.avp", "a")], "b.avp": []})
+
+        with patch("kb_store.atomic_write", wraps=kb_store.atomic_write) as mock_write:
+            store.update(_metadata("a.avp", "b.avp"), {"b.avp": [_chunk("b.avp", "b")]})
+        written = [os.path.basename(call.args[0]) for call in mock_write.call_args_list]
+        assert written == [ShardedStore.segment_name("b.avp"), kb_store.MANIFEST]
+
+    def test_removed_segment_files_are_deleted(self, tmp_path):
+        store = ShardedStore(str(tmp_path / "kb"))
+        store.update(_metadata("a.avp"), {"a.avp": [_chunk("a.avp", "a")]})
+        segment = tmp_path / "kb" / kb_store.SEGMENTS / ShardedStore.segment_name("a.avp")
+        assert segment.exists()
+        store.update(empty_metadata(), {}, ["a.avp"])
+        assert not segment.exists()
+        assert store.count() == 0
+
+    def test_failed_write_leaves_previous_manifest(self, tmp_path):
+        path = str(tmp_path / "kb")
+        ShardedStore(path).update(_metadata("a.avp"), {"a.avp": [_chunk("a.avp", "a")]})
+
+        class Boom:
+            pass
+
+        with pytest.raises(TypeError):
+            ShardedStore(path).update(_metadata("a.avp"), {"a.avp": [{"bad": Boom()}]})
+        assert [c["name"] for c in ShardedStore(path).iter_chunks()] == ["a"]
+        assert not [f for f in os.listdir(tmp_path / "kb" / kb_store.SEGMENTS) if ".tmp-" in f]
+
+
+class TestSqliteStore:
+    def _store(self, tmp_path):
+        store = SqliteStore(str(tmp_path / "kb.sqlite"))
+        metadata = _metadata("a.avp", "b.avp")
+        metadata["source_files"]["a.avp"].update(mtime=1.5, size=10, functions=["a1", "a2"])
+        metadata["last_ingestion"] = "2026-01-01T00:00:00Z"
+        store.update(
+            metadata,
+            {"a.avp": [_chunk("a.avp", "a1"), _chunk("a.avp", "a2")], "b.avp": [_chunk("b.avp", "a1")]},
+        )
+        return store
+
+    def test_metadata_round_trip(self, tmp_path):
+        self._store(tmp_path).close()
+        metadata = SqliteStore(str(tmp_path / "kb.sqlite")).load_metadata()
+        assert metadata["last_ingestion"] == "2026-01-01T00:00:00Z"
+        assert metadata["source_files"]["a.avp"] == {
+            "hash": "a.avp", "mtime": 1.5, "size": 10, "functions": ["a1", "a2"]
+        }
+
+    def test_indexed_lookups(self, tmp_path):
+        store = self._store(tmp_path)
+        assert [c["source_file"] for c in store.find_by_name("a1")] == ["a.avp", "b.avp"]
+        assert [c["name"] for c in store.chunks_for_file("a.avp", columns=("name",))] == ["a1", "a2"]
+        indexes = {row[0] for row in store.conn.execute("SELECT name FROM sqlite_master WHERE type='index'")}
+        assert {"chunks_source_file", "chunks_name", "chunks_content_hash"} <= indexes
+        plan = " ".join(
+            str(row) for row in store.conn.execute("EXPLAIN QUERY PLAN SELECT * FROM chunks WHERE name = 'a1'")
+        )
+        assert "chunks_name" in plan
+
+    def test_failed_file_update_rolls_back(self, tmp_path):
+        store = self._store(tmp_path)
+        with pytest.raises(TypeError):
+            store.update(_metadata("a.avp", "b.avp"), {"a.avp": [{"name": "x", "parameters": [object()]}]})
+        assert [c["name"] for c in store.chunks_for_file("a.avp")] == ["a1", "a2"]
+
+    def test_removed_file_keeps_metadata_row_until_dropped(self, tmp_path):
+        store = self._store(tmp_path)
+        # A file that failed to parse loses its chunks but stays tracked.
+        store.update(_metadata("a.avp", "b.avp"), {}, ["b.avp"])
+        assert store.chunks_for_file("b.avp") == []
+        assert "b.avp" in store.load_metadata()["source_files"]
+        store.update(_metadata("a.avp"), {}, [])
+        assert "b.avp" not in store.load_metadata()["source_files"]
+
+    def test_embeddings_round_trip_and_prune(self, tmp_path):
+        store = self._store(tmp_path)
+        a1 = content_hash(_chunk("a.avp", "a1")["code_content"])
+        vector = np.arange(4, dtype="float32").tobytes()
+        store.put_embeddings("m", {a1: vector, "orphan": vector})
+        assert store.get_embeddings("m", [a1, "orphan"]) == {a1: vector}
+        assert store.get_embeddings("other-model", [a1]) == {}
+
+    def test_get_embeddings_batches_lookups(self, tmp_path):
+        store = self._store(tmp_path)
+        a1 = content_hash(_chunk("a.avp", "a1")["code_content"])
+        vector = np.arange(4, dtype="float32").tobytes()
+        store.put_embeddings("m", {a1: vector})
+        # More hashes than fit in one statement's host parameters.
+        wanted = [f"missing-{i}" for i in range(2000)] + [a1]
+        assert store.get_embeddings("m", wanted) == {a1: vector}
+
+
+class TestRetrieverEmbeddingCache:
+    def test_second_build_reuses_cached_vectors(self, tmp_path):
+        from retrieve import RETRIEVER_COLUMNS, CodeRetriever
+
+        store = TestSqliteStore()._store(tmp_path)
+
+        def build():
+            retriever = CodeRetriever.__new__(CodeRetriever)
+            retriever.store = SqliteStore(store.path)
+            retriever.knowledge_base = list(retriever.store.iter_chunks(columns=RETRIEVER_COLUMNS))
+            retriever.embedding_model_name = "m"
+            retriever.embedding_model = MagicMock()
+            retriever.embedding_model.encode.side_effect = lambda texts: np.ones((len(texts), 4))
+            retriever._build_index()
+            return retriever
+
+        first = build()
+        assert len(first.embedding_model.encode.call_args.args[0]) == 3
+        second = build()
+        second.embedding_model.encode.assert_not_called()
+        np.testing.assert_array_equal(first.embeddings, second.embeddings)
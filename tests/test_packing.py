@@ -0,0 +1,45 @@
+"""Unit tests for token-budget packing in packing.py"""
+
+from packing import TRUNCATION_MARKER, pack_snippets, render_reference_block
+
+
+def count_words(text: str) -> int:
+    return len(text.split())
+
+
+def snippet(name: str, lines: int) -> dict:
+    body = "\n".join(f"    x{i} = {i}" for i in range(lines))
+    return {"function_name": name, "code": f"fun {name}():\n{body}\nend fun"}
+
+
+class TestPackSnippets:
+    def test_everything_fits(self):
+        snippets = [snippet("a", 3), snippet("b", 3)]
+        packed, stats = pack_snippets(snippets, 1000, count_words)
+        assert packed == snippets
+        assert stats["snippets_truncated"] == stats["snippets_dropped"] == 0
+        assert stats["reference_tokens"] == count_words(render_reference_block(snippets))
+
+    def test_keeps_rank_order_and_truncates_overflow(self):
+        snippets = [snippet("first", 5), snippet("second", 50)]
+        packed, stats = pack_snippets(snippets, 60, count_words, min_truncated_tokens=10)
+        assert [s["function_name"] for s in packed] == ["first", "second"]
+        assert packed[0] is snippets[0]
+        assert packed[1]["truncated"] is True
+        assert packed[1]["code"].endswith(TRUNCATION_MARKER)
+        assert packed[1]["code"].startswith("fun second():")
+        assert stats["snippets_truncated"] == 1
+        assert stats["reference_tokens"] <= 60
+
+    def test_drops_when_too_little_room_but_fills_with_smaller(self):
+        snippets = [snippet("big", 40), snippet("huge", 100), snippet("tiny", 0)]
+        packed, stats = pack_snippets(snippets, 140, count_words, min_truncated_tokens=64)
+        assert [s["function_name"] for s in packed] == ["big", "tiny"]
+        assert stats["snippets_dropped"] == 1
+        assert stats["reference_tokens"] <= 140
+
+    def test_budget_never_exceeded(self):
+        snippets = [snippet(f"f{i}", 20 + i) for i in range(6)]
+        for budget in (10, 50, 120, 300):
+            _, stats = pack_snippets(snippets, budget, count_words, min_truncated_tokens=5)
+            assert stats["reference_tokens"] <= budget
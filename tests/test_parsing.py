@@ -0,0 +1,52 @@
+"""Unit tests for two-stage SLL/LL parsing in parsing.py"""
+
+import glob
+import os
+from unittest.mock import patch
+
+import pytest
+from antlr4 import CommonTokenStream, InputStream
+from antlr4.atn.PredictionMode import PredictionMode
+
+import parsing
+from parsing import parse_program
+from PseudocodeLexer import PseudocodeLexer
+from PseudocodeParser import PseudocodeParser
+from validation import CollectingErrorListener
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+
+
+def _parse(code, two_stage):
+    listener = CollectingErrorListener()
+    parser = PseudocodeParser(CommonTokenStream(PseudocodeLexer(InputStream(code))))
+    parser.removeErrorListeners()
+    parser.addErrorListener(listener)
+    tree = parse_program(parser, two_stage=two_stage)
+    return tree.toStringTree(recog=parser), listener.errors, parser
+
+
+class TestParseProgram:
+    @pytest.mark.parametrize("path", sorted(glob.glob(os.path.join(DATA_DIR, "*.avp"))))
+    def test_same_tree_as_full_ll(self, path):
+        with open(path) as f:
+            code = f.read()
+        two_stage_tree, errors, parser = _parse(code, two_stage=True)
+        assert errors == []
+        assert two_stage_tree == _parse(code, two_stage=False)[0]
+        # SLL sufficed, so no LL retry happened.
+        assert parser._interp.predictionMode == PredictionMode.SLL
+
+    def test_syntax_error_falls_back_and_reports_once(self):
+        code = "fun f(x):\n    return x +\nend fun\n"
+        _, errors, parser = _parse(code, two_stage=True)
+        assert errors and errors == _parse(code, two_stage=False)[1]
+        assert parser._interp.predictionMode == PredictionMode.LL
+        # The caller's listeners are back in place after the SLL pass.
+        assert any(isinstance(l, CollectingErrorListener) for l in parser._listeners)
+
+    def test_env_disables_two_stage(self, monkeypatch):
+        monkeypatch.setenv("PARSER_TWO_STAGE", "false")
+        with patch("parsing._parse_ll", wraps=parsing._parse_ll) as mock_ll:
+            _parse("fun f():\n    return 1\nend fun\n", two_stage=None)
+        mock_ll.assert_called_once()
@@ -0,0 +1,152 @@
+"""Tests for the ordered provider chain, using fake slow/flaky/dead backends."""
+
+import os
+import time
+from unittest.mock import patch
+
+import pytest
+
+from providers import DeadlineExceeded, ProviderConfig, call_llm, get_provider_chain
+
+
+class FakeBackends:
+    """Stands in for ``_call_vllm``/``_call_anthropic``, dispatching on hop name."""
+
+    def __init__(self, **behaviours):
+        self.behaviours = behaviours
+        self.calls: list[tuple[str, float]] = []
+
+    def __call__(self, prompt, config, options=None):
+        self.calls.append((config.name, config.read_timeout))
+        return self.behaviours[config.name](config)
+
+    def attempts(self, name):
+        return sum(1 for n, _ in self.calls if n == name)
+
+
+def dead(config):
+    raise ConnectionError(f"{config.name}: connection refused")
+
+
+def flaky(failures):
+    remaining = [failures]
+
+    def backend(config):
+        if remaining[0] > 0:
+            remaining[0] -= 1
+            raise ConnectionError(f"{config.name}: reset by peer")
+        return f"{config.name} ok"
+
+    return backend
+
+
+def slow(delay):
+    # Behaves like a client with a read timeout: gives up after config.read_timeout.
+    def backend(config):
+        if delay > config.read_timeout:
+            time.sleep(config.read_timeout)
+            raise TimeoutError(f"{config.name}: read timed out")
+        time.sleep(delay)
+        return f"{config.name} ok"
+
+    return backend
+
+
+def healthy(config):
+    return f"{config.name} ok"
+
+
+CHAIN_ENV = {
+    "LLM_PROVIDER_CHAIN": "vllm-local, vllm-secondary, anthropic",
+    "LLM_RETRY_BACKOFF_S": "0.001",
+    "LLM_RETRY_BACKOFF_MAX_S": "0.002",
+    "VLLM_MAX_RETRIES": "2",
+}
+
+
+def _run(backends, env=None):
+    merged = dict(CHAIN_ENV, **(env or {}))
+    with (
+        patch.dict(os.environ, merged, clear=True),
+        patch("providers._call_vllm", backends),
+        patch("providers._call_anthropic", backends),
+    ):
+        return call_llm("prompt")
+
+
+class TestChainConfig:
+    def test_chain_order_from_env(self):
+        with patch.dict(os.environ, CHAIN_ENV, clear=True):
+            assert get_provider_chain() == ["vllm-local", "vllm-secondary", "anthropic"]
+
+    def test_legacy_primary_and_fallback(self):
+        env = {"LLM_PROVIDER": "vllm", "LLM_FALLBACK_PROVIDER": "anthropic"}
+        with patch.dict(os.environ, env, clear=True):
+            assert get_provider_chain() == ["vllm", "anthropic"]
+
+    def test_unknown_provider_rejected(self):
+        with patch.dict(os.environ, {"LLM_PROVIDER_CHAIN": "vllm,openrouter"}, clear=True):
+            with pytest.raises(ValueError, match="openrouter"):
+                get_provider_chain()
+
+    def test_per_hop_settings_fall_back_to_kind(self):
+        env = {
+            "VLLM_SECONDARY_READ_TIMEOUT_S": "12",
+            "VLLM_READ_TIMEOUT_S": "30",
+            "VLLM_CONNECT_TIMEOUT_S": "2",
+            "VLLM_SECONDARY_BASE_URL": "http://gpu2:8001/v1",
+            "VLLM_BASE_URL": "http://gpu1:8001/v1",
+        }
+        with patch.dict(os.environ, env, clear=True):
+            secondary = ProviderConfig.from_env("vllm-secondary")
+            local = ProviderConfig.from_env("vllm-local")
+        assert (secondary.kind, secondary.read_timeout, secondary.connect_timeout) == ("vllm", 12.0, 2.0)
+        assert local.read_timeout == 30.0
+        with patch.dict(os.environ, env, clear=True):
+            assert secondary.env("BASE_URL") == "http://gpu2:8001/v1"
+            assert local.env("BASE_URL") == "http://gpu1:8001/v1"
+
+
+class TestChainFallback:
+    def test_flaky_primary_recovers_within_retry_budget(self):
+        backends = FakeBackends(**{"vllm-local": flaky(2), "vllm-secondary": healthy, "anthropic": healthy})
+        assert _run(backends) == "vllm-local ok"
+        assert backends.attempts("vllm-local") == 3
+        assert backends.attempts("vllm-secondary") == 0
+
+    def test_dead_primary_exhausts_retries_then_moves_on(self):
+        backends = FakeBackends(**{"vllm-local": dead, "vllm-secondary": healthy, "anthropic": healthy})
+        assert _run(backends) == "vllm-secondary ok"
+        assert backends.attempts("vllm-local") == 3
+
+    def test_non_retryable_error_skips_to_next_hop(self):
+        def bad_request(config):
+            raise ValueError("invalid model")
+
+        backends = FakeBackends(**{"vllm-local": bad_request, "vllm-secondary": healthy, "anthropic": healthy})
+        assert _run(backends) == "vllm-secondary ok"
+        assert backends.attempts("vllm-local") == 1
+
+    def test_slow_hop_is_cut_off_by_its_read_timeout(self):
+        backends = FakeBackends(**{"vllm-local": slow(5.0), "vllm-secondary": dead, "anthropic": healthy})
+        env = {"VLLM_LOCAL_READ_TIMEOUT_S": "0.05", "VLLM_LOCAL_MAX_RETRIES": "0", "VLLM_SECONDARY_MAX_RETRIES": "0"}
+        started = time.monotonic()
+        assert _run(backends, env) == "anthropic ok"
+        assert time.monotonic() - started < 1.0
+        assert backends.calls[0] == ("vllm-local", 0.05)
+
+    def test_global_deadline_bounds_the_whole_call(self):
+        backends = FakeBackends(**{"vllm-local": slow(5.0), "vllm-secondary": slow(5.0), "anthropic": slow(5.0)})
+        env = {"LLM_DEADLINE_S": "0.3", "VLLM_READ_TIMEOUT_S": "0.2", "ANTHROPIC_READ_TIMEOUT_S": "0.2"}
+        started = time.monotonic()
+        with pytest.raises(DeadlineExceeded):
+            _run(backends, env)
+        assert time.monotonic() - started < 0.6
+        # Later hops only get what is left of the global budget.
+        assert all(timeout <= 0.2 for _, timeout in backends.calls)
+        assert backends.calls[-1][1] < 0.2
+
+    def test_all_dead_reraises_last_error(self):
+        backends = FakeBackends(**{"vllm-local": dead, "vllm-secondary": dead, "anthropic": dead})
+        with pytest.raises(ConnectionError, match="anthropic"):
+            _run(backends)
@@ -4,18 +4,27 @@ import os
 import sys
 from unittest.mock import patch, MagicMock
 
+import openai
 import pytest
 
 # Ensure project root is importable
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from deadline import Deadline
 from providers import (
+    CallOptions,
+    CircuitBreaker,
+    DeadlineExceeded,
+    EndpointBalancer,
     _call_anthropic,
     _call_vllm,
     call_llm,
+    get_breaker,
     is_provider_configured,
     get_provider_name,
+    provider_health,
 )
+from stopping import STOP_SEQUENCES
 
 
 class TestCallAnthropic:
@@ -51,14 +60,50 @@ class TestCallVllm:
         mock_response.choices = [mock_choice]
         mock_client.chat.completions.create.return_value = mock_response
 
-        result = _call_vllm("hello")
+        with patch.dict(os.environ, {}, clear=True):
+            result = _call_vllm("hello")
 
         assert result == "vllm output"
         mock_cls.assert_called_once_with(
-            base_url="http://vllm:8080/v1", api_key="token-placeholder"
+            base_url="http://localhost:8001/v1",
+            api_key="token-placeholder",
+            timeout=openai.Timeout(60.0, connect=5.0),
+            max_retries=0,
         )
 
 
+    @patch("providers.openai.OpenAI")
+    def test_balances_across_endpoints_and_ejects_failures(self, mock_cls):
+        mock_client = MagicMock()
+        mock_cls.return_value = mock_client
+        mock_choice = MagicMock()
+        mock_choice.message.content = "vllm output"
+        mock_client.chat.completions.create.return_value = MagicMock(choices=[mock_choice])
+
+        def base_url_of(call):
+            return call.kwargs["base_url"]
+
+        env = {"VLLM_BASE_URL": "http://gpu1:8001/v1, http://gpu2:8001/v1", "VLLM_EJECT_AFTER": "1"}
+        with patch.dict(os.environ, env, clear=True):
+            _call_vllm("a")
+            _call_vllm("b")
+            assert [base_url_of(c) for c in mock_cls.call_args_list] == [
+                "http://gpu1:8001/v1",
+                "http://gpu2:8001/v1",
+            ]
+
+            mock_client.chat.completions.create.side_effect = openai.APIConnectionError(request=MagicMock())
+            with pytest.raises(openai.APIConnectionError):
+                _call_vllm("c")
+            failed = base_url_of(mock_cls.call_args_list[-1])
+
+            mock_client.chat.completions.create.side_effect = None
+            mock_cls.reset_mock()
+            for _ in range(3):
+                _call_vllm("d")
+            assert failed not in {base_url_of(c) for c in mock_cls.call_args_list}
+
+
 class TestCallLlm:
     @patch("providers._call_anthropic")
     def test_dispatches_to_anthropic(self, mock_anthropic):
@@ -93,6 +138,163 @@ class TestCallLlm:
                 call_llm("prompt")
 
 
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestCircuitBreaker:
+    def _breaker(self, clock, **kwargs):
+        params = {"min_calls": 3, "error_rate": 0.5, "slow_call_s": 5.0, "cooldown_s": 10.0}
+        params.update(kwargs)
+        return CircuitBreaker("test", clock=clock, **params)
+
+    def test_opens_after_error_rate_reached(self):
+        breaker = self._breaker(FakeClock())
+        for _ in range(3):
+            breaker.record(0.1, error=True)
+        assert breaker.state == CircuitBreaker.OPEN
+        assert breaker.allow_request() is False
+
+    def test_stays_closed_below_min_calls(self):
+        breaker = self._breaker(FakeClock())
+        breaker.record(0.1, error=True)
+        breaker.record(0.1, error=True)
+        assert breaker.state == CircuitBreaker.CLOSED
+
+    def test_slow_calls_count_as_failures(self):
+        breaker = self._breaker(FakeClock())
+        for _ in range(3):
+            breaker.record(6.0, error=False)
+        assert breaker.state == CircuitBreaker.OPEN
+
+    def test_half_open_single_probe_then_close(self):
+        clock = FakeClock()
+        breaker = self._breaker(clock)
+        for _ in range(3):
+            breaker.record(0.1, error=True)
+        clock.now = 10.0
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        assert breaker.allow_request() is True
+        assert breaker.allow_request() is False  # only one probe at a time
+        breaker.record(0.1, error=False)
+        assert breaker.state == CircuitBreaker.CLOSED
+
+    def test_failed_probe_reopens(self):
+        clock = FakeClock()
+        breaker = self._breaker(clock)
+        for _ in range(3):
+            breaker.record(0.1, error=True)
+        clock.now = 10.0
+        assert breaker.allow_request() is True
+        breaker.record(0.1, error=True)
+        assert breaker.state == CircuitBreaker.OPEN
+        assert breaker.retry_after() == 10.0
+
+
+class TestEndpointBalancer:
+    def test_routes_to_least_outstanding(self):
+        balancer = EndpointBalancer(["a", "b", "c"])
+        first = balancer.acquire()
+        second = balancer.acquire()
+        third = balancer.acquire()
+        assert {first, second, third} == {"a", "b", "c"}
+        balancer.release("b", 0.5, error=False)
+        assert balancer.acquire() == "b"
+
+    def test_prefers_lower_latency_when_idle(self):
+        balancer = EndpointBalancer(["a", "b"])
+        balancer.release(balancer.acquire(), 2.0, error=False)  # a is slow
+        balancer.release(balancer.acquire(), 0.2, error=False)  # b is fast
+        assert balancer.acquire() == "b"
+
+    def test_ejects_after_consecutive_failures_and_readmits(self):
+        clock = FakeClock()
+        balancer = EndpointBalancer(["a", "b"], eject_after=2, eject_s=10.0, clock=clock)
+        for expected in ("a", "b", "a"):
+            url = balancer.acquire()
+            assert url == expected
+            balancer.release(url, 0.1, error=True)
+        snapshot = {e["url"]: e for e in balancer.snapshot()}
+        assert snapshot["a"]["ejected"] is True
+        assert snapshot["b"]["ejected"] is False
+
+        assert [balancer.acquire() for _ in range(3)] == ["b", "b", "b"]
+        clock.now = 10.0
+        assert balancer.acquire() == "a"
+
+    def test_all_ejected_still_serves(self):
+        balancer = EndpointBalancer(["a"], eject_after=1)
+        balancer.release(balancer.acquire(), 0.1, error=True)
+        assert balancer.snapshot()[0]["ejected"] is True
+        assert balancer.acquire() == "a"
+
+
+class TestCallLlmBreaker:
+    ENV = {"LLM_PROVIDER": "vllm", "LLM_FALLBACK_PROVIDER": "anthropic", "LLM_BREAKER_MIN_CALLS": "2"}
+
+    @patch("providers._call_anthropic")
+    @patch("providers._call_vllm")
+    def test_open_primary_is_skipped(self, mock_vllm, mock_anthropic):
+        mock_vllm.side_effect = RuntimeError("connection refused")
+        mock_anthropic.return_value = "fallback result"
+        with patch.dict(os.environ, self.ENV):
+            call_llm("prompt")
+            call_llm("prompt")
+            assert get_breaker("vllm").state == CircuitBreaker.OPEN
+
+            mock_vllm.reset_mock()
+            assert call_llm("prompt") == "fallback result"
+            mock_vllm.assert_not_called()
+
+    @patch("providers._call_anthropic")
+    @patch("providers._call_vllm")
+    def test_all_open_fails_fast(self, mock_vllm, mock_anthropic):
+        mock_vllm.side_effect = RuntimeError("vllm down")
+        mock_anthropic.side_effect = RuntimeError("anthropic down")
+        with patch.dict(os.environ, self.ENV):
+            for _ in range(2):
+                with pytest.raises(RuntimeError):
+                    call_llm("prompt")
+            mock_vllm.reset_mock()
+            mock_anthropic.reset_mock()
+            with pytest.raises(RuntimeError, match="circuit open"):
+                call_llm("prompt")
+            mock_vllm.assert_not_called()
+            mock_anthropic.assert_not_called()
+
+    @patch("providers._call_anthropic")
+    @patch("providers._call_vllm")
+    def test_short_deadline_does_not_leak_half_open_probe(self, mock_vllm, mock_anthropic):
+        mock_vllm.side_effect = RuntimeError("vllm down")
+        mock_anthropic.side_effect = RuntimeError("anthropic down")
+        env = {**self.ENV, "LLM_BREAKER_COOLDOWN_S": "0"}
+        with patch.dict(os.environ, env):
+            for _ in range(2):
+                with pytest.raises(RuntimeError):
+                    call_llm("prompt")
+            assert get_breaker("vllm").state == CircuitBreaker.HALF_OPEN
+
+            # Too little time to generate: rejected before any provider is tried.
+            with pytest.raises(DeadlineExceeded):
+                call_llm("prompt", CallOptions(deadline=Deadline(1.0)))
+
+            mock_vllm.reset_mock()
+            mock_vllm.side_effect = None
+            mock_vllm.return_value = "recovered"
+            assert call_llm("prompt") == "recovered"
+            assert get_breaker("vllm").state == CircuitBreaker.CLOSED
+
+    def test_provider_health_lists_chain(self):
+        with patch.dict(os.environ, self.ENV):
+            health = provider_health()
+        assert list(health) == ["vllm", "anthropic"]
+        assert health["vllm"]["state"] == CircuitBreaker.CLOSED
+
+
 class TestIsProviderConfigured:
     def test_anthropic_configured(self):
         with patch.dict(os.environ, {"LLM_PROVIDER": "anthropic", "ANTHROPIC_API_KEY": "key"}):
@@ -112,6 +314,11 @@ class TestIsProviderConfigured:
         with patch.dict(os.environ, env, clear=True):
             assert is_provider_configured() is False
 
+    def test_unknown_provider_not_configured(self):
+        with patch.dict(os.environ, {"LLM_PROVIDER": "openrouter"}, clear=True):
+            assert is_provider_configured() is False
+            assert provider_health() == {}
+
 
 class TestGetProviderName:
     def test_default(self):
@@ -121,3 +328,140 @@ class TestGetProviderName:
     def test_explicit(self):
         with patch.dict(os.environ, {"LLM_PROVIDER": "vllm"}):
             assert get_provider_name() == "vllm"
+
+
+class TestPrefixCaching:
+    @patch("providers.anthropic.Anthropic")
+    def test_anthropic_sends_cacheable_system_block(self, mock_cls):
+        mock_client = MagicMock()
+        mock_cls.return_value = mock_client
+        mock_msg = MagicMock()
+        mock_msg.content = [MagicMock(text="out")]
+        mock_msg.usage = MagicMock(input_tokens=40, cache_read_input_tokens=900, cache_creation_input_tokens=0)
+        mock_client.messages.create.return_value = mock_msg
+
+        options = CallOptions(system="static rules")
+        with patch.dict(os.environ, {"ANTHROPIC_API_KEY": "test-key"}):
+            _call_anthropic("task", options=options)
+
+        kwargs = mock_client.messages.create.call_args.kwargs
+        assert kwargs["system"] == [
+            {"type": "text", "text": "static rules", "cache_control": {"type": "ephemeral"}}
+        ]
+        assert kwargs["messages"] == [{"role": "user", "content": "task"}]
+        assert options.usage == {"prompt_tokens": 940, "cached_prompt_tokens": 900}
+
+    @patch("providers.openai.OpenAI")
+    def test_vllm_sends_system_message_first(self, mock_cls):
+        mock_client = MagicMock()
+        mock_cls.return_value = mock_client
+        mock_choice = MagicMock()
+        mock_choice.message.content = "out"
+        usage = MagicMock(prompt_tokens=950)
+        usage.prompt_tokens_details.cached_tokens = 896
+        mock_client.chat.completions.create.return_value = MagicMock(choices=[mock_choice], usage=usage)
+
+        options = CallOptions(system="static rules")
+        with patch.dict(os.environ, {}, clear=True):
+            _call_vllm("task", options=options)
+
+        messages = mock_client.chat.completions.create.call_args.kwargs["messages"]
+        assert messages == [
+            {"role": "system", "content": "static rules"},
+            {"role": "user", "content": "task"},
+        ]
+        assert options.usage == {"prompt_tokens": 950, "cached_prompt_tokens": 896}
+
+    @patch("providers._call_vllm")
+    def test_call_llm_passes_options_through(self, mock_vllm):
+        def fake(prompt, config, options):
+            options.usage = {"prompt_tokens": 10, "cached_prompt_tokens": 8}
+            return "ok"
+
+        mock_vllm.side_effect = fake
+        options = CallOptions(system="static rules")
+        with patch.dict(os.environ, {"LLM_PROVIDER": "vllm"}, clear=True):
+            assert call_llm("task", options) == "ok"
+        assert options.usage["cached_prompt_tokens"] == 8
+
+
+def _stream_chunk(content, usage=None):
+    choice = MagicMock()
+    choice.delta.content = content
+    return MagicMock(choices=[choice], usage=usage)
+
+
+class TestStopping:
+    @patch("providers.openai.OpenAI")
+    def test_vllm_sends_stop_sequences_and_caps_max_tokens(self, mock_cls):
+        mock_client = MagicMock()
+        mock_cls.return_value = mock_client
+        mock_choice = MagicMock()
+        mock_choice.message.content = "out"
+        mock_client.chat.completions.create.return_value = MagicMock(choices=[mock_choice])
+
+        with patch.dict(os.environ, {"VLLM_MAX_TOKENS": "1024"}, clear=True):
+            _call_vllm("task", options=CallOptions(max_tokens=300))
+            kwargs = mock_client.chat.completions.create.call_args.kwargs
+            assert kwargs["max_tokens"] == 300
+            assert kwargs["stop"] == STOP_SEQUENCES
+
+            _call_vllm("task", options=CallOptions(max_tokens=5000))
+            assert mock_client.chat.completions.create.call_args.kwargs["max_tokens"] == 1024
+
+    @patch("providers.openai.OpenAI")
+    def test_vllm_thinking_mode_keeps_full_budget(self, mock_cls):
+        mock_client = MagicMock()
+        mock_cls.return_value = mock_client
+        mock_choice = MagicMock()
+        mock_choice.message.content = "<think>hmm</think>out"
+        mock_client.chat.completions.create.return_value = MagicMock(choices=[mock_choice])
+
+        with patch.dict(os.environ, {"VLLM_ENABLE_THINKING": "true"}, clear=True):
+            assert _call_vllm("task", options=CallOptions(max_tokens=300)) == "<think>hmm</think>out"
+        kwargs = mock_client.chat.completions.create.call_args.kwargs
+        assert kwargs["max_tokens"] == 1024
+        assert "stop" not in kwargs
+
+    @patch("providers.openai.OpenAI")
+    def test_vllm_stream_closes_after_entry_call(self, mock_cls):
+        mock_client = MagicMock()
+        mock_cls.return_value = mock_client
+        usage = MagicMock(prompt_tokens=700)
+        usage.prompt_tokens_details.cached_tokens = 512
+        pieces = ["fun f(x):\n    return x\nend", " fun\n\nresult = f(", "1)\n", "\nThis function returns x.\n"]
+        stream = MagicMock()
+        stream.__iter__.return_value = iter([_stream_chunk(p, usage) for p in pieces])
+        mock_client.chat.completions.create.return_value = stream
+
+        options = CallOptions()
+        with patch.dict(os.environ, {"VLLM_STREAM_STOP": "true"}, clear=True):
+            result = _call_vllm("task", options=options)
+
+        assert result == "fun f(x):\n    return x\nend fun\n\nresult = f(1)"
+        kwargs = mock_client.chat.completions.create.call_args.kwargs
+        assert kwargs["stream"] is True
+        assert kwargs["extra_body"]["stream_options"]["continuous_usage_stats"] is True
+        stream.close.assert_called_once()
+        assert options.usage == {"prompt_tokens": 700, "cached_prompt_tokens": 512}
+
+    @patch("providers.anthropic.Anthropic")
+    def test_anthropic_stream_stops_after_entry_call(self, mock_cls):
+        mock_client = MagicMock()
+        mock_cls.return_value = mock_client
+        stream = mock_client.messages.stream.return_value.__enter__.return_value
+        stream.text_stream = iter(["fun f():\n    return 1\nend fun\nf()\n", "Explanation: ..."])
+        stream.current_message_snapshot.usage = MagicMock(
+            input_tokens=50, cache_read_input_tokens=0, cache_creation_input_tokens=0
+        )
+
+        options = CallOptions(max_tokens=400)
+        env = {"ANTHROPIC_API_KEY": "test-key", "ANTHROPIC_STREAM_STOP": "true"}
+        with patch.dict(os.environ, env, clear=True):
+            result = _call_anthropic("task", options=options)
+
+        assert result == "fun f():\n    return 1\nend fun\nf()"
+        kwargs = mock_client.messages.stream.call_args.kwargs
+        assert kwargs["max_tokens"] == 400
+        assert kwargs["stop_sequences"]
+        assert options.usage["prompt_tokens"] == 50
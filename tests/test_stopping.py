@@ -0,0 +1,70 @@
+"""Unit tests for stopping.py (end-of-program detection on streamed output)"""
+
+from stopping import STOP_SEQUENCES, ProgramEndDetector
+
+
+def feed_all(detector, text, size=3):
+    for i in range(0, len(text), size):
+        if detector.feed(text[i : i + size]):
+            return True
+    return False
+
+
+class TestProgramEndDetector:
+    def test_stops_after_call_of_defined_function(self):
+        text = (
+            "// find the max\n"
+            "fun find_max(arr, n):\n"
+            "    m = arr[0]\n"
+            "    return m\n"
+            "end fun\n"
+            "\n"
+            "numbers = arr[3, 1, 2]\n"
+            "result = find_max(numbers, 3)\n"
+            "\n"
+            "This program finds the maximum.\n"
+        )
+        detector = ProgramEndDetector()
+        assert feed_all(detector, text)
+        assert detector.text.endswith("result = find_max(numbers, 3)")
+        assert "This program" not in detector.text
+
+    def test_waits_for_the_end_of_the_call_line(self):
+        detector = ProgramEndDetector()
+        assert not detector.feed("fun f():\n    return 1\nend fun\nf(")
+        assert not detector.feed("1, 2)")
+        assert detector.feed("\n")
+
+    def test_calls_inside_functions_do_not_stop(self):
+        detector = ProgramEndDetector()
+        text = "fun f():\n    return 1\nend fun\nfun g():\n    x = f()\n    return x\nend fun\n"
+        assert not feed_all(detector, text)
+        assert detector.feed("g()\n")
+
+    def test_nested_function_keeps_depth(self):
+        detector = ProgramEndDetector()
+        text = "fun outer():\n    fun inner():\n        return 1\n    end fun\n    inner()\n"
+        assert not feed_all(detector, text)
+        assert feed_all(detector, "    return 0\nend fun\nouter()\n")
+
+    def test_unfinished_output_is_returned_verbatim(self):
+        detector = ProgramEndDetector()
+        text = "fun f():\n    return 1\nend fun\nprint(f)"
+        assert not feed_all(detector, text)
+        assert detector.text == text
+
+    def test_opening_fence_after_preamble_does_not_stop(self):
+        text = (
+            "Here is the program:\n"
+            "```\n"
+            "fun f():\n"
+            "    return 1\n"
+            "end fun\n"
+            "```\n"
+            "It returns 1.\n"
+        )
+        assert not any(stop in text.split("end fun")[0] for stop in STOP_SEQUENCES)
+        detector = ProgramEndDetector()
+        assert feed_all(detector, text)
+        assert detector.text.endswith("end fun")
+        assert "It returns" not in detector.text
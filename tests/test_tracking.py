@@ -0,0 +1,175 @@
+"""Unit tests for change detection in tracking.py"""
+
+import os
+from unittest.mock import patch
+
+import tracking
+from kb_store import empty_metadata
+from tracking import detect_changed_files, update_metadata
+
+
+def _write(path, text):
+    with open(path, "w") as f:
+        f.write(text)
+    return str(path)
+
+
+def _ingest(folder, metadata):
+    changed, unchanged, deleted, detected = detect_changed_files(str(folder), metadata)
+    for path in changed:
+        update_metadata(metadata, path, [], detected)
+    return changed, unchanged, deleted
+
+
+class TestDetectChangedFiles:
+    def test_new_changed_and_deleted(self, tmp_path):
+        a = _write(tmp_path / "a.avp", "fun a():\n    return 1\nend fun\n")
+        b = _write(tmp_path / "b.avp", "fun b():\n    return 2\nend fun\n")
+        _write(tmp_path / "notes.txt", "ignored")
+        metadata = empty_metadata()
+
+        changed, unchanged, deleted = _ingest(tmp_path, metadata)
+        assert sorted(changed) == [a, b] and unchanged == [] and deleted == []
+
+        _write(a, "fun a():\n    return 10\nend fun\n")
+        os.remove(b)
+        changed, unchanged, deleted = _ingest(tmp_path, metadata)
+        assert changed == [a] and unchanged == [] and deleted == [b]
+
+    def test_unchanged_stat_skips_hashing(self, tmp_path):
+        a = _write(tmp_path / "a.avp", "fun a():\n    return 1\nend fun\n")
+        metadata = empty_metadata()
+        _ingest(tmp_path, metadata)
+
+        with patch("tracking.compute_file_hash") as mock_hash:
+            changed, unchanged, _, _ = detect_changed_files(str(tmp_path), metadata)
+        mock_hash.assert_not_called()
+        assert changed == [] and unchanged == [a]
+
+    def test_touched_file_is_unchanged_and_stat_refreshed(self, tmp_path):
+        a = _write(tmp_path / "a.avp", "fun a():\n    return 1\nend fun\n")
+        metadata = empty_metadata()
+        _ingest(tmp_path, metadata)
+        st = os.stat(a)
+        os.utime(a, (st.st_atime, st.st_mtime + 10))
+
+        changed, unchanged, _, _ = detect_changed_files(str(tmp_path), metadata)
+        assert changed == [] and unchanged == [a]
+        assert metadata["source_files"][a]["mtime"] == st.st_mtime + 10
+
+    def test_always_hash_ignores_stat(self, tmp_path, monkeypatch):
+        _write(tmp_path / "a.avp", "fun a():\n    return 1\nend fun\n")
+        metadata = empty_metadata()
+        _ingest(tmp_path, metadata)
+        monkeypatch.setenv("TRACKING_ALWAYS_HASH", "true")
+
+        with patch("tracking.compute_file_hash", wraps=tracking.compute_file_hash) as mock_hash:
+            detect_changed_files(str(tmp_path), metadata)
+        assert mock_hash.call_count == 1
+
+    def test_threaded_hashing_matches_serial(self, tmp_path):
+        for i in range(8):
+            _write(tmp_path / f"f{i}.avp", f"fun f{i}():\n    return {i}\nend fun\n")
+        serial = detect_changed_files(str(tmp_path), empty_metadata(), hash_workers=1)
+        threaded = detect_changed_files(str(tmp_path), empty_metadata(), hash_workers=4)
+        assert threaded == serial
+
+
+class TestUpdateMetadata:
+    def test_reuses_detection_hash(self, tmp_path):
+        a = _write(tmp_path / "a.avp", "fun a():\n    return 1\nend fun\n")
+        metadata = empty_metadata()
+        _, _, _, detected = detect_changed_files(str(tmp_path), metadata)
+        assert detected == {a: (tracking.compute_file_hash(a), os.stat(a).st_mtime, os.stat(a).st_size)}
+
+        with patch("tracking.compute_file_hash") as mock_hash:
+            update_metadata(metadata, a, ["a"], detected)
+        mock_hash.assert_not_called()
+        assert metadata["source_files"][a]["hash"] == tracking.compute_file_hash(a)
+        assert metadata["source_files"][a]["functions"] == ["a"]
+
+    def test_rehashes_file_modified_after_detection(self, tmp_path):
+        a = _write(tmp_path / "a.avp", "fun a():\n    return 1\nend fun\n")
+        metadata = empty_metadata()
+        _, _, _, detected = detect_changed_files(str(tmp_path), metadata)
+        _write(a, "fun a():\n    return 1000\nend fun\n")
+
+        update_metadata(metadata, a, ["a"], detected)
+        assert metadata["source_files"][a]["hash"] == tracking.compute_file_hash(a)
+
+    def test_current_hash_reuses_detection_hash(self, tmp_path):
+        a = _write(tmp_path / "a.avp", "fun a():\n    return 1\nend fun\n")
+        metadata = empty_metadata()
+        _, _, _, detected = detect_changed_files(str(tmp_path), metadata)
+
+        with patch("tracking.compute_file_hash") as mock_hash:
+            first = tracking.current_hash(a, detected)
+            update_metadata(metadata, a, ["a"], detected)
+        mock_hash.assert_not_called()
+        assert first == metadata["source_files"][a]["hash"] == tracking.compute_file_hash(a)
+
+    def test_no_state_kept_between_runs(self, tmp_path):
+        # A file that fails to parse is never passed to update_metadata; its
+        # detection hash must not be picked up by a later, unrelated caller.
+        a = _write(tmp_path / "a.avp", "fun a(:\nend fun\n")
+        detect_changed_files(str(tmp_path), empty_metadata())
+
+        with patch("tracking.compute_file_hash", wraps=tracking.compute_file_hash) as mock_hash:
+            update_metadata(empty_metadata(), a, [])
+        mock_hash.assert_called_once_with(a)
+
+
+class TestDiscoverFiles:
+    def _tree(self, root):
+        for rel in [
+            "intro.avp",
+            "cs1/week1/loops.avp",
+            "cs1/week2/arrays.avp",
+            "cs1/week2/draft.avp",
+            "cs1/week2/notes.md",
+            "archive/old.avp",
+        ]:
+            path = root / rel
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text("fun f():\n    return 1\nend fun\n")
+
+    def _rel(self, root, found):
+        return [os.path.relpath(path, root).replace(os.sep, "/") for path, _ in found]
+
+    def test_recursive_in_sorted_order(self, tmp_path):
+        self._tree(tmp_path)
+        found = list(tracking.discover_files(str(tmp_path)))
+        assert self._rel(tmp_path, found) == [
+            "archive/old.avp",
+            "cs1/week1/loops.avp",
+            "cs1/week2/arrays.avp",
+            "cs1/week2/draft.avp",
+            "intro.avp",
+        ]
+        assert all(st.st_size > 0 for _, st in found)
+
+    def test_include_and_exclude_patterns(self, tmp_path):
+        self._tree(tmp_path)
+        found = tracking.discover_files(
+            str(tmp_path), include=["cs1/*"], exclude=["draft.avp", "*.md"]
+        )
+        assert self._rel(tmp_path, found) == ["cs1/week1/loops.avp", "cs1/week2/arrays.avp"]
+
+    def test_ignore_file_and_env_excludes(self, tmp_path, monkeypatch):
+        self._tree(tmp_path)
+        (tmp_path / tracking.IGNORE_FILE).write_text("# old material\narchive/\n\n")
+        monkeypatch.setenv("INGEST_EXCLUDE", "week2")
+        found = tracking.discover_files(str(tmp_path))
+        assert self._rel(tmp_path, found) == ["cs1/week1/loops.avp", "intro.avp"]
+
+    def test_detect_changed_files_recurses(self, tmp_path):
+        self._tree(tmp_path)
+        metadata = empty_metadata()
+        changed, _, _ = _ingest(tmp_path, metadata)
+        assert len(changed) == 5
+
+        changed, unchanged, deleted, _ = detect_changed_files(
+            str(tmp_path), metadata, exclude=["archive"]
+        )
+        assert changed == [] and len(unchanged) == 4
+        assert [os.path.basename(path) for path in deleted] == ["old.avp"]
@@ -0,0 +1,52 @@
+"""Unit tests for validation.py (grammar checks of generated code)"""
+
+import glob
+import os
+
+import pytest
+
+from validation import build_repair_prompt, extract_code, validate_code
+
+DATA_FILES = sorted(
+    glob.glob(os.path.join(os.path.dirname(__file__), "..", "data", "*.avp"))
+)
+
+
+class TestExtractCode:
+    def test_plain_code_is_unchanged(self):
+        assert extract_code("fun f():\n    return 1\nend fun\n") == "fun f():\n    return 1\nend fun"
+
+    def test_unwraps_markdown_fence(self):
+        reply = "Here you go:\n```avp\nfun f():\n    return 1\nend fun\n```\nDone."
+        assert extract_code(reply) == "fun f():\n    return 1\nend fun"
+
+
+class TestValidateCode:
+    @pytest.mark.parametrize("path", DATA_FILES, ids=os.path.basename)
+    def test_knowledge_base_files_are_valid(self, path):
+        with open(path) as f:
+            assert validate_code(f.read()).valid
+
+    def test_syntax_errors_are_collected(self):
+        result = validate_code("fun f(:\n    return 1\nend fun")
+        assert not result.valid
+        assert result.errors[0].startswith("line 1:")
+
+    def test_parser_is_reusable_after_errors(self):
+        assert not validate_code("fun f(:").valid
+        assert validate_code("x = 1").valid
+
+    def test_empty_program_is_invalid(self):
+        assert validate_code("  \n").errors == ["empty program"]
+
+
+def test_repair_prompt_includes_code_and_errors():
+    prompt = build_repair_prompt("TASK: f", "fun f(:", ["line 1:6 bad"])
+    assert prompt.startswith("TASK: f")
+    assert "fun f(:" in prompt
+    assert "- line 1:6 bad" in prompt
+
+
+def test_unclosed_fence_is_unwrapped():
+    # Generation stopped on the "\n```" stop sequence.
+    assert extract_code("```avp\nfun f():\n    return 1\nend fun") == "fun f():\n    return 1\nend fun"
@@ -2,22 +2,23 @@
 File modification tracking for AVP ingest system.
 
 This module provides hash-based file change detection to enable incremental
-ingestion of .avp source files.
+ingestion of .avp source files. A file whose mtime and size match the recorded
+values is assumed unchanged without being read; only the rest are hashed.
 """
 
+import fnmatch
 import hashlib
-import json
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
-from typing import Dict, List, Tuple
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple
 
+from kb_store import open_store
 
-def _empty_metadata() -> Dict:
-    return {
-        "last_ingestion": None,
-        "tracking_method": "hash",
-        "source_files": {},
-    }
+IGNORE_FILE = ".avpignore"
+
+# What detect_changed_files hashed, keyed by path: (hash, mtime, size).
+Detected = Mapping[str, Tuple[str, float, int]]
 
 
 def compute_file_hash(file_path: str) -> str:
@@ -38,105 +39,223 @@ def compute_file_hash(file_path: str) -> str:
     return sha256.hexdigest()
 
 
-def _read_kb(kb_path: str):
-    """Return parsed JSON contents of the knowledge base, or None if missing."""
-    if not os.path.exists(kb_path):
-        return None
-    with open(kb_path, 'r') as f:
-        return json.load(f)
-
-
 def load_metadata(kb_path: str) -> Dict:
     """
-    Load metadata from knowledge base file.
+    Load metadata from the knowledge base.
 
     Args:
-        kb_path: Path to knowledge base JSON file
+        kb_path: Path to the knowledge base (``*.json`` file or store directory)
 
     Returns:
         Metadata dict with 'source_files' and 'last_ingestion' keys.
-        Returns empty metadata structure if file doesn't exist or is old format.
+        Returns empty metadata structure if the KB doesn't exist or is old format.
     """
-    data = _read_kb(kb_path)
-    if isinstance(data, dict) and "metadata" in data:
-        return data["metadata"]
-    # Missing file, legacy list format, or unknown format
-    return _empty_metadata()
+    return open_store(kb_path).load_metadata()
 
 
 def load_existing_chunks(kb_path: str) -> List[Dict]:
     """
-    Load existing chunks from knowledge base file.
+    Load existing chunks from the knowledge base.
 
     Args:
-        kb_path: Path to knowledge base JSON file
+        kb_path: Path to the knowledge base (``*.json`` file or store directory)
 
     Returns:
         List of chunk dicts
     """
-    data = _read_kb(kb_path)
-    if isinstance(data, list):
-        # Old format - direct array
-        return data
-    if isinstance(data, dict) and "chunks" in data:
-        # New format with metadata wrapper
-        return data["chunks"]
-    return []
+    return list(open_store(kb_path).iter_chunks())
 
 
 def save_with_metadata(chunks: List[Dict], metadata: Dict, kb_path: str):
     """
-    Save chunks and metadata to knowledge base file in new format.
+    Save all chunks and metadata, replacing the knowledge base contents.
 
     Args:
         chunks: List of code chunk dicts
         metadata: Metadata dict with tracking information
-        kb_path: Path to knowledge base JSON file
+        kb_path: Path to the knowledge base (``*.json`` file or store directory)
+    """
+    open_store(kb_path).save(chunks, metadata)
+
+
+def update_knowledge_base(
+    kb_path: str,
+    metadata: Dict,
+    updated: Mapping[str, List[Dict]],
+    removed: Iterable[str] = (),
+) -> int:
+    """
+    Replace the chunks of re-parsed files and drop those of removed files.
+
+    With a sharded store only the affected files' segments are rewritten, so
+    the cost scales with the change set rather than the corpus.
+
+    Args:
+        kb_path: Path to the knowledge base (``*.json`` file or store directory)
+        metadata: Metadata dict with tracking information
+        updated: New chunks per source file
+        removed: Source files whose chunks should be dropped
+
+    Returns:
+        Total number of chunks in the knowledge base afterwards
     """
-    with open(kb_path, 'w') as f:
-        json.dump({"metadata": metadata, "chunks": chunks}, f, indent=4)
+    return open_store(kb_path).update(metadata, updated, removed)
+
+
+def _env_patterns(name: str) -> List[str]:
+    return [p.strip() for p in os.environ.get(name, "").split(",") if p.strip()]
+
+
+def read_ignore_file(data_folder: str, name: str = IGNORE_FILE) -> List[str]:
+    """Exclude patterns from ``data_folder/<name>``: one per line, ``#`` comments."""
+    path = os.path.join(data_folder, name)
+    if not os.path.isfile(path):
+        return []
+    with open(path) as f:
+        lines = (line.strip() for line in f)
+        return [line for line in lines if line and not line.startswith("#")]
+
+
+def _matches(rel_path: str, patterns: Sequence[str]) -> bool:
+    """Glob match, gitignore-style: a pattern without '/' matches the name at
+    any depth; one with '/' matches the path relative to the corpus root."""
+    name = rel_path.rsplit("/", 1)[-1]
+    for pattern in patterns:
+        pattern = pattern.rstrip("/")
+        if "/" in pattern:
+            if fnmatch.fnmatch(rel_path, pattern.lstrip("/")):
+                return True
+        elif fnmatch.fnmatch(name, pattern):
+            return True
+    return False
+
+
+def discover_files(
+    data_folder: str,
+    include: Optional[Sequence[str]] = None,
+    exclude: Optional[Sequence[str]] = None,
+    ignore_file: Optional[str] = IGNORE_FILE,
+) -> Iterator[Tuple[str, os.stat_result]]:
+    """
+    Walk ``data_folder`` recursively and yield matching files as they are found.
+
+    Directories matching an exclude pattern are not descended into, and
+    symlinked directories are not followed. Entries are visited in sorted
+    order so results are deterministic.
+
+    Args:
+        data_folder: Root of the corpus
+        include: File patterns to take (default INGEST_INCLUDE, else ``*.avp``)
+        exclude: Patterns to skip (INGEST_EXCLUDE and the ignore file are added)
+        ignore_file: Name of an exclude-pattern file in data_folder, or None
+
+    Yields:
+        (full_path, stat_result) for each matching file
+    """
+    include = list(include or _env_patterns("INGEST_INCLUDE") or ["*.avp"])
+    exclude = list(exclude or []) + _env_patterns("INGEST_EXCLUDE")
+    if ignore_file:
+        exclude += read_ignore_file(data_folder, ignore_file)
+
+    def walk(rel_dir: str) -> Iterator[Tuple[str, os.stat_result]]:
+        with os.scandir(os.path.join(data_folder, rel_dir)) as it:
+            entries = sorted(it, key=lambda e: e.name)
+        for entry in entries:
+            rel_path = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+            if _matches(rel_path, exclude):
+                continue
+            if entry.is_dir(follow_symlinks=False):
+                yield from walk(rel_path)
+            elif entry.is_file() and _matches(rel_path, include):
+                yield os.path.join(data_folder, rel_path), entry.stat()
+
+    return walk("")
+
+
+def _hash_workers() -> int:
+    return int(os.environ.get("TRACKING_HASH_WORKERS", "1"))
+
+
+def _always_hash() -> bool:
+    return os.environ.get("TRACKING_ALWAYS_HASH", "false").lower() == "true"
 
 
 def detect_changed_files(
     data_folder: str,
     metadata: Dict,
     file_extension: str = ".avp",
-) -> Tuple[List[str], List[str], List[str]]:
+    hash_workers: Optional[int] = None,
+    include: Optional[Sequence[str]] = None,
+    exclude: Optional[Sequence[str]] = None,
+) -> Tuple[List[str], List[str], List[str], Dict[str, Tuple[str, float, int]]]:
     """
-    Detect which files have changed since last ingestion using hash comparison.
+    Detect which files have changed since last ingestion.
+
+    The folder is walked recursively (see discover_files). Files whose mtime
+    and size match the metadata are unchanged without being hashed (set
+    TRACKING_ALWAYS_HASH=true to hash everything). The others are hashed and
+    compared with the recorded hash; a file that was only touched gets its
+    recorded mtime/size refreshed so the next run skips it.
 
     Args:
         data_folder: Directory containing source files
         metadata: Metadata dict with previous file hashes
-        file_extension: File extension to search for (default: ".avp")
+        file_extension: File extension to search for when no include patterns
+                        are given (default: ".avp")
+        hash_workers: Threads used for hashing (default TRACKING_HASH_WORKERS, 1)
+        include: File patterns to take (default INGEST_INCLUDE, else by extension)
+        exclude: Patterns to skip, on top of INGEST_EXCLUDE and .avpignore
 
     Returns:
-        Tuple of (changed_files, unchanged_files, deleted_files) as lists of full paths
+        Tuple of (changed_files, unchanged_files, deleted_files, detected): three
+        lists of full paths, and the hash, mtime and size of each changed file
+        by path, to pass on to current_hash and update_metadata
     """
     source_files = metadata.get("source_files", {})
-    changed_files: List[str] = []
-    unchanged_files: List[str] = []
+    always_hash = _always_hash()
     current_files = set()
+    unchanged_files: List[str] = []
+    to_hash: List[Tuple[str, float, int]] = []
 
-    for filename in os.listdir(data_folder):
-        if not filename.endswith(file_extension):
-            continue
-        full_path = os.path.join(data_folder, filename)
+    include = include or _env_patterns("INGEST_INCLUDE") or [f"*{file_extension}"]
+    for full_path, st in discover_files(data_folder, include, exclude):
         current_files.add(full_path)
+        previous = source_files.get(full_path, {})
+        if (
+            not always_hash
+            and "hash" in previous
+            and previous.get("mtime") == st.st_mtime
+            and previous.get("size") == st.st_size
+        ):
+            unchanged_files.append(full_path)
+        else:
+            to_hash.append((full_path, st.st_mtime, st.st_size))
 
-        current_hash = compute_file_hash(full_path)
-        previous_hash = source_files.get(full_path, {}).get("hash")
+    paths = [path for path, _, _ in to_hash]
+    workers = hash_workers or _hash_workers()
+    if workers > 1 and len(paths) > 1:
+        # hashlib releases the GIL on large updates, so threads overlap reads and hashing.
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            hashes = list(pool.map(compute_file_hash, paths))
+    else:
+        hashes = [compute_file_hash(path) for path in paths]
 
-        if current_hash == previous_hash:
+    changed_files: List[str] = []
+    detected: Dict[str, Tuple[str, float, int]] = {}
+    for (full_path, mtime, size), current_hash in zip(to_hash, hashes):
+        previous = source_files.get(full_path, {})
+        if current_hash == previous.get("hash"):
+            previous["mtime"], previous["size"] = mtime, size
             unchanged_files.append(full_path)
         else:
             # New file (no previous hash) or modified file
+            detected[full_path] = (current_hash, mtime, size)
             changed_files.append(full_path)
 
     # Detect deleted files: in metadata but no longer on disk
     deleted_files = [f for f in source_files if f not in current_files]
 
-    return changed_files, unchanged_files, deleted_files
+    return changed_files, unchanged_files, deleted_files, detected
 
 
 def remove_deleted_from_metadata(metadata: Dict, deleted_files: List[str]) -> Dict:
@@ -156,10 +275,26 @@ def remove_deleted_from_metadata(metadata: Dict, deleted_files: List[str]) -> Di
     return metadata
 
 
+def current_hash(
+    file_path: str, detected: Optional[Detected] = None, st: Optional[os.stat_result] = None
+) -> str:
+    """
+    SHA256 of a file, reusing the hash in ``detected`` (from
+    detect_changed_files) if the file's mtime and size haven't changed since.
+    """
+    st = st or os.stat(file_path)
+    entry = (detected or {}).get(file_path)
+    if entry is not None and entry[1:] == (st.st_mtime, st.st_size):
+        return entry[0]
+    # Not seen by detect_changed_files, or modified since it was hashed.
+    return compute_file_hash(file_path)
+
+
 def update_metadata(
     metadata: Dict,
     file_path: str,
     function_names: List[str],
+    detected: Optional[Detected] = None,
 ) -> Dict:
     """
     Update metadata for a specific file after ingestion.
@@ -168,14 +303,18 @@ def update_metadata(
         metadata: Metadata dict to update
         file_path: Path to the file that was ingested
         function_names: List of function names extracted from this file
+        detected: Hashes from detect_changed_files, reused instead of
+                  reading the file again
 
     Returns:
         Updated metadata dict
     """
+    st = os.stat(file_path)
+    file_hash = current_hash(file_path, detected, st)
     metadata["source_files"][file_path] = {
-        "hash": compute_file_hash(file_path),
-        "mtime": os.path.getmtime(file_path),
-        "size": os.path.getsize(file_path),
+        "hash": file_hash,
+        "mtime": st.st_mtime,
+        "size": st.st_size,
         "functions": function_names,
     }
     metadata["last_ingestion"] = datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
@@ -0,0 +1,126 @@
+"""
+Grammar validation of generated AVP code.
+
+Generated code is parsed with the compiled ANTLR parser (SLL first, see
+parsing.py), or first with the hand-written one when PARSER_FRONTEND=fast
+(see fastparse.py); syntax errors are collected (instead of printed to stderr) so
+they can be reported to the user and fed back to the LLM in a repair request.
+"""
+
+import re
+import threading
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+
+from antlr4 import CommonTokenStream, InputStream
+from antlr4.error.ErrorListener import ErrorListener
+
+import fastparse
+from avp_ast import Program, build_ast
+from parsing import parse_program
+from PseudocodeLexer import PseudocodeLexer
+from PseudocodeParser import PseudocodeParser
+
+# First fenced block, with or without a language tag (```avp, ```text, ...).
+# The closing fence may be missing when the reply was cut off (max_tokens, or a
+# streamed reply closed by stopping.ProgramEndDetector at the fence).
+_FENCE_RE = re.compile(r"```[^\n`]*\n(.*?)(?:```|\Z)", re.DOTALL)
+
+
+class CollectingErrorListener(ErrorListener):
+    """Records syntax errors from the lexer and parser instead of printing them."""
+
+    def __init__(self):
+        self.errors: List[str] = []
+
+    def syntaxError(self, recognizer, offendingSymbol, line, column, msg, e):
+        self.errors.append(f"line {line}:{column} {msg}")
+
+
+@dataclass
+class ValidationResult:
+    valid: bool
+    errors: List[str] = field(default_factory=list)
+    program: Optional[Program] = None  # the AST, for valid code
+
+
+class _CachedParser:
+    """A lexer/parser pair reused across validations on one thread.
+
+    Building them is cheap next to parsing, but reuse also keeps the error
+    listeners wired up once; the ATN/DFA caches are shared class-wide anyway.
+    """
+
+    def __init__(self):
+        self.listener = CollectingErrorListener()
+        self.lexer = PseudocodeLexer(InputStream(""))
+        self.lexer.removeErrorListeners()
+        self.lexer.addErrorListener(self.listener)
+        self.parser = PseudocodeParser(CommonTokenStream(self.lexer))
+        self.parser.removeErrorListeners()
+        self.parser.addErrorListener(self.listener)
+
+    def parse(self, code: str) -> Tuple[Optional[Program], List[str]]:
+        self.listener.errors = []
+        self.lexer.inputStream = InputStream(code)
+        self.parser.setTokenStream(CommonTokenStream(self.lexer))
+        tree = parse_program(self.parser)
+        if self.listener.errors:
+            return None, self.listener.errors
+        return build_ast(tree, code), []
+
+
+_local = threading.local()
+
+
+def _cached_parser() -> _CachedParser:
+    parser = getattr(_local, "parser", None)
+    if parser is None:
+        parser = _local.parser = _CachedParser()
+    return parser
+
+
+def extract_code(text: str) -> str:
+    """Return the code from an LLM reply, unwrapping a markdown fence if present."""
+    if not text:
+        return text
+    match = _FENCE_RE.search(text)
+    code = match.group(1) if match else text
+    return code.strip("\n")
+
+
+def validate_code(code: str) -> ValidationResult:
+    """
+    Parse AVP code against the grammar.
+
+    Args:
+        code: AVP source code
+
+    Returns:
+        ValidationResult with valid flag, "line L:C message" error strings
+        and, for valid code, its avp_ast Program
+    """
+    if not code or not code.strip():
+        return ValidationResult(valid=False, errors=["empty program"])
+    # Only ANTLR's error recovery gives the full list of messages for a repair prompt
+    if fastparse.frontend() == "fast":
+        program = fastparse.parse(code).program
+        if program is not None:
+            return ValidationResult(valid=True, program=program)
+    program, errors = _cached_parser().parse(code)
+    return ValidationResult(valid=not errors, errors=errors, program=program)
+
+
+def build_repair_prompt(prompt: str, code: str, errors: List[str]) -> str:
+    """User message asking the LLM to fix code that failed to parse."""
+    error_lines = "\n".join(f"- {e}" for e in errors[:10])
+    return f"""{prompt}
+Your previous answer was:
+
+{code}
+
+It is not valid AVP. The parser reported:
+{error_lines}
+
+Fix these errors and output the complete corrected program only.
+"""